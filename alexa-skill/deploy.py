@@ -6,10 +6,11 @@
 AWS Lambdaにデプロイ可能なZIPファイルを作成し、自動的にデプロイします。
 
 使用方法:
-    python deploy.py [--no-deploy]
+    python deploy.py [--no-deploy] [--settings-only]
 
 オプション:
     --no-deploy: ZIPファイルの作成のみ行い、デプロイはスキップ
+    --settings-only: デフォルト掃除種別設定の検証と変換のみ行い、src/default_cleaning_settings.json に書き出す
 
 環境変数（必須）:
     - GOOGLE_SERVICE_ACCOUNT_KEY: Google Service Accountのキー（JSON形式）
@@ -17,6 +18,7 @@ AWS Lambdaにデプロイ可能なZIPファイルを作成し、自動的にデ
 
 生成されるファイル:
     - lambda_deployment.zip: AWS Lambdaにアップロード可能なZIPファイル
+      （config/default_cleaning_settings.yaml は検証のうえ src/default_cleaning_settings.json に変換して同梱）
 """
 
 import argparse
@@ -34,10 +36,13 @@ from botocore.exceptions import ClientError, NoCredentialsError
 # 設定
 LAMBDA_FUNCTION_NAME = "cleaning-management-alexa-skill"
 LAMBDA_RUNTIME = "python3.9"
-LAMBDA_HANDLER = "lambda_function.lambda_handler"
+LAMBDA_HANDLER = "lambda_function.lambda_handler_wrapper"
 LAMBDA_TIMEOUT = 30
 LAMBDA_MEMORY_SIZE = 256
 
+# デフォルト掃除種別設定のYAML（プロジェクト直下、またはリポジトリ直下のconfigディレクトリ）
+DEFAULT_SETTINGS_YAML = Path("config") / "default_cleaning_settings.yaml"
+
 EXCLUDE_PATTERNS = [
     "*.pyc",
     "__pycache__",
@@ -106,6 +111,41 @@ def check_environment_variables():
     return missing_vars
 
 
+def find_default_settings_yaml(project_root):
+    """デフォルト掃除種別設定のYAMLを探す"""
+    from src.default_settings import find_default_settings_yaml as find_yaml
+
+    return find_yaml(project_root)
+
+
+def build_default_settings_artifact(project_root, src_dir):
+    """
+    デフォルト掃除種別設定のYAMLを検証し、JSONの成果物としてsrcディレクトリに書き出す
+
+    Args:
+        project_root: プロジェクトのルートディレクトリ
+        src_dir: 成果物を書き出すsrcディレクトリ
+
+    Returns:
+        bool: 成功した場合True
+    """
+    from src.default_settings import ARTIFACT_NAME, compile_default_settings
+
+    yaml_path = find_default_settings_yaml(project_root)
+    if yaml_path is None:
+        log_error(f"デフォルト掃除種別設定が見つかりません: {DEFAULT_SETTINGS_YAML}")
+        return False
+
+    try:
+        cleaning_types = compile_default_settings(yaml_path, src_dir / ARTIFACT_NAME)
+    except Exception as e:
+        log_error(f"デフォルト掃除種別設定の検証に失敗: {yaml_path}: {e}")
+        return False
+
+    log_success(f"📄 デフォルト掃除種別設定を変換しました: {yaml_path} → src/{ARTIFACT_NAME}（{len(cleaning_types)}件）")
+    return True
+
+
 def create_deployment_package():
     """デプロイメントパッケージを作成"""
 
@@ -161,8 +201,6 @@ def create_deployment_package():
                 "cachetools",
                 "six",
                 "dateutil",
-                "yaml",
-                "pyyaml",
             ]
 
             copied_packages = []
@@ -200,9 +238,9 @@ def create_deployment_package():
         if (project_root / "src").exists():
             shutil.copytree(project_root / "src", package_dir / "src")
 
-        # configディレクトリ（YAMLファイル用）
-        if (project_root / "config").exists():
-            shutil.copytree(project_root / "config", package_dir / "config")
+        # デフォルト掃除種別設定（YAMLを検証してJSONに変換し、実行時にはPyYAMLを使わない）
+        if not build_default_settings_artifact(project_root, package_dir / "src"):
+            return False
 
         # 最終的なlambda_function_final.pyがあれば、それをバックアップとして含める
         if (project_root / "lambda_function_final.py").exists():
@@ -224,29 +262,13 @@ def create_deployment_package():
                     arc_path = file_path.relative_to(package_dir)
                     zipf.write(file_path, arc_path)
 
-                    # YAMLファイルの場合は詳細をログ出力
-                    if file.endswith(".yaml") or file.endswith(".yml"):
-                        log_info(f"📄 YAMLファイルを追加: {arc_path} (元: {file_path})")
-
-                        # ファイル内容の最初の数行を確認
-                        try:
-                            with open(file_path, "r", encoding="utf-8") as f:
-                                first_lines = [f.readline().strip() for _ in range(3)]
-                                log_info(f"   内容確認: {first_lines}")
-                        except Exception as e:
-                            log_warning(f"   ファイル内容確認エラー: {e}")
-
         # zipファイル内の構造を確認
         log_info("📋 作成されたZIPファイルの構造確認:")
         with zipfile.ZipFile(zip_path, "r") as zipf:
-            file_list = zipf.namelist()
-            config_files = [f for f in file_list if "config" in f or f.endswith(".yaml")]
-            if config_files:
-                log_info("🔧 設定ファイル:")
-                for cf in config_files:
-                    log_info(f"   • {cf}")
+            if "src/default_cleaning_settings.json" in zipf.namelist():
+                log_info("🔧 設定ファイル: src/default_cleaning_settings.json")
             else:
-                log_warning("⚠️  設定ファイルがZIPに含まれていません！")
+                log_warning("⚠️  デフォルト掃除種別設定がZIPに含まれていません！")
 
         # ファイルサイズを確認
         zip_size_mb = zip_path.stat().st_size / (1024 * 1024)
@@ -424,12 +446,18 @@ def main():
     """メイン関数"""
     parser = argparse.ArgumentParser(description="音声ベース掃除記録システム - デプロイスクリプト")
     parser.add_argument("--no-deploy", action="store_true", help="ZIPファイルの作成のみ行い、デプロイはスキップ")
+    parser.add_argument(
+        "--settings-only", action="store_true", help="デフォルト掃除種別設定の検証と変換のみ行う（ローカル実行用）"
+    )
     parser.add_argument("--profile", help="使用するAWSプロファイル名（デフォルト: indivisual）", default="indivisual")
     args = parser.parse_args()
 
     print("🧹 音声ベース掃除記録システム - デプロイスクリプト")
     print("=" * 60)
 
+    if args.settings_only:
+        return 0 if build_default_settings_artifact(Path.cwd(), Path.cwd() / "src") else 1
+
     # Poetryがインストールされているか確認
     try:
         subprocess.run(["poetry", "--version"], capture_output=True, check=True)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+音声ベース掃除記録システム - 掃除履歴の一括インポート
+
+他のアプリから書き出した掃除履歴（CSVまたはJSONL）を少しずつ読み込み、日時と掃除種別を検証したうえで、
+掃除記録シートへクォータに合わせたまとまり（1回のappend_rowsで書き込む行数）ごとに追記します。
+まとまりを書き込むたびにチェックポイントを保存するため、中断しても続きから再開できます。
+掃除種別設定の最終実施日・次回予定日は、最後にインポートした記録から1回だけまとめて再計算します。
+
+使用方法:
+    python import_history.py history.csv [--format csv|jsonl] [--batch-size 500]
+                             [--checkpoint history.csv.checkpoint.json] [--restart] [--dry-run]
+
+入力の列（CSVのヘッダー、JSONLのキー）:
+    日時（または timestamp）: 実施日時（%Y-%m-%d %H:%M:%S、%Y/%m/%d %H:%M、ISO 8601、日付のみなど）
+    掃除種別（または type）: 掃除種別設定シートに登録済みの掃除種別
+    記録者（または recorder）: 記録者（省略時は「履歴インポート」）
+    備考（または note）: 備考（オプション）
+
+オプション:
+    --format: 入力形式（省略時は拡張子から判定）
+    --batch-size: 1回のappend_rowsで追記する行数（デフォルト: 500）
+    --checkpoint: チェックポイントファイル（デフォルト: 入力ファイル名 + .checkpoint.json）
+    --restart: チェックポイントを無視して最初からインポート
+    --dry-run: 検証のみ行い、スプレッドシートには書き込まない
+
+環境変数（必須）:
+    - GOOGLE_SERVICE_ACCOUNT_KEY: Google Service Accountのキー（JSON形式）
+    - GOOGLE_SPREADSHEET_ID: 対象のGoogle SpreadsheetのID
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.sheet_constants import CleaningRecordsSheet, CleaningSettingsSheet
+
+DEFAULT_BATCH_SIZE = 500
+IMPORT_RECORDER = "履歴インポート"
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+# 入力の列名（掃除記録シートのヘッダーと英語の別名）
+FIELD_ALIASES = {
+    "timestamp": (CleaningRecordsSheet.DATETIME.value, "timestamp"),
+    "type": (CleaningRecordsSheet.TYPE.value, "type"),
+    "recorder": (CleaningRecordsSheet.RECORDER.value, "recorder"),
+    "note": (CleaningRecordsSheet.NOTE.value, "note"),
+}
+
+# 受け付ける日時の書式（ISO 8601はdatetime.fromisoformatでも解析する）
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+)
+
+
+def iter_source_records(path: Path, source_format: str) -> Iterator[Tuple[int, Optional[Dict]]]:
+    """
+    入力ファイルを1件ずつ読み込む（ファイル全体はメモリに載せない）
+
+    Args:
+        path: 入力ファイル
+        source_format: 入力形式（csv / jsonl）
+
+    Yields:
+        Tuple[int, Optional[Dict]]: (行番号, 記録)（JSONとして読めない行の記録はNone）
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if source_format == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+            return
+
+        for line_num, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield line_num, record if isinstance(record, dict) else None
+
+
+def _field(record: Dict, name: str) -> str:
+    """別名を考慮して記録の値を取得（前後の空白は除く）"""
+    for key in FIELD_ALIASES[name]:
+        value = record.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """
+    入力の日時を解析（タイムゾーン付きの場合はローカル時刻に変換）
+
+    Args:
+        value: 日時の文字列
+
+    Returns:
+        Optional[datetime]: 日時（解析できない場合None）
+    """
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, timestamp_format)
+        except ValueError:
+            continue
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def validate_record(record: Optional[Dict], known_types: set, now: datetime) -> Tuple[Optional[Dict], str]:
+    """
+    記録を検証し、掃除記録シートに書き込む形に変換
+
+    Args:
+        record: 入力の記録（JSONとして読めなかった場合None）
+        known_types: 掃除種別設定シートに登録済みの掃除種別
+        now: 現在日時（これより後の日時は不正とする）
+
+    Returns:
+        Tuple[Optional[Dict], str]: (変換した記録, 不正な場合の理由)
+    """
+    if record is None:
+        return None, "JSONオブジェクトとして読み込めません"
+
+    timestamp_text = _field(record, "timestamp")
+    timestamp = parse_timestamp(timestamp_text)
+    if timestamp is None:
+        return None, f"日時が不正です: '{timestamp_text}'"
+    if timestamp > now:
+        return None, f"日時が未来です: '{timestamp_text}'"
+
+    cleaning_type = _field(record, "type")
+    if cleaning_type not in known_types:
+        return None, f"掃除種別が設定シートにありません: '{cleaning_type}'"
+
+    return (
+        {
+            "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "type": cleaning_type,
+            "recorder": _field(record, "recorder") or IMPORT_RECORDER,
+            "note": _field(record, "note"),
+        },
+        "",
+    )
+
+
+def import_key(source: Path, line_num: int) -> str:
+    """インポートした記録のリクエストID（再開時に書き込み済みの行を見分けるため、入力の行ごとに一定）"""
+    return f"import:{source.name}:{line_num}"
+
+
+def load_checkpoint(path: Path, source: Path, restart: bool = False) -> Dict:
+    """
+    チェックポイントを読み込む（存在しない場合、またはrestartの場合は最初から）
+
+    Raises:
+        ValueError: 別の入力ファイル、または内容が変わった入力ファイルのチェックポイントの場合
+    """
+    stat = source.stat()
+    initial = {
+        "source": str(source.resolve()),
+        "source_size": stat.st_size,
+        "next_record": 0,
+        "imported": 0,
+        "skipped": 0,
+        "rejected": 0,
+        "latest": {},
+        "completed": False,
+    }
+    if restart or not path.exists():
+        return initial
+    checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    if checkpoint.get("source") != initial["source"] or checkpoint.get("source_size") != initial["source_size"]:
+        raise ValueError(f"チェックポイントの入力ファイルと一致しません（最初からやり直す場合は --restart）: {path}")
+    return {**initial, **checkpoint}
+
+
+def save_checkpoint(path: Path, checkpoint: Dict):
+    """チェックポイントを保存（書き込み途中で中断しても壊れないよう、一時ファイルから置き換える）"""
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text(json.dumps(checkpoint, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def run_import(
+    manager,
+    source: Path,
+    source_format: str,
+    checkpoint_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    restart: bool = False,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    掃除履歴をインポート
+
+    Args:
+        manager: GoogleSheetsManager
+        source: 入力ファイル
+        source_format: 入力形式（csv / jsonl）
+        checkpoint_path: チェックポイントファイル
+        batch_size: 1回のappend_rowsで追記する行数
+        restart: チェックポイントを無視して最初からインポートする
+        dry_run: 検証のみ行い、書き込まない
+
+    Returns:
+        Dict: 最終的なチェックポイント（imported / skipped / rejected / latest / changes を含む）
+
+    Raises:
+        RuntimeError: 掃除記録の追記に失敗した場合（チェックポイントから再開できる）
+    """
+    # dry-runは書き込まないため、チェックポイントを使わずに入力全体を検証する
+    checkpoint = load_checkpoint(checkpoint_path, source, restart=restart or dry_run)
+    if checkpoint["completed"]:
+        print(f"✅ インポート済みです（最初からやり直す場合は --restart）: {checkpoint_path}")
+        return checkpoint
+
+    known_types = {
+        str(setting.get(CleaningSettingsSheet.TYPE, "")) for setting in manager.get_cleaning_settings()
+    } - {""}
+    if not known_types:
+        raise RuntimeError("掃除種別設定シートを読み込めませんでした")
+    # 前回の中断（追記は成功したがチェックポイントを保存できなかった場合など）で書き込み済みの行は追記しない
+    written_ids = set() if dry_run else manager.get_written_request_ids()
+    now = datetime.now()
+    latest: Dict[str, str] = checkpoint["latest"]
+
+    records = islice(iter_source_records(source, source_format), checkpoint["next_record"], None)
+    if checkpoint["next_record"]:
+        print(f"⏩ チェックポイントから再開します: {checkpoint['next_record']}件目から")
+
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+
+        rows: List[List[str]] = []
+        for line_num, record in chunk:
+            entry, reason = validate_record(record, known_types, now)
+            if entry is None:
+                print(f"⚠️ {source.name}:{line_num}: {reason}")
+                checkpoint["rejected"] += 1
+                continue
+            key = import_key(source, line_num)
+            if key in written_ids:
+                checkpoint["skipped"] += 1
+            else:
+                rows.append([entry["timestamp"], entry["type"], entry["recorder"], entry["note"], key])
+            if entry["timestamp"] > latest.get(entry["type"], ""):
+                latest[entry["type"]] = entry["timestamp"]
+
+        if rows and not dry_run and not manager.append_cleaning_rows(rows):
+            raise RuntimeError(f"掃除記録の追記に失敗しました（{checkpoint['next_record']}件目から再開できます）")
+        checkpoint["imported"] += len(rows)
+        checkpoint["next_record"] += len(chunk)
+        if not dry_run:
+            save_checkpoint(checkpoint_path, checkpoint)
+        print(f"📥 {checkpoint['next_record']}件処理（追記 {checkpoint['imported']}件, 不正 {checkpoint['rejected']}件）")
+
+    # 最終実施日・次回予定日は、インポートした記録の掃除種別ごとの最新日時から1回だけ再計算する
+    checkpoint["changes"] = manager.apply_last_cleaning_dates(latest, only_newer=True, dry_run=dry_run)
+    checkpoint["completed"] = True
+    if not dry_run:
+        save_checkpoint(checkpoint_path, checkpoint)
+    return checkpoint
+
+
+def _detect_format(path: Path) -> str:
+    """拡張子から入力形式を判定"""
+    return "jsonl" if path.suffix.lower() in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="音声ベース掃除記録システム - 掃除履歴の一括インポート")
+    parser.add_argument("source", help="入力ファイル（CSVまたはJSONL）")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="入力形式（省略時は拡張子から判定）")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="1回のappend_rowsで追記する行数")
+    parser.add_argument("--checkpoint", help="チェックポイントファイル")
+    parser.add_argument("--restart", action="store_true", help="チェックポイントを無視して最初からインポート")
+    parser.add_argument("--dry-run", action="store_true", help="検証のみ行い、スプレッドシートには書き込まない")
+    parser.add_argument("--verbose", action="store_true", help="Sheets APIの呼び出しログも表示")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(levelname)s %(message)s")
+
+    source = Path(args.source)
+    if not source.exists():
+        print(f"❌ 入力ファイルが見つかりません: {source}")
+        return 1
+    checkpoint_path = Path(args.checkpoint or f"{source}{CHECKPOINT_SUFFIX}")
+
+    from src.google_sheets_manager import get_sheets_manager
+
+    try:
+        result = run_import(
+            get_sheets_manager(),
+            source,
+            args.format or _detect_format(source),
+            checkpoint_path,
+            batch_size=max(args.batch_size, 1),
+            restart=args.restart,
+            dry_run=args.dry_run,
+        )
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    for change in result.get("changes", []):
+        print(
+            f"📍 {change['type']}: 最終実施日 {change['last_date'][0] or '（なし）'} → {change['last_date'][1]}, "
+            f"次回予定日 {change['next_date'][0] or '（なし）'} → {change['next_date'][1]}"
+        )
+    mode = "（dry-run: 書き込みなし）" if args.dry_run else ""
+    print(
+        f"✅ インポート完了{mode}: 追記 {result['imported']}件, 書き込み済み {result['skipped']}件, "
+        f"不正 {result['rejected']}件, 設定更新 {len(result.get('changes', []))}種別"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+音声ベース掃除記録システム - インポート時間レポート
+
+Lambda関数（lambda_function.py）を `python -X importtime` で別プロセスとして読み込み、
+コールドスタート時に時間のかかっているモジュールを一覧表示します。
+
+使用方法:
+    python import_time_report.py [--package lambda_deployment.zip] [--include-lazy] [--top 20]
+                                 [--sort self|cumulative] [--json report.json] [--max-total-ms 300]
+
+オプション:
+    --package: デプロイパッケージ（ZIPファイルまたは展開済みディレクトリ）を計測（省略時はこのディレクトリ）
+    --module: 読み込むモジュール名（デフォルト: lambda_function）
+    --include-lazy: 最初のAlexaリクエストで遅延読み込みされるask_sdkとハンドラーも計測
+    --top: 表示する件数（デフォルト: 20）
+    --sort: 並び順（self: モジュール単体の時間、cumulative: 依存モジュールを含む時間）
+    --json: 計測結果をJSONファイルに保存
+    --max-total-ms: 合計時間がこの値を超えた場合に終了コード1で終了（回帰の検出用）
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+# `-X importtime` の出力行: "import time:  self [us] | cumulative | imported package"
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# 最初のAlexaリクエストでask_sdkとハンドラーを読み込む関数（lambda_function._load_skill_handler）
+LAZY_LOADER = "_load_skill_handler"
+
+
+def parse_import_times(stderr: str):
+    """
+    `-X importtime` の出力を解析
+
+    Args:
+        stderr: 計測対象プロセスの標準エラー出力
+
+    Returns:
+        list: {"module", "self_ms", "cumulative_ms", "depth"} のリスト（出力順）
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append(
+            {
+                "module": module,
+                "self_ms": int(self_us) / 1000.0,
+                "cumulative_ms": int(cumulative_us) / 1000.0,
+                "depth": (len(indent) - 1) // 2,
+            }
+        )
+    return entries
+
+
+def measure_import_times(package_dir: Path, module: str, include_lazy: bool = False):
+    """
+    別プロセスでモジュールを読み込み、インポート時間を計測
+
+    Args:
+        package_dir: 計測対象のディレクトリ（作業ディレクトリとして実行）
+        module: 読み込むモジュール名
+        include_lazy: 最初のAlexaリクエストで遅延読み込みされるモジュールも計測する
+
+    Returns:
+        list: parse_import_timesの結果
+    """
+    code = f"import {module}"
+    if include_lazy:
+        code += f"; {module}.{LAZY_LOADER}()"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=package_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module}の読み込みに失敗しました:\n{result.stderr[-2000:]}")
+    return parse_import_times(result.stderr)
+
+
+def build_report(entries, module: str, top: int, sort_key: str):
+    """計測結果から、対象モジュール以降の読み込みで発生したインポートの上位N件と合計時間をまとめる"""
+    # 出力は子モジュールが先に並ぶため、対象モジュールの行から遡って依存関係の先頭を探す
+    # （インタープリタ起動時のsiteなどのインポートは含めない）
+    start = 0
+    for index, entry in enumerate(entries):
+        if entry["module"] == module and entry["depth"] == 0:
+            start = index
+            while start > 0 and entries[start - 1]["depth"] > 0:
+                start -= 1
+            break
+    measured = entries[start:]
+    heaviest = sorted(measured, key=lambda entry: entry[sort_key], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": sum(entry["cumulative_ms"] for entry in measured if entry["depth"] == 0),
+        "import_count": len(measured),
+        "sort": sort_key,
+        "heaviest": heaviest,
+    }
+
+
+def print_report(report):
+    """レポートを表示"""
+    print(f"📦 {report['module']} の読み込み時間: {report['total_ms']:.1f}ms（{report['import_count']}モジュール）")
+    print(f"{'self(ms)':>10} {'cumulative(ms)':>15}  module")
+    for entry in report["heaviest"]:
+        print(f"{entry['self_ms']:>10.1f} {entry['cumulative_ms']:>15.1f}  {'  ' * entry['depth']}{entry['module']}")
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="音声ベース掃除記録システム - インポート時間レポート")
+    parser.add_argument("--package", help="デプロイパッケージ（ZIPファイルまたは展開済みディレクトリ）")
+    parser.add_argument("--module", default="lambda_function", help="読み込むモジュール名")
+    parser.add_argument(
+        "--include-lazy", action="store_true", help="最初のAlexaリクエストで読み込まれるask_sdkとハンドラーも計測"
+    )
+    parser.add_argument("--top", type=int, default=20, help="表示する件数")
+    parser.add_argument("--sort", choices=["self", "cumulative"], default="cumulative", help="並び順")
+    parser.add_argument("--json", help="計測結果を保存するJSONファイル")
+    parser.add_argument("--max-total-ms", type=float, help="合計時間の上限（超えた場合は終了コード1）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_dir = Path(__file__).resolve().parent
+        if args.package:
+            package_dir = Path(args.package).resolve()
+            if package_dir.suffix == ".zip":
+                with zipfile.ZipFile(package_dir) as zipf:
+                    zipf.extractall(temp_dir)
+                package_dir = Path(temp_dir)
+
+        try:
+            entries = measure_import_times(package_dir, args.module, args.include_lazy)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+
+    report = build_report(entries, args.module, args.top, f"{args.sort}_ms")
+    print_report(report)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 計測結果を保存しました: {args.json}")
+
+    if args.max_total_ms is not None and report["total_ms"] > args.max_total_ms:
+        print(f"❌ 読み込み時間が上限を超えています: {report['total_ms']:.1f}ms > {args.max_total_ms:.1f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
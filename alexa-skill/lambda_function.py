@@ -20,105 +20,88 @@ Googleスプレッドシートに掃除記録を保存し、期限切れの掃
 """
 
 import logging
-import os
-import sys
-from ask_sdk_core.skill_builder import SkillBuilder
-from ask_sdk_core.dispatch_components import AbstractExceptionHandler
-from ask_sdk_core.handler_input import HandlerInput
-from ask_sdk_model import Response
+import time
 
-# CloudWatch Logsへの確実な出力のためのログ設定
-# ストリームハンドラーを明示的に追加
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.INFO)
+# コールドスタート時のモジュール読み込み時間の計測開始
+_MODULE_LOAD_STARTED = time.perf_counter()
 
-# 既存ハンドラーをクリア
-for handler in root_logger.handlers[:]:
-    root_logger.removeHandler(handler)
+from src.logging_setup import configure_logging  # noqa: E402
 
-# CloudWatch用のストリームハンドラーを追加
-handler = logging.StreamHandler(sys.stdout)
-handler.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
-root_logger.addHandler(handler)
+# CloudWatch Logsへの確実な出力のためのログ設定
+# 形式（text / json）・レベル・キューによる非同期出力は環境変数で切り替え（src/logging_setup.py）
+configure_logging()
 
 logger = logging.getLogger(__name__)
 
 # 起動時のログ出力
 logger.info("🚀 Lambda関数モジュール読み込み開始")
 
-# ローカルモジュールのインポート
-try:
+# スキルハンドラー（最初のAlexaリクエストで作成し、ウォームコンテナでは再利用）
+# ask_sdkとハンドラーの読み込みをモジュール読み込み時に行わず、ヘルスチェックなどAlexa以外のイベントでは読み込まない
+_skill_handler = None
+# 実行環境で最初の呼び出し（コールドスタート）かどうかと、モジュール読み込みにかかった時間（ミリ秒）
+_cold_start = True
+_module_import_ms = 0.0
+
+
+def _build_skill_handler():
+    """SkillBuilderにハンドラーを登録し、スキルハンドラーを作成"""
+    from ask_sdk_core.skill_builder import SkillBuilder
+
     from src.alexa_handlers import (
         LaunchRequestHandler,
         RecordCleaningIntentHandler,
         CheckCleaningStatusIntentHandler,
+        ContinueCleaningStatusIntentHandler,
         HelpIntentHandler,
         CancelOrStopIntentHandler,
         FallbackIntentHandler,
         SessionEndedRequestHandler,
+        GlobalExceptionHandler,
     )
 
-    logger.info("✅ Alexaハンドラーのインポート成功")
-except Exception as e:
-    logger.error(f"❌ Alexaハンドラーのインポートエラー: {e}")
-    raise
-
-# スキルビルダーの作成
-sb = SkillBuilder()
-logger.info("✅ SkillBuilder作成完了")
-
-
-class GlobalExceptionHandler(AbstractExceptionHandler):
-    """グローバル例外ハンドラー"""
-
-    def can_handle(self, handler_input: HandlerInput, exception: Exception) -> bool:
-        return True
-
-    def handle(self, handler_input: HandlerInput, exception: Exception) -> Response:
-        logger.error(f"❌ グローバル例外: {exception}")
-        logger.error(f"❌ 例外タイプ: {type(exception).__name__}")
-
-        # スタックトレースも出力
-        import traceback
-
-        logger.error(f"❌ スタックトレース: {traceback.format_exc()}")
-
-        speech_text = "申し訳ございません。システムエラーが発生しました。しばらく経ってから再度お試しください。"
+    sb = SkillBuilder()
 
-        return handler_input.response_builder.speak(speech_text).response
-
-
-# ハンドラーの登録
-try:
+    # ハンドラーの登録
     sb.add_request_handler(LaunchRequestHandler())
     sb.add_request_handler(RecordCleaningIntentHandler())
     sb.add_request_handler(CheckCleaningStatusIntentHandler())
+    sb.add_request_handler(ContinueCleaningStatusIntentHandler())
     sb.add_request_handler(HelpIntentHandler())
     sb.add_request_handler(CancelOrStopIntentHandler())
     sb.add_request_handler(FallbackIntentHandler())
     sb.add_request_handler(SessionEndedRequestHandler())
-    logger.info("✅ リクエストハンドラー登録完了")
-except Exception as e:
-    logger.error(f"❌ ハンドラー登録エラー: {e}")
-    raise
 
-# 例外ハンドラーの登録
-try:
+    # 例外ハンドラーの登録
     sb.add_exception_handler(GlobalExceptionHandler())
-    logger.info("✅ 例外ハンドラー登録完了")
-except Exception as e:
-    logger.error(f"❌ 例外ハンドラー登録エラー: {e}")
-    raise
 
-# Lambda関数のハンドラー
-try:
-    lambda_handler = sb.lambda_handler()
-    logger.info("✅ Lambda関数ハンドラー作成完了")
-except Exception as e:
-    logger.error(f"❌ Lambda関数ハンドラー作成エラー: {e}")
-    raise
+    logger.info("✅ スキルハンドラー作成完了")
+    return sb.lambda_handler()
+
+
+def lambda_handler(event, context):
+    """
+    Alexaリクエストをスキルハンドラーで処理
+
+    Args:
+        event: Alexaからのリクエストイベント
+        context: Lambda実行コンテキスト
+
+    Returns:
+        Alexaへのレスポンス
+    """
+    return _load_skill_handler()(event, context)
+
+
+def _load_skill_handler():
+    """スキルハンドラーを取得（初回のみ作成）"""
+    global _skill_handler
+    if _skill_handler is None:
+        from src.invocation_metrics import measure_phase
+
+        with measure_phase("SkillHandlerLoad"):
+            _skill_handler = _build_skill_handler()
+    return _skill_handler
 
 
 def lambda_handler_wrapper(event, context):
@@ -132,96 +115,125 @@ def lambda_handler_wrapper(event, context):
     Returns:
         Alexaへのレスポンス
     """
-    # 関数開始時のログ
-    logger.info("=" * 50)
-    logger.info("🎯 Lambda関数実行開始")
-    logger.info(f"📥 リクエストID: {context.aws_request_id}")
-    logger.info(f"📥 関数名: {context.function_name}")
-    logger.info(f"📥 実行時間制限: {context.get_remaining_time_in_millis()}ms")
-
-    try:
-        # イベントの詳細情報をログ出力
-        request_type = event.get("request", {}).get("type", "Unknown")
-        logger.info(f"📥 リクエストタイプ: {request_type}")
-
-        # セッション情報も記録
-        session_id = event.get("session", {}).get("sessionId", "Unknown")
-        logger.info(f"📥 セッションID: {session_id}")
-
-        # 詳細なイベント情報（機密情報は除く）
-        safe_event = {
-            "version": event.get("version"),
-            "session": {
-                "new": event.get("session", {}).get("new"),
-                "sessionId": event.get("session", {}).get("sessionId"),
-                "application": event.get("session", {}).get("application"),
-            },
-            "request": event.get("request", {}),
-        }
-        logger.info(f"📥 イベント詳細: {safe_event}")
+    global _cold_start
+    from src.invocation_metrics import (
+        clear_invocation_metrics,
+        emit_invocation_metrics,
+        measure_phase,
+        record_phase,
+        set_dimension,
+        set_property,
+        start_invocation_metrics,
+    )
+    from src.logging_setup import flush_logs, should_log_verbose
 
-        # 環境変数の確認
-        logger.info("🔍 環境変数チェック開始")
-        required_env_vars = ["GOOGLE_SERVICE_ACCOUNT_KEY", "GOOGLE_SPREADSHEET_ID"]
-        missing_vars = [var for var in required_env_vars if not os.environ.get(var)]
+    # 関数開始時のログ（JSON形式ではextraの項目がフィールドとして出力される）
+    request = event.get("request", {}) if isinstance(event, dict) else {}
+    log_fields = {
+        "aws_request_id": context.aws_request_id,
+        "request_type": request.get("type", "Unknown"),
+    }
+    logger.info(
+        "🎯 Lambda関数実行開始: %s（関数名: %s, 実行時間制限: %sms）",
+        context.aws_request_id,
+        context.function_name,
+        context.get_remaining_time_in_millis(),
+        extra=log_fields,
+    )
 
-        if missing_vars:
-            logger.error(f"❌ 必要な環境変数が設定されていません: {missing_vars}")
-            raise ValueError(f"Missing environment variables: {missing_vars}")
+    # 段階別の所要時間を集計し、呼び出しの終了時にEMF形式のメトリクスとして1行で出力する
+    start_invocation_metrics(cold_start=_cold_start)
+    if _cold_start:
+        record_phase("ColdImport", _module_import_ms)
+        _cold_start = False
+    set_dimension("RequestType", log_fields["request_type"])
+    set_dimension("Intent", request.get("intent", {}).get("name"))
+    set_property("aws_request_id", context.aws_request_id)
 
-        logger.info("✅ 環境変数チェック完了")
-        logger.info(f"📋 スプレッドシートID: {os.environ.get('GOOGLE_SPREADSHEET_ID')}")
+    from src.health_check import is_health_check_event, run_health_check
 
-        # Google Sheets接続のテスト
-        logger.info("📚 Google Sheets接続テスト開始")
+    # ヘルスチェック（ウォームアップ）イベント：共有クライアントとキャッシュを準備して準備状況を返す
+    if is_health_check_event(event):
+        set_dimension("RequestType", "HealthCheck")
         try:
-            from src.google_sheets_manager import GoogleSheetsManager
+            return run_health_check(skill_loader=_load_skill_handler)
+        finally:
+            logger.info("⏰ 実行終了時点の残り時間: %sms", context.get_remaining_time_in_millis(), extra=log_fields)
+            with measure_phase("LogFlush"):
+                flush_logs()
+            emit_invocation_metrics()
+            clear_invocation_metrics()
 
-            logger.info("✅ GoogleSheetsManagerのインポート成功")
+    from src.request_deadline import clear_request_deadline, start_request_deadline
 
-            # 簡単な接続テスト
-            GoogleSheetsManager()  # インスタンス化のテストのみ
-            logger.info("✅ GoogleSheetsManager初期化成功")
+    # 残り時間からこのリクエストの時間予算を決める（Sheets API呼び出しのタイムアウトと再試行に反映）
+    start_request_deadline(context)
 
-        except Exception as sheets_error:
-            logger.error(f"❌ Google Sheets接続エラー: {sheets_error}")
-            logger.error(f"❌ エラータイプ: {type(sheets_error).__name__}")
+    # リクエスト・レスポンス全体のログはサンプリングした呼び出しだけ出力
+    verbose = should_log_verbose() and logger.isEnabledFor(logging.INFO)
 
-            # 詳細なスタックトレース
-            import traceback
+    try:
+        session = event.get("session", {})
+        logger.info(
+            "📥 リクエストタイプ: %s, セッションID: %s",
+            log_fields["request_type"],
+            session.get("sessionId", "Unknown"),
+            extra=log_fields,
+        )
+
+        if verbose:
+            # 詳細なイベント情報（機密情報は除く）
+            safe_event = {
+                "version": event.get("version"),
+                "session": {
+                    "new": session.get("new"),
+                    "sessionId": session.get("sessionId"),
+                    "application": session.get("application"),
+                },
+                "request": request,
+            }
+            logger.info("📥 イベント詳細: %s", safe_event, extra=log_fields)
 
-            logger.error(f"❌ Google Sheets詳細エラー: {traceback.format_exc()}")
-            raise
+        from src.storage_backend import get_backend_name, get_storage_backend
 
-        # スキルハンドラーを実行
-        logger.info("🎯 スキルハンドラー実行開始")
-        response = lambda_handler(event, context)
-        logger.info("✅ スキルハンドラー実行完了")
+        # ストレージへの接続は、ハンドラーが最初に必要とした時点で行う（ウォームコンテナでは共有インスタンスを再利用）
+        logger.debug("📋 ストレージバックエンド: %s", get_backend_name())
 
-        # レスポンス情報をログ出力（機密情報は除く）
-        safe_response = {
-            "version": response.get("version"),
-            "response": {
-                "outputSpeech": response.get("response", {}).get("outputSpeech", {}).get("type"),
-                "shouldEndSession": response.get("response", {}).get("shouldEndSession"),
-            },
-        }
-        logger.info(f"📤 レスポンス概要: {safe_response}")
+        # ライトビハインドで保留中の掃除記録があればスプレッドシートへ書き出す
+        try:
+            from src.record_journal import flush_pending_records
+
+            with measure_phase("JournalFlush"):
+                flush_pending_records(get_storage_backend)
+        except Exception as journal_error:
+            # 書き出せなかった記録はジャーナルに残り、次回再試行される
+            logger.error("❌ ジャーナル書き出しエラー: %s", journal_error, extra=log_fields)
+
+        from src.invocation_profiler import get_profile_modes, profile_invocation
+
+        # スキルハンドラーを実行（プロファイルが有効な場合はcProfile・tracemallocで計測）
+        logger.debug("🎯 スキルハンドラー実行開始")
+        with measure_phase("Handler"), profile_invocation(get_profile_modes(event), context.aws_request_id):
+            response = lambda_handler(event, context)
+        logger.debug("✅ スキルハンドラー実行完了")
+
+        if verbose:
+            # レスポンス情報をログ出力（機密情報は除く）
+            safe_response = {
+                "version": response.get("version"),
+                "response": {
+                    "outputSpeech": response.get("response", {}).get("outputSpeech", {}).get("type"),
+                    "shouldEndSession": response.get("response", {}).get("shouldEndSession"),
+                },
+            }
+            logger.info("📤 レスポンス概要: %s", safe_response, extra=log_fields)
 
-        logger.info("✅ Lambda関数正常終了")
-        logger.info("=" * 50)
+        logger.info("✅ Lambda関数正常終了", extra=log_fields)
         return response
 
     except Exception as e:
-        logger.error("=" * 50)
-        logger.error(f"❌ Lambda関数エラー: {e}")
-        logger.error(f"❌ エラータイプ: {type(e).__name__}")
-        logger.error(f"❌ エラー詳細: {str(e)}")
-
         # スタックトレースもログに出力
-        import traceback
-
-        logger.error(f"❌ スタックトレース: {traceback.format_exc()}")
+        logger.exception("❌ Lambda関数エラー: %s: %s", type(e).__name__, e, extra=log_fields)
 
         # エラー時のフォールバック応答
         fallback_response = {
@@ -234,13 +246,24 @@ def lambda_handler_wrapper(event, context):
                 "shouldEndSession": True,
             },
         }
-        logger.error(f"📤 フォールバックレスポンス: {fallback_response}")
-        logger.error("=" * 50)
+        logger.error("📤 フォールバックレスポンス: %s", fallback_response, extra=log_fields)
         return fallback_response
 
     finally:
+        clear_request_deadline()
         # 実行終了時の情報
-        logger.info(f"⏰ 実行終了時点の残り時間: {context.get_remaining_time_in_millis()}ms")
+        logger.info("⏰ 実行終了時点の残り時間: %sms", context.get_remaining_time_in_millis(), extra=log_fields)
+        # キューに残ったログを、実行環境が凍結される前に書き出す
+        # （応答を返す前に待つ時間をLogFlushMsとして記録するため、メトリクスの出力より先に行う）
+        with measure_phase("LogFlush"):
+            flush_logs()
+        emit_invocation_metrics()
+        clear_invocation_metrics()
+
+
+# モジュール読み込みの完了（直接実行時のテスト呼び出しより前に、読み込み時間を確定させる）
+_module_import_ms = (time.perf_counter() - _MODULE_LOAD_STARTED) * 1000
+logger.info("🏁 Lambda関数モジュール読み込み完了")
 
 
 # 直接実行時のテスト用
@@ -271,6 +294,5 @@ if __name__ == "__main__":
 
     logger.info("🧪 テスト実行中...")
     result = lambda_handler_wrapper(test_event, test_context)
-    logger.info(f"📤 テスト結果: {result}")
+    logger.info("📤 テスト結果: %s", result)
 
-logger.info("🏁 Lambda関数モジュール読み込み完了")
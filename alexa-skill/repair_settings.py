@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+音声ベース掃除記録システム - 掃除種別設定の修復
+
+掃除記録の書き込み後に掃除種別設定の更新だけが失敗した場合（エラーはログに出力されるのみ）、
+設定シートの最終実施日・次回予定日が掃除記録とずれたままになります。
+このスクリプトは掃除記録シートを1回だけ読み込んで掃除種別ごとの最新の実施日時を求め、
+推奨頻度から次回予定日を再計算し、値が変わる行だけを1回のbatch_updateで書き込みます。
+
+使用方法:
+    python repair_settings.py [--dry-run] [--json report.json]
+
+オプション:
+    --dry-run: 差分の表示のみ行い、スプレッドシートには書き込まない
+    --json: 差分を保存するJSONファイル
+
+環境変数（必須）:
+    - GOOGLE_SERVICE_ACCOUNT_KEY: Google Service Accountのキー（JSON形式）
+    - GOOGLE_SPREADSHEET_ID: 対象のGoogle SpreadsheetのID
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+
+def repair_settings(manager, dry_run: bool = False) -> List[Dict]:
+    """
+    掃除記録から掃除種別設定の最終実施日・次回予定日を再計算
+
+    掃除記録のない掃除種別は変更しません。
+
+    Args:
+        manager: GoogleSheetsManager
+        dry_run: Trueの場合、差分を返すだけで書き込まない
+
+    Returns:
+        List[Dict]: 変更した（dry_runの場合は変更する）行の差分
+    """
+    latest = manager.get_latest_cleaning_timestamps()
+    # 掃除記録を正とするため、設定シートの日付の方が新しい場合も掃除記録の日時に合わせる
+    return manager.apply_last_cleaning_dates(latest, only_newer=False, dry_run=dry_run)
+
+
+def print_changes(changes: List[Dict]):
+    """差分を表示"""
+    for change in changes:
+        print(
+            f"📍 {change['type']}（行{change['row']}）: "
+            f"最終実施日 {change['last_date'][0] or '（なし）'} → {change['last_date'][1]}, "
+            f"次回予定日 {change['next_date'][0] or '（なし）'} → {change['next_date'][1]}"
+        )
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="音声ベース掃除記録システム - 掃除種別設定の修復")
+    parser.add_argument("--dry-run", action="store_true", help="差分の表示のみ行い、スプレッドシートには書き込まない")
+    parser.add_argument("--json", help="差分を保存するJSONファイル")
+    parser.add_argument("--verbose", action="store_true", help="Sheets APIの呼び出しログも表示")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(levelname)s %(message)s")
+
+    from src.google_sheets_manager import get_sheets_manager
+
+    try:
+        changes = repair_settings(get_sheets_manager(), dry_run=args.dry_run)
+    except Exception as e:
+        print(f"❌ 掃除種別設定の修復エラー: {e}")
+        return 1
+
+    print_changes(changes)
+    if args.json:
+        Path(args.json).write_text(json.dumps(changes, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 差分を保存しました: {args.json}")
+
+    if not changes:
+        print("✅ 掃除種別設定は掃除記録と一致しています")
+    elif args.dry_run:
+        print(f"🔍 dry-run: {len(changes)}種別の設定が掃除記録とずれています（書き込みなし）")
+    else:
+        print(f"✅ 掃除種別設定を修復しました: {len(changes)}種別")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
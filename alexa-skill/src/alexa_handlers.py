@@ -6,16 +6,115 @@ Alexa Skills Kitハンドラーモジュール
 """
 
 import logging
-from ask_sdk_core.dispatch_components import AbstractRequestHandler
+from datetime import datetime
+from typing import List, Tuple
+
+from ask_sdk_core.dispatch_components import AbstractRequestHandler, AbstractExceptionHandler
 from ask_sdk_core.utils import is_request_type, is_intent_name
 from ask_sdk_core.handler_input import HandlerInput
 from ask_sdk_model import Response
 from ask_sdk_model.ui import SimpleCard
 
-from .google_sheets_manager import GoogleSheetsManager
+from .storage_backend import get_storage_backend
+from .record_journal import get_record_journal, is_write_behind_enabled
+from .request_deadline import DeadlineExceeded, is_deadline_exhausted
+from .circuit_breaker import CircuitOpenError, get_sheets_circuit_breaker
+from .invocation_metrics import measure_phase
+from .idempotency import record_keys
 
 logger = logging.getLogger(__name__)
 
+# セッション属性のキー（期限切れ掃除リストと、読み上げ済みの件数）
+SESSION_OVERDUE_KEY = "overdue_cleanings"
+SESSION_OFFSET_KEY = "overdue_offset"
+
+# 1回の応答で詳細を読み上げる件数
+DETAIL_PAGE_SIZE = 5
+
+# ストレージが一時的に使えないことを表す例外（縮退した応答を返す）
+UNAVAILABLE_ERRORS = (DeadlineExceeded, CircuitOpenError)
+
+
+def _is_storage_unavailable() -> bool:
+    """時間予算切れ、またはSheetsのサーキットブレーカーが開いているかどうか"""
+    return is_deadline_exhausted() or get_sheets_circuit_breaker().is_open()
+
+
+def _get_overdue_cleanings(handler_input: HandlerInput) -> Tuple[list, bool]:
+    """
+    期限切れ掃除リストを取得（同じセッション内ではセッション属性に保存したリストを再利用）
+
+    Args:
+        handler_input: ハンドラー入力
+
+    Returns:
+        Tuple[list, bool]: 期限切れの掃除リスト（優先度順）と、時間内に読み込めず前回の情報を返したかどうか
+
+    Raises:
+        DeadlineExceeded: 時間内に読み込めず、前回の情報もない場合
+        CircuitOpenError: Sheetsへの呼び出しが遮断中で、前回の情報もない場合
+    """
+    session_attributes = handler_input.attributes_manager.session_attributes
+    overdue_cleanings = session_attributes.get(SESSION_OVERDUE_KEY)
+    if overdue_cleanings is not None:
+        logger.info("⚡ セッションの期限切れ掃除リストを再利用: %s件", len(overdue_cleanings))
+        return overdue_cleanings, False
+
+    with measure_phase("StorageConnect"):
+        sheets_manager = get_storage_backend()
+    with measure_phase("OverdueLookup"):
+        overdue_cleanings = sheets_manager.get_overdue_cleanings()
+    stale = getattr(sheets_manager, "last_overdue_stale", False)
+    error = getattr(sheets_manager, "last_overdue_error", None)
+    if not stale and not overdue_cleanings:
+        # 読み込み失敗による空のリストを「期限切れなし」と伝えないようにする
+        if isinstance(error, UNAVAILABLE_ERRORS):
+            raise error
+        if is_deadline_exhausted():
+            raise DeadlineExceeded("期限切れ掃除リストを時間内に取得できませんでした")
+
+    session_attributes[SESSION_OVERDUE_KEY] = overdue_cleanings
+    session_attributes[SESSION_OFFSET_KEY] = 0
+    return overdue_cleanings, stale
+
+
+def _get_cleaning_types(slot) -> List[str]:
+    """
+    CleaningTypeスロットから掃除種別のリストを取得
+
+    複数値スロット（「トイレと風呂を掃除しました」）の場合は全ての値を、通常のスロットの場合は1件を返します。
+
+    Args:
+        slot: CleaningTypeスロット（Noneの場合は空のリスト）
+
+    Returns:
+        List[str]: 掃除種別のリスト（重複は除く）
+    """
+    if slot is None:
+        return []
+    slot_value = getattr(slot, "slot_value", None)
+    values = getattr(slot_value, "values", None)
+    if values:
+        cleaning_types = [value.value for value in values if getattr(value, "value", None)]
+    elif slot.value:
+        cleaning_types = [slot.value]
+    else:
+        cleaning_types = []
+    return list(dict.fromkeys(cleaning_types))
+
+
+def _format_overdue_details(items: list) -> str:
+    """期限切れ掃除の詳細（掃除種別・遅延日数・優先度）を読み上げ用に整形"""
+    details = []
+    for item in items:
+        days = item["days_overdue"]
+        priority = item["priority"]
+        if days == 0:
+            details.append(f"{item['type']}（本日が期限、優先度{priority}）")
+        else:
+            details.append(f"{item['type']}（{days}日遅れ、優先度{priority}）")
+    return "、".join(details)
+
 
 class LaunchRequestHandler(AbstractRequestHandler):
     """起動時のハンドラー"""
@@ -27,14 +126,23 @@ class LaunchRequestHandler(AbstractRequestHandler):
         try:
             logger.info("🚀 掃除管理スキル起動")
 
-            # 期限切れの掃除をチェック
-            sheets_manager = GoogleSheetsManager()
-            overdue_cleanings = sheets_manager.get_overdue_cleanings()
+            # 期限切れの掃除をチェック（続く状況確認で再利用するためセッション属性に保存）
+            try:
+                overdue_cleanings, stale = _get_overdue_cleanings(handler_input)
+            except UNAVAILABLE_ERRORS as e:
+                logger.warning("⏱️ 期限切れ掃除を確認できないまま起動: %s", e)
+                speech_text = (
+                    "掃除管理システムを開始します。"
+                    "掃除をした場合は「トイレ掃除をしました」のように話しかけてください。"
+                )
+                return handler_input.response_builder.speak(speech_text).set_should_end_session(False).response
 
             if overdue_cleanings:
                 # 期限切れがある場合
                 overdue_count = len(overdue_cleanings)
                 speech_text = f"掃除管理システムを開始します。現在、{overdue_count}件の掃除が期限切れです。"
+                if stale:
+                    speech_text = f"掃除管理システムを開始します。前回の確認では、{overdue_count}件の掃除が期限切れでした。"
                 speech_text += " 掃除をした場合は「トイレ掃除をしました」のように話しかけてください。"
 
             else:
@@ -44,7 +152,7 @@ class LaunchRequestHandler(AbstractRequestHandler):
                     "掃除をした場合は「トイレ掃除をしました」のように話しかけてください。"
                 )
 
-            logger.info(f"✅ 起動応答: 期限切れ{len(overdue_cleanings)}件")
+            logger.info("✅ 起動応答: 期限切れ%s件", len(overdue_cleanings))
 
             return (
                 handler_input.response_builder.speak(speech_text)
@@ -54,7 +162,7 @@ class LaunchRequestHandler(AbstractRequestHandler):
             )
 
         except Exception as e:
-            logger.error(f"❌ 起動ハンドラーエラー: {e}")
+            logger.error("❌ 起動ハンドラーエラー: %s", e)
             error_speech = "申し訳ございません。システムの初期化中にエラーが発生しました。"
             return handler_input.response_builder.speak(error_speech).response
 
@@ -69,27 +177,67 @@ class RecordCleaningIntentHandler(AbstractRequestHandler):
         try:
             logger.info("📝 掃除記録処理開始")
 
-            # スロットから掃除種別を取得
-            slots = handler_input.request_envelope.request.intent.slots
-            cleaning_type_slot = slots.get("CleaningType")
+            # スロットから掃除種別を取得（複数値スロットの場合は複数件）
+            slots = handler_input.request_envelope.request.intent.slots or {}
+            cleaning_types = _get_cleaning_types(slots.get("CleaningType"))
 
-            if not cleaning_type_slot or not cleaning_type_slot.value:
+            if not cleaning_types:
                 speech_text = "掃除の種類が聞き取れませんでした。もう一度お話しください。"
                 return handler_input.response_builder.speak(speech_text).set_should_end_session(False).response
 
-            cleaning_type = cleaning_type_slot.value
-            logger.info(f"🎯 掃除種別: {cleaning_type}")
-
-            # Google Sheetsに記録
-            sheets_manager = GoogleSheetsManager()
-            success = sheets_manager.add_cleaning_record(cleaning_type)
-
-            if success:
+            cleaning_type = "、".join(cleaning_types)
+            logger.info("🎯 掃除種別: %s", cleaning_type)
+
+            request_id = handler_input.request_envelope.request.request_id
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            queued = False
+
+            if is_write_behind_enabled() or is_deadline_exhausted():
+                # ライトビハインド（または時間予算切れ）：ジャーナルに保存して即応答（次回の呼び出し時にスプレッドシートへ書き出す）
+                with measure_phase("JournalEnqueue"):
+                    journal = get_record_journal()
+                    for record_type, key in zip(cleaning_types, record_keys(request_id, cleaning_types)):
+                        journal.enqueue(record_type, timestamp, entry_id=key)
+                success = True
+                queued = not is_write_behind_enabled()
+            else:
+                # Google Sheetsに記録
+                try:
+                    with measure_phase("StorageConnect"):
+                        sheets_manager = get_storage_backend()
+                    with measure_phase("RecordWrite"):
+                        # 再試行で同じリクエストが届いた場合に二重に記録しないよう、リクエストIDを冪等性キーにする
+                        # 複数の掃除種別も1回の追記と1回の設定更新で記録する
+                        success = sheets_manager.add_cleaning_records(
+                            cleaning_types, timestamp=timestamp, idempotency_key=request_id
+                        )
+                except CircuitOpenError as e:
+                    logger.warning("🔌 %s", e)
+                    success = False
+                if not success and _is_storage_unavailable():
+                    # 時間内に（またはSheetsの障害中で）書き込めなかった記録はジャーナルに保存し、次回の呼び出し時に書き出す
+                    # （書き込みだけ成功している可能性があるため、書き出し前に重複を確認させる）
+                    with measure_phase("JournalEnqueue"):
+                        journal = get_record_journal()
+                        for record_type, key in zip(cleaning_types, record_keys(request_id, cleaning_types)):
+                            journal.enqueue(record_type, timestamp, entry_id=key, attempted=True)
+                    success = True
+                    queued = True
+
+            # 記録により期限切れ掃除リストが変わるため、セッションに保存したリストを破棄
+            session_attributes = handler_input.attributes_manager.session_attributes
+            session_attributes.pop(SESSION_OVERDUE_KEY, None)
+            session_attributes.pop(SESSION_OFFSET_KEY, None)
+
+            if queued:
+                speech_text = f"{cleaning_type}の記録を受け付けました。スプレッドシートには後ほど保存します。お疲れさまでした！"
+                logger.warning("⏱️ スプレッドシートに書き込めないため掃除記録をジャーナルに保存: %s", cleaning_type)
+            elif success:
                 speech_text = f"{cleaning_type}の記録を保存しました。お疲れさまでした！"
-                logger.info(f"✅ 掃除記録成功: {cleaning_type}")
+                logger.info("✅ 掃除記録成功: %s", cleaning_type)
             else:
                 speech_text = "記録の保存中にエラーが発生しました。もう一度お試しください。"
-                logger.error(f"❌ 掃除記録失敗: {cleaning_type}")
+                logger.error("❌ 掃除記録失敗: %s", cleaning_type)
 
             return (
                 handler_input.response_builder.speak(speech_text)
@@ -99,7 +247,7 @@ class RecordCleaningIntentHandler(AbstractRequestHandler):
             )
 
         except Exception as e:
-            logger.error(f"❌ 掃除記録ハンドラーエラー: {e}")
+            logger.error("❌ 掃除記録ハンドラーエラー: %s", e)
             error_speech = "申し訳ございません。掃除記録中にエラーが発生しました。"
             return handler_input.response_builder.speak(error_speech).response
 
@@ -114,42 +262,99 @@ class CheckCleaningStatusIntentHandler(AbstractRequestHandler):
         try:
             logger.info("📊 掃除状況確認処理開始")
 
-            sheets_manager = GoogleSheetsManager()
-            overdue_cleanings = sheets_manager.get_overdue_cleanings()
+            try:
+                overdue_cleanings, stale = _get_overdue_cleanings(handler_input)
+            except UNAVAILABLE_ERRORS as e:
+                logger.warning("⏱️ 掃除状況を確認できませんでした: %s", e)
+                speech_text = "申し訳ございません。現在、掃除の状況を確認できませんでした。しばらくしてからもう一度お試しください。"
+                return handler_input.response_builder.speak(speech_text).set_should_end_session(True).response
+            has_more = False
 
             if not overdue_cleanings:
                 speech_text = "素晴らしいです！現在、期限切れの掃除はありません。"
             else:
                 overdue_count = len(overdue_cleanings)
                 speech_text = f"現在、{overdue_count}件の掃除が期限切れです。"
+                if stale:
+                    speech_text = f"最新の情報を確認できなかったため、前回の情報をお伝えします。{overdue_count}件の掃除が期限切れでした。"
 
                 # 上位5件を詳細に報告
-                top_overdue = overdue_cleanings[:5]
-                details = []
-                for item in top_overdue:
-                    days = item["days_overdue"]
-                    priority = item["priority"]
-                    if days == 0:
-                        details.append(f"{item['type']}（本日が期限、優先度{priority}）")
-                    else:
-                        details.append(f"{item['type']}（{days}日遅れ、優先度{priority}）")
-
-                speech_text += " 詳細は、" + "、".join(details)
-                if len(overdue_cleanings) > 5:
-                    speech_text += f"、他{len(overdue_cleanings) - 5}件"
-                speech_text += "です。"
-
-            logger.info(f"✅ 状況確認応答: 期限切れ{len(overdue_cleanings)}件")
+                top_overdue = overdue_cleanings[:DETAIL_PAGE_SIZE]
+                speech_text += " 詳細は、" + _format_overdue_details(top_overdue)
+                has_more = overdue_count > DETAIL_PAGE_SIZE
+                if has_more:
+                    speech_text += f"、他{overdue_count - DETAIL_PAGE_SIZE}件です。"
+                    speech_text += " 続きを聞く場合は「続きを教えて」と話しかけてください。"
+                else:
+                    speech_text += "です。"
+
+            handler_input.attributes_manager.session_attributes[SESSION_OFFSET_KEY] = min(
+                len(overdue_cleanings), DETAIL_PAGE_SIZE
+            )
+            logger.info("✅ 状況確認応答: 期限切れ%s件", len(overdue_cleanings))
 
             return (
                 handler_input.response_builder.speak(speech_text)
                 .set_card(SimpleCard("掃除状況", speech_text))
-                .set_should_end_session(True)
+                .set_should_end_session(not has_more)
+                .response
+            )
+
+        except Exception as e:
+            logger.error("❌ 状況確認ハンドラーエラー: %s", e)
+            error_speech = "申し訳ございません。状況確認中にエラーが発生しました。"
+            return handler_input.response_builder.speak(error_speech).response
+
+
+class ContinueCleaningStatusIntentHandler(AbstractRequestHandler):
+    """掃除状況の続き（次の5件）のハンドラー"""
+
+    def can_handle(self, handler_input: HandlerInput) -> bool:
+        return is_intent_name("ContinueCleaningStatusIntent")(handler_input)
+
+    def handle(self, handler_input: HandlerInput) -> Response:
+        try:
+            logger.info("📊 掃除状況の続き処理開始")
+
+            session_attributes = handler_input.attributes_manager.session_attributes
+            # セッションにリストがない場合（状況確認を経ずに「続き」と言われた場合）は、上位5件の次から読み上げる
+            in_session = session_attributes.get(SESSION_OVERDUE_KEY) is not None
+
+            # 同じセッション内であれば、保存済みのリストを使うためスプレッドシートは読み込まない
+            try:
+                overdue_cleanings, _ = _get_overdue_cleanings(handler_input)
+            except UNAVAILABLE_ERRORS as e:
+                logger.warning("⏱️ 掃除状況の続きを確認できませんでした: %s", e)
+                speech_text = "申し訳ございません。現在、掃除の状況を確認できませんでした。しばらくしてからもう一度お試しください。"
+                return handler_input.response_builder.speak(speech_text).set_should_end_session(True).response
+            offset = session_attributes.get(SESSION_OFFSET_KEY, 0) if in_session else DETAIL_PAGE_SIZE
+
+            page = overdue_cleanings[offset : offset + DETAIL_PAGE_SIZE]
+            if not page:
+                speech_text = "期限切れの掃除はこれ以上ありません。"
+                has_more = False
+            else:
+                next_offset = offset + len(page)
+                speech_text = f"{offset + 1}件目から{next_offset}件目は、" + _format_overdue_details(page)
+                has_more = len(overdue_cleanings) > next_offset
+                if has_more:
+                    speech_text += f"、他{len(overdue_cleanings) - next_offset}件です。"
+                    speech_text += " 続きを聞く場合は「続きを教えて」と話しかけてください。"
+                else:
+                    speech_text += "です。以上です。"
+                session_attributes[SESSION_OFFSET_KEY] = next_offset
+
+            logger.info("✅ 状況の続き応答: %s件目以降 %s件", offset, len(page))
+
+            return (
+                handler_input.response_builder.speak(speech_text)
+                .set_card(SimpleCard("掃除状況", speech_text))
+                .set_should_end_session(not has_more)
                 .response
             )
 
         except Exception as e:
-            logger.error(f"❌ 状況確認ハンドラーエラー: {e}")
+            logger.error("❌ 状況の続きハンドラーエラー: %s", e)
             error_speech = "申し訳ございません。状況確認中にエラーが発生しました。"
             return handler_input.response_builder.speak(error_speech).response
 
@@ -228,7 +433,27 @@ class CatchAllExceptionHandler:
         return True
 
     def handle(self, handler_input, exception):
-        logger.error(f"❌ 予期しないエラー: {exception}")
+        logger.error("❌ 予期しないエラー: %s", exception)
         speech_text = "申し訳ございません。予期しないエラーが発生しました。"
 
         return handler_input.response_builder.speak(speech_text).set_card(SimpleCard("エラー", speech_text)).response
+
+
+class GlobalExceptionHandler(AbstractExceptionHandler):
+    """グローバル例外ハンドラー"""
+
+    def can_handle(self, handler_input: HandlerInput, exception: Exception) -> bool:
+        return True
+
+    def handle(self, handler_input: HandlerInput, exception: Exception) -> Response:
+        logger.error("❌ グローバル例外: %s", exception)
+        logger.error("❌ 例外タイプ: %s", type(exception).__name__)
+
+        # スタックトレースも出力
+        import traceback
+
+        logger.error("❌ スタックトレース: %s", traceback.format_exc())
+
+        speech_text = "申し訳ございません。システムエラーが発生しました。しばらく経ってから再度お試しください。"
+
+        return handler_input.response_builder.speak(speech_text).response
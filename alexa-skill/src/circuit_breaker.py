@@ -0,0 +1,150 @@
+"""
+サーキットブレーカーモジュール
+
+Google Sheetsのような外部依存が停止・過負荷の間、呼び出しを一定時間遮断して
+すぐにエラーを返すためのサーキットブレーカーを提供します。
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 遮断するまでの連続失敗回数と、遮断を続ける秒数を指定する環境変数
+FAILURE_THRESHOLD_ENV = "CLEANING_BREAKER_FAILURE_THRESHOLD"
+COOL_DOWN_ENV = "CLEANING_BREAKER_COOL_DOWN_SECONDS"
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOL_DOWN_SECONDS = 30.0
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """サーキットブレーカーが開いているため呼び出しを遮断した"""
+
+
+class CircuitBreaker:
+    """
+    サーキットブレーカー
+
+    - closed: 呼び出しを通す。連続でfailure_threshold回失敗するとopenになる
+    - open: cool_down秒の間、呼び出しを実行せずにCircuitOpenErrorを送出する
+    - half_open: cool_down経過後、1回だけ試行呼び出しを通す。成功すればclosed、失敗すれば再びopen
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        cool_down: Optional[float] = None,
+        clock=time.monotonic,
+    ):
+        """
+        サーキットブレーカーを初期化
+
+        Args:
+            name: ログ用の依存先の名前
+            failure_threshold: openになるまでの連続失敗回数（省略時は環境変数またはデフォルト値）
+            cool_down: openを続ける秒数（省略時は環境変数またはデフォルト値）
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or int(
+            os.environ.get(FAILURE_THRESHOLD_ENV, DEFAULT_FAILURE_THRESHOLD)
+        )
+        self.cool_down = cool_down if cool_down is not None else float(
+            os.environ.get(COOL_DOWN_ENV, DEFAULT_COOL_DOWN_SECONDS)
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.stats: Dict[str, int] = {"trips": 0, "short_circuits": 0, "probes": 0}
+
+    def is_open(self) -> bool:
+        """呼び出しを遮断中かどうか（試行呼び出しを待つ状態を含む）"""
+        with self._lock:
+            return self.state != STATE_CLOSED
+
+    def before_call(self):
+        """
+        呼び出し前の確認
+
+        Raises:
+            CircuitOpenError: 遮断中、または試行呼び出しの結果待ちの場合
+        """
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return
+            if self.state == STATE_OPEN:
+                remaining = self._opened_at + self.cool_down - self._clock()
+                if remaining > 0:
+                    self.stats["short_circuits"] += 1
+                    raise CircuitOpenError(f"{self.name}への呼び出しを遮断中です（残り{remaining:.1f}秒）")
+                self.state = STATE_HALF_OPEN
+                logger.info("🔌 サーキットブレーカー(%s): half_open、試行呼び出しを1回通します", self.name)
+            if self._probe_in_flight:
+                self.stats["short_circuits"] += 1
+                raise CircuitOpenError(f"{self.name}への試行呼び出しの結果待ちです")
+            self._probe_in_flight = True
+            self.stats["probes"] += 1
+
+    def record_success(self):
+        """呼び出しの成功を記録"""
+        with self._lock:
+            self._probe_in_flight = False
+            self.consecutive_failures = 0
+            if self.state != STATE_CLOSED:
+                self.state = STATE_CLOSED
+                logger.info("✅ サーキットブレーカー(%s): closed、呼び出しを再開します", self.name)
+
+    def release_probe(self):
+        """
+        呼び出しを送らずに終わった場合（リクエストの時間予算切れなど）に、試行呼び出しの枠だけを解放
+
+        成功・失敗のどちらも記録しないため、half_openの場合は次の呼び出しが改めて試行呼び出しになります。
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, error: Exception):
+        """
+        呼び出しの失敗を記録
+
+        Args:
+            error: 発生した例外
+        """
+        with self._lock:
+            self._probe_in_flight = False
+            self.consecutive_failures += 1
+            if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = STATE_OPEN
+                self._opened_at = self._clock()
+                self.stats["trips"] += 1
+                logger.warning(
+                    "🔌 サーキットブレーカー(%s): open（連続失敗%s回、トリップ累計%s回）、%.0f秒間呼び出しを遮断します: %s",
+                    self.name,
+                    self.consecutive_failures,
+                    self.stats["trips"],
+                    self.cool_down,
+                    error,
+                )
+
+
+# ウォームコンテナで共有するGoogle Sheets用のサーキットブレーカー
+_sheets_breaker: Optional[CircuitBreaker] = None
+
+
+def get_sheets_circuit_breaker() -> CircuitBreaker:
+    """共有のGoogle Sheets用サーキットブレーカーを取得"""
+    global _sheets_breaker
+    if _sheets_breaker is None:
+        _sheets_breaker = CircuitBreaker("Google Sheets")
+    return _sheets_breaker
@@ -0,0 +1,171 @@
+"""
+デフォルト掃除種別設定モジュール
+
+config/default_cleaning_settings.yaml をデプロイ時に検証してJSONの成果物
+（src/default_cleaning_settings.json）に変換する機能と、実行時にその成果物を読み込む機能を提供します。
+実行時にはPyYAMLを使わず、掃除種別設定シートを作成する時にだけ成果物を読み込みます。
+成果物のないローカル実行（ベンチマークやSQLiteバックエンドなど）では、同じYAMLを直接読み込みます。
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import List, Dict
+
+from .sheet_constants import CleaningSettingsSheet, Priority
+
+logger = logging.getLogger(__name__)
+
+# デプロイパッケージのsrcディレクトリに同梱する成果物
+ARTIFACT_NAME = "default_cleaning_settings.json"
+ARTIFACT_PATH = Path(__file__).parent / ARTIFACT_NAME
+
+# デフォルト掃除種別設定のYAML（プロジェクト直下、またはリポジトリ直下のconfigディレクトリ）
+DEFAULT_SETTINGS_YAML = Path("config") / "default_cleaning_settings.yaml"
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def validate_cleaning_types(config) -> List[Dict]:
+    """
+    YAMLから読み込んだ掃除種別設定を検証
+
+    掃除種別名が重複している場合は、最初の設定を使用し警告をログに出力します。
+
+    Args:
+        config: YAMLを読み込んだ辞書（cleaning_typesキーに掃除種別のリスト）
+
+    Returns:
+        List[Dict]: 検証済みの掃除種別（name, frequency, priority）のリスト
+
+    Raises:
+        ValueError: 必須項目の欠落、頻度が正の整数でない、優先度が高/中/低以外の場合
+    """
+    if not isinstance(config, dict) or not isinstance(config.get("cleaning_types"), list):
+        raise ValueError("cleaning_typesのリストが定義されていません")
+
+    priorities = {priority.value for priority in Priority}
+    cleaning_types = []
+    seen = set()
+    for index, item in enumerate(config["cleaning_types"], 1):
+        if not isinstance(item, dict):
+            raise ValueError(f"{index}件目: 掃除種別の定義が辞書ではありません: {item!r}")
+
+        name = str(item.get("name") or "").strip()
+        if not name:
+            raise ValueError(f"{index}件目: nameが指定されていません")
+
+        frequency = item.get("frequency")
+        if isinstance(frequency, bool) or not isinstance(frequency, int) or frequency <= 0:
+            raise ValueError(f"{index}件目（{name}）: frequencyは正の整数で指定してください: {frequency!r}")
+
+        priority = str(item.get("priority") or "").strip()
+        if priority not in priorities:
+            raise ValueError(f"{index}件目（{name}）: priorityは{sorted(priorities)}のいずれかで指定してください: {priority!r}")
+
+        if name in seen:
+            logger.warning("⚠️ %s件目: 掃除種別「%s」が重複しているため、最初の設定を使用します", index, name)
+            continue
+        seen.add(name)
+        cleaning_types.append({"name": name, "frequency": frequency, "priority": priority})
+
+    if not cleaning_types:
+        raise ValueError("掃除種別が1件も定義されていません")
+    return cleaning_types
+
+
+def find_default_settings_yaml(*base_dirs: Path):
+    """
+    デフォルト掃除種別設定のYAMLを探す
+
+    Args:
+        *base_dirs: 探すディレクトリ（指定したディレクトリの後に、プロジェクト直下・リポジトリ直下も探す）
+
+    Returns:
+        Optional[Path]: 見つかったYAMLのパス（見つからない場合None）
+    """
+    for base_dir in (*base_dirs, PROJECT_DIR, PROJECT_DIR.parent):
+        yaml_path = Path(base_dir) / DEFAULT_SETTINGS_YAML
+        if yaml_path.exists():
+            return yaml_path
+    return None
+
+
+def read_default_settings_yaml(yaml_path: Path) -> List[Dict]:
+    """
+    YAMLのデフォルト設定を読み込んで検証
+
+    Args:
+        yaml_path: config/default_cleaning_settings.yaml のパス
+
+    Returns:
+        List[Dict]: 検証済みの掃除種別のリスト
+
+    Raises:
+        ValueError: 設定の検証に失敗した場合
+    """
+    import yaml
+
+    with open(yaml_path, "r", encoding="utf-8") as f:
+        return validate_cleaning_types(yaml.safe_load(f))
+
+
+def compile_default_settings(yaml_path: Path, output_path: Path) -> List[Dict]:
+    """
+    YAMLのデフォルト設定を検証し、JSONの成果物として書き出す（デプロイ時に使用）
+
+    Args:
+        yaml_path: config/default_cleaning_settings.yaml のパス
+        output_path: 書き出す成果物のパス
+
+    Returns:
+        List[Dict]: 書き出した掃除種別のリスト
+
+    Raises:
+        ValueError: 設定の検証に失敗した場合
+    """
+    cleaning_types = read_default_settings_yaml(yaml_path)
+
+    artifact = {"source": Path(yaml_path).name, "cleaning_types": cleaning_types}
+    Path(output_path).write_text(json.dumps(artifact, ensure_ascii=False, indent=2), encoding="utf-8")
+    return cleaning_types
+
+
+def load_default_cleaning_settings() -> List[List]:
+    """
+    同梱の成果物からデフォルト掃除種別設定を読み込み、シートに書き込む行の形式に変換
+
+    成果物がない場合（デプロイ前のローカル実行など）は、成果物の元になるYAMLを直接読み込みます。
+
+    Returns:
+        List[List]: ヘッダー行を含む掃除種別設定の行のリスト
+
+    Raises:
+        FileNotFoundError: 成果物もYAMLも見つからない場合
+        ValueError: YAMLの検証に失敗した場合
+    """
+    try:
+        cleaning_types = json.loads(ARTIFACT_PATH.read_text(encoding="utf-8"))["cleaning_types"]
+        logger.info("📄 デフォルト掃除種別設定を読み込みました: %s件", len(cleaning_types))
+    except FileNotFoundError:
+        yaml_path = find_default_settings_yaml()
+        if yaml_path is None:
+            # 設定の異なる掃除種別でシートを作成しないよう、黙って代わりの設定を使わずに失敗させる
+            raise FileNotFoundError(
+                f"{ARTIFACT_NAME}が同梱されておらず、{DEFAULT_SETTINGS_YAML}も見つかりません（deploy.pyでパッケージを作成してください）"
+            )
+        cleaning_types = read_default_settings_yaml(yaml_path)
+        logger.info("📄 デフォルト掃除種別設定をYAMLから読み込みました: %s（%s件）", yaml_path, len(cleaning_types))
+
+    settings = [
+        [
+            CleaningSettingsSheet.TYPE,
+            CleaningSettingsSheet.FREQUENCY,
+            CleaningSettingsSheet.LAST_DATE,
+            CleaningSettingsSheet.NEXT_DATE,
+            CleaningSettingsSheet.PRIORITY,
+        ]
+    ]
+    for cleaning_type in cleaning_types:
+        # 最終実施日・次回予定日は空
+        settings.append([cleaning_type["name"], str(cleaning_type["frequency"]), "", "", cleaning_type["priority"]])
+    return settings
@@ -8,8 +8,11 @@ Googleスプレッドシートとの連携を管理するクラスを提供し
 import json
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict
+import random
+import time
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import List, Dict, Optional, Tuple
 
 from .sheet_constants import (
     CleaningRecordsSheet,
@@ -18,17 +21,55 @@ from .sheet_constants import (
     DefaultValue,
     SheetConstants,
 )
+from .circuit_breaker import CircuitOpenError, get_sheets_circuit_breaker
+from .idempotency import get_idempotency_guard, record_keys
+from .incremental_reader import IncrementalSheetReader
+from .invocation_metrics import API_CALLS_METRIC, increment_counter, measure_phase
+from .request_deadline import DeadlineExceeded, get_current_deadline
+from .sheets_rate_limiter import get_request_scheduler
+from .storage_backend import CleaningStorageBackend
 
 logger = logging.getLogger(__name__)
 
+# 期限切れ掃除リストのキャッシュ有効期間（秒）を指定する環境変数（0でキャッシュ無効）
+OVERDUE_CACHE_TTL_ENV = "CLEANING_OVERDUE_CACHE_TTL"
+DEFAULT_OVERDUE_CACHE_TTL_SECONDS = 60.0
 
-class GoogleSheetsManager:
+
+class GoogleSheetsManager(CleaningStorageBackend):
     """Google Sheetsの操作を管理するクラス"""
 
     def __init__(self):
         """Google Sheetsマネージャーを初期化"""
         self.gc = None
         self.spreadsheet = None
+        self.credentials = None
+        # スプレッドシートごとのワークシートハンドルのキャッシュ（シート名 -> Worksheet）
+        self._worksheets = {}
+        # Sheets APIの呼び出し回数（累計）と、直近のadd_cleaning_recordでの呼び出し回数
+        self.api_call_count = 0
+        self.last_api_call_count = 0
+        # 掃除種別設定シートのインデックス（掃除種別 -> (行番号, 推奨頻度)）と、構築時のA列の内容
+        self._settings_index: Optional[Dict[str, Tuple[int, str]]] = None
+        self._settings_index_column: List[str] = []
+        # 直近の掃除種別設定シート作成時に書き込みに失敗した行番号
+        self.last_provision_failed_rows: List[int] = []
+        # 掃除記録シート（追記専用）の差分リーダー
+        self._records_reader = IncrementalSheetReader(self._call)
+        # 掃除記録シートのリクエストID列から読み込んだID・読み込んだ行数・最終行の値（差分読み込み用）
+        self._request_ids: Optional[set] = None
+        self._request_id_rows = 0
+        self._request_id_anchor = ""
+        # ウォームコンテナ内で共有するSheets用サーキットブレーカー
+        self.breaker = get_sheets_circuit_breaker()
+        # 期限切れ掃除リストのキャッシュ（(計算時刻, 計算日, 結果)）と有効期間（秒）
+        self._overdue_cache: Optional[Tuple[float, date, List[Dict]]] = None
+        # 最後に計算できた期限切れ掃除リスト（読み込みに失敗した場合に古い情報として返す）
+        self._last_overdue: Optional[List[Dict]] = None
+        # 直近のget_overdue_cleaningsが古い情報を返したかどうかと、読み込みに失敗した場合の例外
+        self.last_overdue_stale = False
+        self.last_overdue_error: Optional[Exception] = None
+        self.overdue_cache_ttl = float(os.environ.get(OVERDUE_CACHE_TTL_ENV, DEFAULT_OVERDUE_CACHE_TTL_SECONDS))
         self._initialize()
 
     def _initialize(self):
@@ -41,207 +82,799 @@ class GoogleSheetsManager:
             if not service_account_key:
                 raise ValueError("GOOGLE_SERVICE_ACCOUNT_KEY環境変数が設定されていません")
 
-            service_account_info = json.loads(service_account_key)
-            credentials = Credentials.from_service_account_info(
-                service_account_info, scopes=["https://www.googleapis.com/auth/spreadsheets"]
-            )
-            self.gc = gspread.authorize(credentials)
+            with measure_phase("Credentials"):
+                service_account_info = json.loads(service_account_key)
+                credentials = Credentials.from_service_account_info(
+                    service_account_info, scopes=["https://www.googleapis.com/auth/spreadsheets"]
+                )
+                self.credentials = credentials
+                self.gc = gspread.authorize(credentials)
 
             spreadsheet_id = os.environ.get("GOOGLE_SPREADSHEET_ID")
             if not spreadsheet_id:
                 raise ValueError("GOOGLE_SPREADSHEET_ID環境変数が設定されていません")
 
-            self.spreadsheet = self.gc.open_by_key(spreadsheet_id)
-            logger.info(f"✅ Google Sheets初期化成功: {self.spreadsheet.title}")
+            with measure_phase("SpreadsheetOpen"):
+                self.spreadsheet = self.gc.open_by_key(spreadsheet_id)
+            self._worksheets = {}
+            self._settings_index = None
+            self._records_reader.reset()
+            self._request_ids = None
+            self._overdue_cache = None
+            logger.info("✅ Google Sheets初期化成功: %s", self.spreadsheet.title)
 
         except Exception as e:
-            logger.error(f"❌ Google Sheets初期化エラー: {e}")
+            logger.error("❌ Google Sheets初期化エラー: %s", e)
             raise
 
+    def ensure_fresh_credentials(self):
+        """
+        期限切れのアクセストークンを更新
+
+        トークンの更新自体に失敗した場合は、クライアントを作り直します。
+        """
+        if self.credentials is None or not self.credentials.expired:
+            return
+
+        try:
+            from google.auth.transport.requests import Request
+
+            with measure_phase("Credentials"):
+                self.credentials.refresh(Request())
+            logger.info("🔑 アクセストークンを更新しました")
+        except Exception as e:
+            logger.warning("⚠️ アクセストークン更新失敗、クライアントを再構築: %s", e)
+            self._initialize()
+
+    def _call(self, func, *args, **kwargs):
+        """
+        gspreadのAPI呼び出しを実行
+
+        呼び出しは共有のSheetsRequestSchedulerを経由し、クォータに合わせたレート制限と
+        429/5xxエラー時のバックオフ付き再試行が行われます。
+        再試行しても失敗が続く場合は共有のサーキットブレーカーが開き、一定時間はAPIを呼ばずに
+        CircuitOpenErrorを送出します。
+        リクエストの時間予算が設定されている場合は、残り時間をHTTPのタイムアウトとして設定します。
+        認証エラーの場合はトークンを更新（失敗時はクライアントを再構築）して1回だけ再試行します。
+
+        Args:
+            func: 呼び出すgspreadのメソッド
+            *args: メソッドの位置引数
+            **kwargs: メソッドのキーワード引数
+
+        Returns:
+            メソッドの戻り値
+        """
+        # Sheetsの障害中はAPIを呼ばずにすぐ失敗させる
+        self.breaker.before_call()
+        try:
+            result = self._call_with_auth_retry(func, *args, **kwargs)
+        except DeadlineExceeded:
+            # 時間予算切れはリクエストを送る前に発生するため、Sheetsの状態は分からない（成功・失敗のどちらも記録しない）
+            self.breaker.release_probe()
+            raise
+        except Exception as e:
+            if _is_dependency_failure(e):
+                self.breaker.record_failure(e)
+            else:
+                self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _call_with_auth_retry(self, func, *args, **kwargs):
+        """スケジューラー経由でAPIを呼び出し、認証エラーの場合は認証情報を更新して1回だけ再試行"""
+        scheduler = get_request_scheduler()
+        self.api_call_count += 1
+        increment_counter(API_CALLS_METRIC)
+        try:
+            self._apply_call_timeout()
+            return scheduler.execute(func, *args, **kwargs)
+        except Exception as e:
+            if _is_worksheet_error(e):
+                # シートの削除や権限変更の可能性があるため、次回はメタデータから取り直す
+                self.invalidate_worksheet_cache()
+            if not _is_auth_error(e):
+                raise
+            logger.warning("⚠️ 認証エラーを検出、認証情報を更新して再試行: %s", e)
+            try:
+                from google.auth.transport.requests import Request
+
+                # ワークシートは同じ認証情報オブジェクトを共有しているため、その場で更新すれば再試行できる
+                self.credentials.refresh(Request())
+            except Exception as refresh_error:
+                logger.error("❌ 認証情報の更新失敗、クライアントを再構築: %s", refresh_error)
+                self._initialize()
+                raise e
+            self.api_call_count += 1
+            increment_counter(API_CALLS_METRIC)
+            self._apply_call_timeout()
+            return scheduler.execute(func, *args, **kwargs)
+
+    def _apply_call_timeout(self):
+        """リクエストの残り時間をAPI呼び出し1回のタイムアウトとして設定"""
+        if self.gc is None:
+            return
+        deadline = get_current_deadline()
+        self.gc.set_timeout(deadline.call_timeout() if deadline is not None else None)
+
+    def invalidate_worksheet_cache(self):
+        """ワークシートハンドルのキャッシュを破棄"""
+        if self._worksheets:
+            logger.info("🧹 ワークシートキャッシュを破棄しました")
+        self._worksheets = {}
+        self._settings_index = None
+        self._records_reader.reset()
+        self._request_ids = None
+        self._overdue_cache = None
+
     def get_or_create_cleaning_sheet(self):
         """掃除記録シートを取得または作成"""
-        try:
-            return self.spreadsheet.worksheet(CleaningRecordsSheet.SHEET_NAME)
-        except Exception:  # gspread.WorksheetNotFoundを含む全ての例外をキャッチ
-            logger.info("掃除記録シートを新規作成中...")
-            sheet = self.spreadsheet.add_worksheet(title=CleaningRecordsSheet.SHEET_NAME, rows=1000, cols=10)
-            sheet.update("A1:D1", [SheetConstants.CLEANING_RECORDS_HEADERS])
-            logger.info("✅ 掃除記録シート作成完了")
+        sheet = self._worksheets.get(CleaningRecordsSheet.SHEET_NAME)
+        if sheet is not None:
             return sheet
 
+        with measure_phase("WorksheetLookup"):
+            try:
+                sheet = self._call(self.spreadsheet.worksheet, CleaningRecordsSheet.SHEET_NAME)
+            except Exception:  # gspread.WorksheetNotFoundを含む全ての例外をキャッチ
+                logger.info("掃除記録シートを新規作成中...")
+                sheet = self._call(
+                    self.spreadsheet.add_worksheet, title=CleaningRecordsSheet.SHEET_NAME, rows=1000, cols=10
+                )
+                self._call(sheet.update, "A1:E1", [SheetConstants.CLEANING_RECORDS_HEADERS])
+                logger.info("✅ 掃除記録シート作成完了")
+
+        self._worksheets[CleaningRecordsSheet.SHEET_NAME] = sheet
+        return sheet
+
     def get_or_create_settings_sheet(self):
         """掃除種別設定シートを取得または作成"""
+        sheet = self._worksheets.get(CleaningSettingsSheet.SHEET_NAME)
+        if sheet is not None:
+            return sheet
+
+        from gspread.exceptions import WorksheetNotFound
+
+        with measure_phase("WorksheetLookup"):
+            try:
+                sheet = self._call(self.spreadsheet.worksheet, CleaningSettingsSheet.SHEET_NAME)
+            except WorksheetNotFound:
+                # 作成するのはシートが存在しないと分かった場合のみ（503やタイムアウト等は呼び出し元に送出し、
+                # 既存のシートを作成し直して設定を上書きしないようにする）
+                sheet = self._provision_settings_sheet()
+
+        self._worksheets[CleaningSettingsSheet.SHEET_NAME] = sheet
+        return sheet
+
+    def _provision_settings_sheet(self):
+        """
+        掃除種別設定シートを作成し、ヘッダーとデフォルト設定を書き込む
+
+        シートの追加と全行の書き込みを1回のbatch_updateリクエストで行います。
+        一括リクエストはシートの追加も含めて全体が失敗するため、失敗した場合はシートの有無を確認し直します。
+        同名のシートが既に存在する場合（別の呼び出しが作成した等）は、内容を上書きせずにそのシートを返します。
+        存在しない場合のみシートを追加して従来どおり1行ずつ書き込み、失敗した行番号を
+        last_provision_failed_rows に記録します。
+
+        Returns:
+            Worksheet: 作成した掃除種別設定シート
+        """
+        from gspread import Worksheet
+        from gspread.exceptions import WorksheetNotFound
+
+        logger.info("掃除種別設定シートを新規作成中...")
+        default_settings = [[_cell_text(value) for value in row] for row in SheetConstants.DEFAULT_CLEANING_SETTINGS]
+        num_rows = len(default_settings)
+        self.last_provision_failed_rows = []
+        logger.info("📊 デフォルト設定を一括書き込み中: %s行のデータ", num_rows)
+
+        # 同じリクエスト内で書き込み先を指定できるよう、シートIDをこちらで採番する
+        sheet_id = random.randint(1, 2**31 - 1)
+        body = {
+            "requests": [
+                {
+                    "addSheet": {
+                        "properties": {
+                            "sheetId": sheet_id,
+                            "title": CleaningSettingsSheet.SHEET_NAME.value,
+                            "sheetType": "GRID",
+                            "gridProperties": {"rowCount": max(100, num_rows), "columnCount": 10},
+                        }
+                    }
+                },
+                {
+                    "updateCells": {
+                        "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+                        "rows": [
+                            {"values": [{"userEnteredValue": {"stringValue": value}} for value in row]}
+                            for row in default_settings
+                        ],
+                        "fields": "userEnteredValue",
+                    }
+                },
+            ]
+        }
+
         try:
-            return self.spreadsheet.worksheet(CleaningSettingsSheet.SHEET_NAME)
-        except Exception:  # gspread.WorksheetNotFoundを含む全ての例外をキャッチ
-            logger.info("掃除種別設定シートを新規作成中...")
-            sheet = self.spreadsheet.add_worksheet(title=CleaningSettingsSheet.SHEET_NAME, rows=100, cols=10)
-
-            # デフォルト設定を追加（より安全な書き込み方法）
-            default_settings = SheetConstants.DEFAULT_CLEANING_SETTINGS
-            num_rows = len(default_settings)
-            logger.info(f"📊 デフォルト設定を書き込み中: {num_rows}行のデータ")
-
-            # 行ごとに書き込み（より確実）
-            for i, row_data in enumerate(default_settings, 1):
-                try:
-                    range_spec = f"A{i}:E{i}"
-                    sheet.update(range_spec, [row_data])
-                    logger.debug(f"✅ 行{i}書き込み完了: {row_data[0]}")
-                except Exception as row_error:
-                    logger.error(f"❌ 行{i}書き込みエラー: {row_error}")
-                    # 個別の行エラーは継続
-                    continue
-            logger.info("✅ 掃除種別設定シート作成完了")
+            response = self._call(self.spreadsheet.batch_update, body)
+            properties = response["replies"][0]["addSheet"]["properties"]
+            sheet = Worksheet(self.spreadsheet, properties, self.spreadsheet.id, self.spreadsheet.client)
+            self._set_settings_index(default_settings)
+            logger.info("✅ 掃除種別設定シート作成完了（一括書き込み）")
             return sheet
 
-    def add_cleaning_record(self, cleaning_type: str, note: str = "") -> bool:
+        except Exception as bulk_error:
+            logger.warning("⚠️ 一括書き込み失敗、シートの有無を確認します: %s", bulk_error)
+
+        # フォールバック：既存のシートには書き込まず、この呼び出しで作成したシートにだけ1行ずつ書き込む
+        try:
+            sheet = self._call(self.spreadsheet.worksheet, CleaningSettingsSheet.SHEET_NAME)
+            logger.info("ℹ️ 掃除種別設定シートは作成済みのため、既存の内容をそのまま使用します")
+            return sheet
+        except WorksheetNotFound:
+            sheet = self._call(
+                self.spreadsheet.add_worksheet, title=CleaningSettingsSheet.SHEET_NAME, rows=100, cols=10
+            )
+
+        for i, row_data in enumerate(default_settings, 1):
+            try:
+                range_spec = f"A{i}:E{i}"
+                self._call(sheet.update, range_spec, [row_data])
+                logger.debug("✅ 行%s書き込み完了: %s", i, row_data[0])
+            except Exception as row_error:
+                logger.error("❌ 行%s書き込みエラー: %s", i, row_error)
+                # 個別の行エラーは継続
+                self.last_provision_failed_rows.append(i)
+
+        if self.last_provision_failed_rows:
+            logger.error("❌ 書き込みに失敗した行: %s", self.last_provision_failed_rows)
+        else:
+            self._set_settings_index(default_settings)
+        logger.info("✅ 掃除種別設定シート作成完了")
+        return sheet
+
+    def add_cleaning_record(
+        self,
+        cleaning_type: str,
+        note: str = "",
+        timestamp: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> bool:
         """
         掃除記録を追加
 
+        実行したSheets APIの呼び出し回数は last_api_call_count に記録されます。
+        idempotency_key（AlexaのリクエストID）が書き込み済みの場合は、APIを呼び出さずにTrueを返します。
+        キーは掃除記録シートのリクエストID列にも書き込みます。
+
         Args:
             cleaning_type: 掃除の種類
             note: 備考（オプション）
+            timestamp: 実施日時（省略時は現在日時、ジャーナルからの書き出し時に指定）
+            idempotency_key: 再試行による二重書き込みを防ぐためのキー（オプション）
 
         Returns:
-            bool: 成功した場合True
+            bool: 成功した場合（書き込み済みの場合を含む）True
+        """
+        return self.add_cleaning_records([cleaning_type], note=note, timestamp=timestamp, idempotency_key=idempotency_key)
+
+    def add_cleaning_records(
+        self,
+        cleaning_types: List[str],
+        note: str = "",
+        timestamp: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> bool:
         """
+        複数の掃除記録をまとめて追加
+
+        掃除記録シートへの追記は1回のappend_rows、掃除種別設定の最終実施日・次回予定日の更新は
+        1回のbatch_updateで行うため、掃除種別の件数によらずAPIの呼び出し回数は一定です。
+        掃除種別ごとの冪等性キー（record_keys）が書き込み済みの記録は追記しません。
+
+        Args:
+            cleaning_types: 掃除の種類のリスト（重複は除く）
+            note: 備考（オプション）
+            timestamp: 実施日時（省略時は現在日時）
+            idempotency_key: 再試行による二重書き込みを防ぐためのキー（オプション）
+
+        Returns:
+            bool: 成功した場合（全て書き込み済みの場合を含む）True
+        """
+        cleaning_types = list(dict.fromkeys(cleaning_types))
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.add_cleaning_entries(
+            [
+                {"cleaning_type": cleaning_type, "timestamp": timestamp, "note": note, "idempotency_key": key}
+                for cleaning_type, key in zip(cleaning_types, record_keys(idempotency_key, cleaning_types))
+            ]
+        )
+
+    def add_cleaning_entries(self, entries: List[Dict]) -> bool:
+        """
+        実施日時・備考・冪等性キーが記録ごとに異なる掃除記録をまとめて追加
+
+        ジャーナルに保留中の記録の書き出しにも使います。add_cleaning_recordsと同様に、追記は1回のappend_rows、
+        最終実施日・次回予定日の更新は1回のbatch_updateで行います（最終実施日は掃除種別ごとに最も新しい実施日時）。
+        冪等性キーが書き込み済みの記録は追記しません。
+
+        Args:
+            entries: 記録のリスト（cleaning_type, timestamp, note, idempotency_key を持つ辞書）
+
+        Returns:
+            bool: 成功した場合（全て書き込み済みの場合を含む）True
+        """
+        calls_before = self.api_call_count
+        guard = get_idempotency_guard()
+        # 別の実行環境で書き込んだキーは、リクエストID列を1回だけ読み込んで確認する
+        duplicates = guard.find_duplicates([entry["idempotency_key"] for entry in entries], self.get_written_request_ids)
+        records = [entry for entry in entries if entry["idempotency_key"] not in duplicates]
+        if not records:
+            logger.info(
+                "♻️ 書き込み済みのリクエストのためスキップ: %s (%s)",
+                [entry["cleaning_type"] for entry in entries],
+                [entry["idempotency_key"] for entry in entries],
+            )
+            self.last_api_call_count = self.api_call_count - calls_before
+            return True
+
+        # 書き込みが途中で失敗した場合も含め、期限切れ掃除リストを再計算させる
+        self.invalidate_overdue_cache()
         try:
             sheet = self.get_or_create_cleaning_sheet()
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            record_data = [timestamp, cleaning_type, DefaultValue.RECORDER.value, note]
+            rows = []
+            last_dates: Dict[str, str] = {}
+            for entry in records:
+                row = [entry["timestamp"], entry["cleaning_type"], DefaultValue.RECORDER.value, entry["note"]]
+                if entry["idempotency_key"]:
+                    row.append(entry["idempotency_key"])
+                rows.append(row)
+                # 実施日時は%Y-%m-%d %H:%M:%S形式のため、文字列の比較で最新のものを選べる
+                last_dates[entry["cleaning_type"]] = max(last_dates.get(entry["cleaning_type"], ""), entry["timestamp"])
 
-            # より安全な書き込み方法：append_rowを使用
-            try:
-                sheet.append_row(record_data)
-                logger.info(f"✅ 掃除記録追加成功（append_row使用）: {cleaning_type}")
-            except Exception as append_error:
-                logger.warning(f"⚠️ append_row失敗、手動で行を検索: {append_error}")
-                # フォールバック：手動で次の行を見つけて追加
-                all_values = sheet.get_all_values()
-                next_row = len(all_values) + 1
-                range_spec = f"A{next_row}:D{next_row}"
-                sheet.update(range_spec, [record_data])
-                logger.info(f"✅ 掃除記録追加成功（手動範囲指定）: {cleaning_type} at row {next_row}")
+            # クォータ超過（429）はスケジューラーがバックオフして再試行する
+            with measure_phase("RecordAppend"):
+                self._call(sheet.append_rows, rows)
+            logger.info("✅ 掃除記録追加成功（append_rows使用）: %s", [entry["cleaning_type"] for entry in records])
+            guard.mark_written_many(
+                [(entry["idempotency_key"], entry["cleaning_type"], entry["timestamp"], entry["note"]) for entry in records]
+            )
 
             # 掃除種別設定の最終実施日を更新
-            self._update_last_cleaning_date(cleaning_type, timestamp)
+            with measure_phase("SettingsUpdate"):
+                self._update_last_cleaning_dates(last_dates)
 
             return True
 
         except Exception as e:
-            logger.error(f"❌ 掃除記録追加エラー: {e}")
+            logger.error("❌ 掃除記録追加エラー: %s", e)
             return False
 
-    def _update_last_cleaning_date(self, cleaning_type: str, timestamp: str):
+        finally:
+            self.last_api_call_count = self.api_call_count - calls_before
+            logger.info("📊 Sheets API呼び出し回数: %s回", self.last_api_call_count)
+
+    def _update_last_cleaning_dates(self, last_dates: Dict[str, str]):
         """
-        掃除種別設定の最終実施日を更新
+        掃除種別設定の最終実施日と次回予定日を、全ての掃除種別について1回のbatch_updateで更新
 
         Args:
-            cleaning_type: 掃除の種類
-            timestamp: 実施日時
+            last_dates: 掃除の種類ごとの実施日時
         """
         try:
             settings_sheet = self.get_or_create_settings_sheet()
-            records = settings_sheet.get_all_records()
-
-            for i, record in enumerate(records):
-                if record.get(CleaningSettingsSheet.TYPE) == cleaning_type:
-                    row_num = i + 2  # ヘッダー行を考慮
-                    logger.info(f"📍 {cleaning_type}の設定を行{row_num}で更新中")
-
-                    try:
-                        # 最終実施日を更新
-                        last_date_col = SheetConstants.SETTINGS_COLUMN_MAPPING[CleaningSettingsSheet.LAST_DATE]
-                        last_date_range = f"{last_date_col}{row_num}"
-                        settings_sheet.update(last_date_range, [[timestamp]])
-                        logger.debug(f"✅ 最終実施日更新: {last_date_range} = {timestamp}")
-
-                        # 次回予定日を計算
-                        frequency = int(record.get(CleaningSettingsSheet.FREQUENCY, DefaultValue.FREQUENCY.value))
-                        next_date = (
-                            datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S") + timedelta(days=frequency)
-                        ).strftime("%Y-%m-%d")
-                        next_date_col = SheetConstants.SETTINGS_COLUMN_MAPPING[CleaningSettingsSheet.NEXT_DATE]
-                        next_date_range = f"{next_date_col}{row_num}"
-                        settings_sheet.update(next_date_range, [[next_date]])
-                        logger.debug(f"✅ 次回予定日更新: {next_date_range} = {next_date}")
-
-                        logger.info(f"✅ 最終実施日更新完了: {cleaning_type} -> {timestamp} (次回: {next_date})")
-                        break
-
-                    except Exception as update_error:
-                        logger.error(f"❌ 行{row_num}の更新エラー: {update_error}")
-                        continue
+            entries = self._find_settings_rows(settings_sheet, list(last_dates))
+            last_date_col = SheetConstants.SETTINGS_COLUMN_MAPPING[CleaningSettingsSheet.LAST_DATE].value
+            next_date_col = SheetConstants.SETTINGS_COLUMN_MAPPING[CleaningSettingsSheet.NEXT_DATE].value
 
-            else:
-                logger.warning(f"⚠️ 掃除種別'{cleaning_type}'が設定シートに見つかりません")
+            data = []
+            for cleaning_type, timestamp in last_dates.items():
+                entry = entries.get(cleaning_type)
+                if entry is None:
+                    logger.warning("⚠️ 掃除種別'%s'が設定シートに見つかりません", cleaning_type)
+                    continue
+
+                row_num, frequency_value = entry
+                try:
+                    # 次回予定日を計算
+                    next_date = _next_cleaning_date(timestamp, frequency_value)
+                except (TypeError, ValueError) as frequency_error:
+                    logger.error("❌ 行%sの推奨頻度が不正です: %s", row_num, frequency_error)
+                    continue
+                logger.info("📍 %sの設定を行%sで更新: %s (次回: %s)", cleaning_type, row_num, timestamp, next_date)
+                data.append({"range": f"{last_date_col}{row_num}", "values": [[timestamp]]})
+                data.append({"range": f"{next_date_col}{row_num}", "values": [[next_date]]})
+
+            if data:
+                # 最終実施日と次回予定日を1回のbatch_updateで更新
+                self._call(settings_sheet.batch_update, data)
+                logger.info("✅ 最終実施日更新完了: %s種別", len(data) // 2)
 
         except Exception as e:
-            logger.error(f"❌ 最終実施日更新エラー: {e}")
+            # 掃除記録は書き込み済みのため、設定シートとのずれは repair_settings.py で掃除記録から再計算できる
+            logger.error("❌ 最終実施日更新エラー: %s", e)
             import traceback
 
-            logger.error(f"❌ 詳細エラー: {traceback.format_exc()}")
+            logger.error("❌ 詳細エラー: %s", traceback.format_exc())
+
+    def append_cleaning_rows(self, rows: List[List[str]]) -> bool:
+        """
+        掃除記録シートに行をそのまま追記（履歴の一括インポート用）
+
+        1回のappend_rowsで追記し、掃除種別設定シートは更新しません（最終実施日はインポートの最後に
+        apply_last_cleaning_datesでまとめて更新します）。
+
+        Args:
+            rows: 掃除記録シートの列順（日時, 掃除種別, 記録者, 備考, リクエストID）の行のリスト
+
+        Returns:
+            bool: 成功した場合True
+        """
+        if not rows:
+            return True
+        self.invalidate_overdue_cache()
+        try:
+            sheet = self.get_or_create_cleaning_sheet()
+            with measure_phase("RecordAppend"):
+                self._call(sheet.append_rows, rows)
+            logger.info("✅ 掃除記録一括追記成功: %s件", len(rows))
+            return True
+        except Exception as e:
+            logger.error("❌ 掃除記録一括追記エラー: %s", e)
+            return False
+
+    def get_written_request_ids(self) -> set:
+        """
+        掃除記録シートのリクエストID列に書き込まれているIDを取得（1回のAPI呼び出し）
+
+        実行環境内の初回はリクエストID列を読み込み、2回目以降は前回の最終行とそれ以降に追記された行だけを
+        1回のbatch_getで読み込みます（別の実行環境が追記したIDも反映されます）。
+        前回の最終行の値が変わっていた場合（行の削除・挿入）は、列全体を読み込み直します。
+
+        Returns:
+            set: リクエストIDの集合（空セルは含まない）
+        """
+        from gspread.utils import rowcol_to_a1
+
+        sheet = self.get_or_create_cleaning_sheet()
+        column = SheetConstants.CLEANING_RECORDS_HEADERS.index(CleaningRecordsSheet.REQUEST_ID) + 1
+        if self._request_ids is None:
+            self._set_request_ids(self._call(sheet.col_values, column))
+            return set(self._request_ids)
+
+        letter = rowcol_to_a1(1, column)[:-1]
+        known = self._request_id_rows
+        ranges = [f"{letter}{known + 1}:{letter}"]
+        if known:
+            ranges.insert(0, f"{letter}{known}")
+        results = self._call(sheet.batch_get, ranges)
+        if known:
+            if str(_column_value(results[0], 0)) != self._request_id_anchor:
+                logger.info("🔄 リクエストID列の既存の行が変更されているため、列全体を読み込み直します")
+                self._set_request_ids(self._call(sheet.col_values, column))
+                return set(self._request_ids)
+
+        tail = _normalize_column([_column_value(results[-1], i) for i in range(len(results[-1]))])
+        # 列が空だった場合は1行目（ヘッダー行）から読み込んでいるため、IDとして扱わない
+        self._request_ids.update(value for value in (tail if known else tail[1:]) if value)
+        if tail:
+            self._request_id_rows = known + len(tail)
+            self._request_id_anchor = tail[-1]
+        return set(self._request_ids)
+
+    def _set_request_ids(self, values: List):
+        """リクエストID列の全体（ヘッダー行を含む）から、差分読み込み用の状態を設定"""
+        column = _normalize_column(values)
+        self._request_ids = {value for value in column[1:] if value}
+        self._request_id_rows = len(column)
+        self._request_id_anchor = column[-1] if column else ""
+
+    def get_latest_cleaning_timestamps(self) -> Dict[str, str]:
+        """
+        掃除記録シートを1回だけ読み込み、掃除種別ごとの最新の実施日時を取得
+
+        日時と掃除種別の列だけを1回のAPI呼び出しで取得し、1回の走査（O(n)）で掃除種別ごとの最大値を求めます。
+        日時として読めない行は無視します。
+
+        Returns:
+            Dict[str, str]: 掃除種別 -> 最新の実施日時（%Y-%m-%d %H:%M:%S）
+        """
+        from gspread.utils import ValueRenderOption
+
+        sheet = self.get_or_create_cleaning_sheet()
+        (rows,) = self._call(sheet.batch_get, ["A2:B"], value_render_option=ValueRenderOption.unformatted)
+
+        latest: Dict[str, datetime] = {}
+        skipped = 0
+        for row in rows:
+            cleaning_type = _cell_text(row[1]).strip() if len(row) > 1 else ""
+            timestamp = _parse_sheet_datetime(row[0]) if row else None
+            if not cleaning_type or timestamp is None:
+                skipped += 1
+                continue
+            if cleaning_type not in latest or timestamp > latest[cleaning_type]:
+                latest[cleaning_type] = timestamp
+
+        if skipped:
+            logger.warning("⚠️ 日時または掃除種別が読めない掃除記録: %s件", skipped)
+        logger.info("✅ 掃除記録を走査: %s件, %s種別", len(rows), len(latest))
+        return {cleaning_type: timestamp.strftime("%Y-%m-%d %H:%M:%S") for cleaning_type, timestamp in latest.items()}
+
+    def apply_last_cleaning_dates(
+        self, latest: Dict[str, str], only_newer: bool = True, dry_run: bool = False
+    ) -> List[Dict]:
+        """
+        掃除種別ごとの最終実施日時から、掃除種別設定の最終実施日と次回予定日をまとめて更新
+
+        設定シートを1回読み込み、値が変わる行だけを1回のbatch_updateで書き込みます。
+
+        Args:
+            latest: 掃除種別 -> 最終実施日時（%Y-%m-%d %H:%M:%S）
+            only_newer: Trueの場合、設定シートの最終実施日より新しい場合だけ更新する
+            dry_run: Trueの場合、差分を返すだけで書き込まない
+
+        Returns:
+            List[Dict]: 変更した（dry_runの場合は変更する）行の差分
+                （type, row, last_date: (変更前, 変更後), next_date: (変更前, 変更後)）
+
+        Raises:
+            Exception: 設定シートの読み込み・書き込みに失敗した場合
+        """
+        settings_sheet = self.get_or_create_settings_sheet()
+        values = self._call(settings_sheet.get_all_values)
+        # 全体を読み込んだため、行番号のインデックスもこの内容で作り直す
+        self._set_settings_index(values)
+
+        header = values[0] if values else []
+        last_date_index = _header_index(header, CleaningSettingsSheet.LAST_DATE)
+        next_date_index = _header_index(header, CleaningSettingsSheet.NEXT_DATE)
+        last_date_col = SheetConstants.SETTINGS_COLUMN_MAPPING[CleaningSettingsSheet.LAST_DATE].value
+        next_date_col = SheetConstants.SETTINGS_COLUMN_MAPPING[CleaningSettingsSheet.NEXT_DATE].value
+
+        changes = []
+        data = []
+        for cleaning_type, timestamp in latest.items():
+            entry = self._settings_index.get(cleaning_type)
+            if entry is None:
+                logger.warning("⚠️ 掃除種別'%s'が設定シートに見つかりません", cleaning_type)
+                continue
+            row_num, frequency_value = entry
+            row = values[row_num - 1]
+            current_last = _cell_text(row[last_date_index]) if last_date_index < len(row) else ""
+            current_next = _cell_text(row[next_date_index]) if next_date_index < len(row) else ""
+
+            current_time = _parse_sheet_datetime(current_last)
+            if only_newer and current_time is not None and current_time >= _parse_sheet_datetime(timestamp):
+                continue
+            try:
+                next_date = _next_cleaning_date(timestamp, frequency_value)
+            except (TypeError, ValueError) as frequency_error:
+                logger.error("❌ 行%sの推奨頻度が不正です: %s", row_num, frequency_error)
+                continue
+            if current_last == timestamp and current_next == next_date:
+                continue
+
+            changes.append(
+                {
+                    "type": cleaning_type,
+                    "row": row_num,
+                    "last_date": (current_last, timestamp),
+                    "next_date": (current_next, next_date),
+                }
+            )
+            data.append({"range": f"{last_date_col}{row_num}", "values": [[timestamp]]})
+            data.append({"range": f"{next_date_col}{row_num}", "values": [[next_date]]})
+
+        if data and not dry_run:
+            self.invalidate_overdue_cache()
+            with measure_phase("SettingsUpdate"):
+                self._call(settings_sheet.batch_update, data)
+            logger.info("✅ 最終実施日一括更新完了: %s種別", len(changes))
+        return changes
+
+    def _find_settings_rows(self, settings_sheet, cleaning_types: List[str]) -> Dict[str, Tuple[int, str]]:
+        """
+        掃除種別設定シート上の行番号と推奨頻度をインデックスから取得
+
+        インデックスは初回に1回だけシート全体から構築し、以降はA列（掃除種別）のみを読み込んで
+        構築時から変化していないことを確認します。変化していた場合はインデックスを再構築します。
+        確認は掃除種別の件数によらず1回だけ行います。
+
+        Args:
+            settings_sheet: 掃除種別設定シート
+            cleaning_types: 掃除の種類のリスト
+
+        Returns:
+            Dict[str, Tuple[int, str]]: 掃除種別 -> (行番号, 推奨頻度)（見つからない掃除種別は含まない）
+        """
+        if self._settings_index is None:
+            self._build_settings_index(settings_sheet)
+        else:
+            column = _normalize_column(self._call(settings_sheet.col_values, 1))
+            if column != self._settings_index_column:
+                logger.info("🔄 掃除種別列が変更されているため、設定インデックスを再構築します")
+                self._build_settings_index(settings_sheet)
+
+        return {
+            cleaning_type: self._settings_index[cleaning_type]
+            for cleaning_type in cleaning_types
+            if cleaning_type in self._settings_index
+        }
+
+    def _build_settings_index(self, settings_sheet):
+        """
+        掃除種別設定シート全体を読み込み、掃除種別 -> (行番号, 推奨頻度) のインデックスを構築
+
+        Args:
+            settings_sheet: 掃除種別設定シート
+        """
+        self._set_settings_index(self._call(settings_sheet.get_all_values))
+
+    def _set_settings_index(self, values: List[List[str]]):
+        """
+        掃除種別設定シートの全セルの値からインデックスを設定
+
+        Args:
+            values: ヘッダー行を含む全行の値
+        """
+        header = values[0] if values else []
+        type_col = header.index(CleaningSettingsSheet.TYPE) if CleaningSettingsSheet.TYPE in header else 0
+        frequency_col = header.index(CleaningSettingsSheet.FREQUENCY) if CleaningSettingsSheet.FREQUENCY in header else 1
+
+        index = {}
+        for row_num, row in enumerate(values[1:], 2):  # ヘッダー行を考慮
+            cleaning_type = row[type_col] if type_col < len(row) else ""
+            if not cleaning_type or cleaning_type in index:
+                # 同じ掃除種別が複数行ある場合は最初の行を使用
+                continue
+            frequency = row[frequency_col] if frequency_col < len(row) else ""
+            index[cleaning_type] = (row_num, frequency if frequency != "" else DefaultValue.FREQUENCY.value)
+
+        self._settings_index = index
+        self._settings_index_column = _normalize_column([row[0] if row else "" for row in values])
+        logger.info("📇 設定インデックス構築完了: %s種別", len(index))
 
     def get_cleaning_records(self) -> List[Dict]:
         """
         掃除記録を取得
 
+        2回目以降は前回読み込んだ行より後の行だけを取得します。
+
         Returns:
             List[Dict]: 掃除記録のリスト
         """
         try:
             sheet = self.get_or_create_cleaning_sheet()
-            records = sheet.get_all_records()
-            logger.info(f"✅ 掃除記録取得成功: {len(records)}件")
+            records = self._records_reader.read(sheet)
+            logger.info("✅ 掃除記録取得成功: %s件", len(records))
             return records
         except Exception as e:
-            logger.error(f"❌ 掃除記録取得エラー: {e}")
+            logger.error("❌ 掃除記録取得エラー: %s", e)
             return []
 
+    def invalidate_overdue_cache(self):
+        """期限切れ掃除リストのキャッシュを破棄"""
+        self._overdue_cache = None
+
     def get_overdue_cleanings(self) -> List[Dict]:
         """
         期限切れの掃除種別を取得
 
+        ウォームコンテナでは計算結果を有効期間（CLEANING_OVERDUE_CACHE_TTL秒）の間キャッシュし、
+        スプレッドシートを読み込まずに返します。日付が変わった場合は再計算します。
+        読み込みに失敗した場合（時間予算切れなど）は、最後に計算できたリストを返し、
+        last_overdue_staleをTrueにします。
+
         Returns:
             List[Dict]: 期限切れの掃除リスト（優先度順）
         """
+        self.last_overdue_stale = False
+        self.last_overdue_error = None
+        cache = self._overdue_cache
+        if cache is not None:
+            computed_at, computed_on, cached_list = cache
+            if time.monotonic() - computed_at < self.overdue_cache_ttl and computed_on == datetime.now().date():
+                logger.info("⚡ 期限切れ掃除取得（キャッシュ）: %s件", len(cached_list))
+                return [dict(item) for item in cached_list]
+
         try:
             settings_sheet = self.get_or_create_settings_sheet()
-            records = settings_sheet.get_all_records()
+            with measure_phase("OverdueRead"):
+                rows = self._read_overdue_columns(settings_sheet)
             overdue_list = []
             today = datetime.now().date()
 
-            for record in records:
-                next_date_str = record.get(CleaningSettingsSheet.NEXT_DATE, "")
-                if next_date_str:
-                    try:
-                        next_date = datetime.strptime(next_date_str, "%Y-%m-%d").date()
-                        if next_date <= today:
-                            overdue_list.append(
-                                {
-                                    "type": record.get(CleaningSettingsSheet.TYPE),
-                                    "priority": record.get(CleaningSettingsSheet.PRIORITY, Priority.MEDIUM),
-                                    "days_overdue": (today - next_date).days,
-                                    "frequency": record.get(
-                                        CleaningSettingsSheet.FREQUENCY, DefaultValue.FREQUENCY.value
-                                    ),
-                                }
-                            )
-                    except ValueError:
-                        # 日付フォーマットが不正な場合はスキップ
-                        continue
+            for cleaning_type, frequency, next_date_value, priority in rows:
+                next_date = _parse_sheet_date(next_date_value)
+                if next_date is not None and next_date <= today:
+                    overdue_list.append(
+                        {
+                            "type": cleaning_type,
+                            "priority": priority,
+                            "days_overdue": (today - next_date).days,
+                            "frequency": frequency,
+                        }
+                    )
 
             # 優先度と遅延日数でソート
             overdue_list.sort(key=lambda x: (SheetConstants.PRIORITY_ORDER.get(x["priority"], 1), -x["days_overdue"]))
 
-            logger.info(f"✅ 期限切れ掃除取得成功: {len(overdue_list)}件")
+            logger.info("✅ 期限切れ掃除取得成功: %s件", len(overdue_list))
+            self._last_overdue = [dict(item) for item in overdue_list]
+            if self.overdue_cache_ttl > 0:
+                self._overdue_cache = (time.monotonic(), today, self._last_overdue)
             return overdue_list
 
         except Exception as e:
-            logger.error(f"❌ 期限切れ掃除取得エラー: {e}")
+            logger.error("❌ 期限切れ掃除取得エラー: %s", e)
+            self.last_overdue_error = e
+            if self._last_overdue is not None:
+                logger.warning("⚠️ 前回取得した期限切れ掃除リストを返します: %s件", len(self._last_overdue))
+                self.last_overdue_stale = True
+                return [dict(item) for item in self._last_overdue]
             return []
 
+    def _read_overdue_columns(self, settings_sheet) -> List[Tuple]:
+        """
+        期限切れ判定に必要な列（掃除種別・推奨頻度・次回予定日・優先度）だけを読み込む
+
+        ヘッダー行と必要な列の範囲を1回のbatch_getで書式なしの値として取得し、
+        (掃除種別, 推奨頻度, 次回予定日, 優先度) のタプルのリストに変換します。
+        ヘッダーが想定と異なる場合は、シート全体を読み込む従来の方法で取得します。
+
+        Args:
+            settings_sheet: 掃除種別設定シート
+
+        Returns:
+            List[Tuple]: (掃除種別, 推奨頻度, 次回予定日, 優先度) のリスト
+        """
+        from gspread.utils import ValueRenderOption
+
+        mapping = SheetConstants.SETTINGS_COLUMN_MAPPING
+        type_col = mapping[CleaningSettingsSheet.TYPE].value
+        frequency_col = mapping[CleaningSettingsSheet.FREQUENCY].value
+        next_date_col = mapping[CleaningSettingsSheet.NEXT_DATE].value
+        priority_col = mapping[CleaningSettingsSheet.PRIORITY].value
+        header_range = f"{type_col}1:{priority_col}1"
+
+        header_values, type_values, frequency_values, next_date_values, priority_values = self._call(
+            settings_sheet.batch_get,
+            [
+                header_range,
+                f"{type_col}2:{type_col}",
+                f"{frequency_col}2:{frequency_col}",
+                f"{next_date_col}2:{next_date_col}",
+                f"{priority_col}2:{priority_col}",
+            ],
+            value_render_option=ValueRenderOption.unformatted,
+        )
+
+        header = [str(value) for value in (header_values[0] if header_values else [])]
+        if header != [_cell_text(value) for value in SheetConstants.CLEANING_SETTINGS_HEADERS]:
+            logger.warning("⚠️ 設定シートのヘッダーが想定と異なるため、全体を読み込みます: %s", header)
+            records = self._call(settings_sheet.get_all_records)
+            return [
+                (
+                    record.get(CleaningSettingsSheet.TYPE),
+                    record.get(CleaningSettingsSheet.FREQUENCY, DefaultValue.FREQUENCY.value),
+                    record.get(CleaningSettingsSheet.NEXT_DATE, ""),
+                    record.get(CleaningSettingsSheet.PRIORITY, Priority.MEDIUM),
+                )
+                for record in records
+            ]
+
+        num_rows = max(len(type_values), len(frequency_values), len(next_date_values), len(priority_values))
+        return [
+            (
+                _column_value(type_values, i),
+                _numericise(_column_value(frequency_values, i)),
+                _column_value(next_date_values, i),
+                _column_value(priority_values, i),
+            )
+            for i in range(num_rows)
+        ]
+
     def get_cleaning_settings(self) -> List[Dict]:
         """
         掃除種別設定を取得
@@ -251,9 +884,198 @@ class GoogleSheetsManager:
         """
         try:
             settings_sheet = self.get_or_create_settings_sheet()
-            records = settings_sheet.get_all_records()
-            logger.info(f"✅ 掃除種別設定取得成功: {len(records)}件")
+            records = self._call(settings_sheet.get_all_records)
+            logger.info("✅ 掃除種別設定取得成功: %s件", len(records))
             return records
         except Exception as e:
-            logger.error(f"❌ 掃除種別設定取得エラー: {e}")
+            logger.error("❌ 掃除種別設定取得エラー: %s", e)
             return []
+
+
+def _is_auth_error(error: Exception) -> bool:
+    """認証エラー（トークン失効など）かどうかを判定"""
+    try:
+        from google.auth.exceptions import RefreshError
+
+        if isinstance(error, RefreshError):
+            return True
+    except ImportError:
+        pass
+    return getattr(error, "code", None) == 401
+
+
+def _is_dependency_failure(error: Exception) -> bool:
+    """
+    Sheets側の障害とみなす例外かどうか（サーキットブレーカーの失敗として数える）
+
+    429/5xxと、ステータスコードを持たない通信エラー・タイムアウトが該当します。
+    リクエストの時間予算切れや、400/404などリクエスト内容に起因するエラーは含みません。
+    ステータスコードを持たないWorksheetNotFound（シート名の検索結果）も、Sheetsが応答しているため含みません。
+    """
+    from gspread.exceptions import WorksheetNotFound
+
+    if isinstance(error, (DeadlineExceeded, CircuitOpenError, ValueError, WorksheetNotFound)):
+        return False
+    code = getattr(error, "code", None)
+    if not isinstance(code, int):
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    if not isinstance(code, int):
+        return True
+    return code == 429 or code >= 500
+
+
+def _cell_text(value) -> str:
+    """セルに書き込む文字列に変換（Enumは値を使用）"""
+    return str(value.value if isinstance(value, Enum) else value)
+
+
+def _column_value(values: List[List], index: int):
+    """batch_getで取得した1列分の値から指定行の値を取得（空セルは空文字）"""
+    if index < len(values) and values[index]:
+        return values[index][0]
+    return ""
+
+
+def _numericise(value):
+    """get_all_recordsと同様に、数値として読める文字列を数値に変換"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip():
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                continue
+    return value
+
+
+def _parse_sheet_date(value) -> Optional[date]:
+    """
+    次回予定日のセルの値を日付に変換
+
+    文字列（%Y-%m-%d）のほか、書式なしで取得した日付セルのシリアル値にも対応します。
+
+    Args:
+        value: セルの値
+
+    Returns:
+        Optional[date]: 日付（空または不正な値の場合None）
+    """
+    if isinstance(value, bool) or value in ("", None):
+        return None
+    if isinstance(value, (int, float)):
+        # スプレッドシートのシリアル値（1899-12-30起点の日数）
+        return (datetime(1899, 12, 30) + timedelta(days=value)).date()
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except ValueError:
+        # 日付フォーマットが不正な場合はスキップ
+        return None
+
+
+def _parse_sheet_datetime(value) -> Optional[datetime]:
+    """
+    最終実施日・掃除記録の日時のセルの値を日時に変換
+
+    文字列（%Y-%m-%d %H:%M:%S または %Y-%m-%d）のほか、日時セルのシリアル値にも対応します。
+
+    Args:
+        value: セルの値
+
+    Returns:
+        Optional[datetime]: 日時（空または不正な値の場合None）
+    """
+    if isinstance(value, bool) or value in ("", None):
+        return None
+    if isinstance(value, (int, float)):
+        # スプレッドシートのシリアル値（1899-12-30起点の日数、秒単位に丸める）
+        return datetime(1899, 12, 30) + timedelta(seconds=round(value * 86400))
+    text = str(value).strip()
+    for date_format in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _next_cleaning_date(timestamp: str, frequency_value) -> str:
+    """
+    最終実施日時と推奨頻度（日）から次回予定日（%Y-%m-%d）を計算
+
+    Raises:
+        ValueError: 推奨頻度または日時が不正な場合
+    """
+    frequency = int(frequency_value)
+    return (datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S") + timedelta(days=frequency)).strftime("%Y-%m-%d")
+
+
+def _header_index(header: List[str], column: Enum) -> int:
+    """ヘッダー行での列の位置（見つからない場合は定義上の位置）"""
+    if column in header:
+        return header.index(column)
+    return SheetConstants.CLEANING_SETTINGS_HEADERS.index(column)
+
+
+def _normalize_column(values: List) -> List[str]:
+    """列の値を比較用に正規化（空セルは空文字、末尾の空セルは除去）"""
+    column = ["" if value is None else str(value) for value in values]
+    while column and column[-1] == "":
+        column.pop()
+    return column
+
+
+def _is_worksheet_error(error: Exception) -> bool:
+    """
+    キャッシュ済みのワークシートが見つからない、またはアクセス権がないエラーかどうかを判定
+
+    シート名の検索で発生するWorksheetNotFoundはキャッシュ未登録のシートでしか起きないため対象外です。
+    """
+    code = getattr(error, "code", None)
+    if code in (403, 404):
+        return True
+    # 削除済みシートの範囲を指定した場合は400（Unable to parse range）が返る
+    return code == 400 and "Unable to parse range" in str(error)
+
+
+# ウォームコンテナ間で共有するマネージャー（初回利用時に生成）
+_shared_manager: Optional[GoogleSheetsManager] = None
+
+
+def get_sheets_manager() -> GoogleSheetsManager:
+    """
+    共有のGoogleSheetsManagerを取得
+
+    Lambdaのウォームコンテナでは前回の呼び出しで作成したインスタンスを再利用するため、
+    認証やスプレッドシートのオープンは初回（コールドスタート）のみ行われます。
+
+    Returns:
+        GoogleSheetsManager: 共有インスタンス
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        # Sheetsの障害中は初期化（認証とスプレッドシートのオープン）も行わずにすぐ失敗させる
+        breaker = get_sheets_circuit_breaker()
+        breaker.before_call()
+        try:
+            _shared_manager = GoogleSheetsManager()
+        except DeadlineExceeded:
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            if _is_dependency_failure(e):
+                breaker.record_failure(e)
+            else:
+                breaker.record_success()
+            raise
+        breaker.record_success()
+        logger.info("🆕 共有GoogleSheetsManagerを作成しました")
+    else:
+        _shared_manager.ensure_fresh_credentials()
+    return _shared_manager
+
+
+def reset_sheets_manager():
+    """共有のGoogleSheetsManagerを破棄（次回取得時に再作成）"""
+    global _shared_manager
+    _shared_manager = None
@@ -0,0 +1,130 @@
+"""
+ヘルスチェック・ウォームアップモジュール
+
+Alexa以外から送られるヘルスチェック（ウォームアップ）イベントを処理し、
+共有クライアント・ワークシートキャッシュ・期限切れ掃除キャッシュを事前に準備して、
+各段階の所要時間を含む準備状況レポートを返します。
+
+対応するイベント:
+- {"healthCheck": true}（手動実行・デプロイ後の確認用）
+- {"source": "aws.events", ...}（EventBridgeの定期実行によるウォームアップ）
+"""
+
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from .storage_backend import BACKEND_SHEETS, get_backend_name, get_storage_backend
+
+logger = logging.getLogger(__name__)
+
+# Google Sheetsバックエンドで必要な環境変数
+REQUIRED_SHEETS_ENV_VARS = ["GOOGLE_SERVICE_ACCOUNT_KEY", "GOOGLE_SPREADSHEET_ID"]
+
+STATUS_READY = "ready"
+STATUS_DEGRADED = "degraded"
+STATUS_FAILED = "failed"
+
+
+def is_health_check_event(event) -> bool:
+    """
+    ヘルスチェック（ウォームアップ）イベントかどうか
+
+    Args:
+        event: Lambdaに渡されたイベント
+
+    Returns:
+        bool: ヘルスチェックイベントの場合True
+    """
+    if not isinstance(event, dict) or "request" in event:
+        return False
+    return bool(event.get("healthCheck")) or event.get("source") == "aws.events"
+
+
+def _run_step(steps: List[Dict], name: str, func: Callable) -> bool:
+    """準備の1段階を実行し、所要時間と結果をstepsに追加"""
+    started = time.perf_counter()
+    try:
+        detail = func()
+        step = {"name": name, "ok": True}
+        if detail is not None:
+            step["detail"] = detail
+    except Exception as e:
+        logger.error("❌ ヘルスチェック失敗: %s: %s", name, e)
+        step = {"name": name, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    step["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    steps.append(step)
+    return step["ok"]
+
+
+def run_health_check(skill_loader: Optional[Callable] = None) -> Dict:
+    """
+    共有クライアントとキャッシュを準備し、準備状況レポートを作成
+
+    Args:
+        skill_loader: スキルハンドラーを作成する関数（指定した場合はask_sdkとハンドラーの読み込みも済ませる）
+
+    Returns:
+        Dict: 準備状況（status, backend, steps（各段階の所要時間）, total_ms など）
+    """
+    started = time.perf_counter()
+    backend_name = get_backend_name()
+    steps: List[Dict] = []
+    logger.info("🩺 ヘルスチェック開始: %s", backend_name)
+
+    def check_env():
+        missing = [var for var in REQUIRED_SHEETS_ENV_VARS if not os.environ.get(var)]
+        if missing:
+            raise ValueError(f"必要な環境変数が設定されていません: {missing}")
+
+    def prime_worksheets():
+        # ワークシートハンドルを取得してキャッシュする（シートがなければ作成）
+        backend = get_storage_backend()
+        backend.get_or_create_cleaning_sheet()
+        backend.get_or_create_settings_sheet()
+
+    def prime_skill():
+        skill_loader()
+
+    def prime_client():
+        get_storage_backend()
+
+    def prime_overdue():
+        backend = get_storage_backend()
+        overdue_cleanings = backend.get_overdue_cleanings()
+        error = getattr(backend, "last_overdue_error", None)
+        if error is not None and not getattr(backend, "last_overdue_stale", False):
+            raise error
+        return {"overdue_count": len(overdue_cleanings)}
+
+    ready = True
+    if skill_loader is not None:
+        ready = _run_step(steps, "skill_handler", prime_skill)
+    if ready and backend_name == BACKEND_SHEETS:
+        ready = _run_step(steps, "environment", check_env)
+    if ready:
+        ready = _run_step(steps, "client", prime_client)
+    if ready and backend_name == BACKEND_SHEETS:
+        ready = _run_step(steps, "worksheets", prime_worksheets)
+    if ready:
+        ready = _run_step(steps, "overdue_cache", prime_overdue)
+
+    backend = get_storage_backend() if ready else None
+    degraded = bool(backend is not None and getattr(backend, "last_overdue_stale", False))
+    report = {
+        "status": STATUS_FAILED if not ready else (STATUS_DEGRADED if degraded else STATUS_READY),
+        "backend": backend_name,
+        "steps": steps,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    if backend is not None:
+        report["api_call_count"] = getattr(backend, "api_call_count", None)
+    if backend_name == BACKEND_SHEETS:
+        from .circuit_breaker import get_sheets_circuit_breaker
+
+        breaker = get_sheets_circuit_breaker()
+        report["circuit_breaker"] = {"state": breaker.state, **breaker.stats}
+
+    logger.info("🩺 ヘルスチェック完了: %s (%sms)", report["status"], report["total_ms"])
+    return report
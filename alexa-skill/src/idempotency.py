@@ -0,0 +1,171 @@
+"""
+冪等性キー管理モジュール
+
+AlexaやLambdaの再試行で同じRecordCleaningIntentが二重に届いた場合に、掃除記録を二重に書き込まないよう、
+書き込み済みの冪等性キー（AlexaのリクエストID）を記録します。
+
+- ウォームコンテナ: 件数上限付きのLRU（OrderedDict）で確認（API呼び出しなし）
+- 同じ実行環境の再起動後: /tmp のジャーナルに残した書き込み済みの記録で確認（API呼び出しなし）
+- 別の実行環境で書き込んだキー: 掃除記録シートのリクエストID列で確認
+  （/tmp は実行環境ごとのため、別のコンテナで書き込んだキーはジャーナルにない）。
+  列の読み込みは書き込み1回につき最大1回で、2回目以降は前回より後に追記された行だけを読み込む
+  （GoogleSheetsManager.get_written_request_ids）
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from typing import Callable, List, Optional, Set, Tuple
+
+from .record_journal import get_record_journal
+
+logger = logging.getLogger(__name__)
+
+# ウォームコンテナで覚えておく冪等性キーの件数を指定する環境変数
+IDEMPOTENCY_CACHE_SIZE_ENV = "CLEANING_IDEMPOTENCY_CACHE_SIZE"
+DEFAULT_IDEMPOTENCY_CACHE_SIZE = 256
+
+
+class IdempotencyGuard:
+    """書き込み済みの冪等性キーを確認・記録するクラス"""
+
+    def __init__(self, max_keys: int = DEFAULT_IDEMPOTENCY_CACHE_SIZE, journal_factory=get_record_journal):
+        """
+        初期化
+
+        Args:
+            max_keys: LRUで覚えておくキーの件数
+            journal_factory: 書き込み済みの記録を残すRecordJournalを返す関数
+        """
+        self.max_keys = max(max_keys, 1)
+        self._journal_factory = journal_factory
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+
+    def is_duplicate(self, key: Optional[str], stored_keys_loader: Optional[Callable[[], Set[str]]] = None) -> bool:
+        """
+        書き込み済みのキーかどうか
+
+        Args:
+            key: 冪等性キー（Noneの場合は常にFalse）
+            stored_keys_loader: 保存先に書き込まれているキーの集合を返す関数（オプション）
+
+        Returns:
+            bool: 書き込み済みの場合True
+        """
+        return bool(key) and key in self.find_duplicates([key], stored_keys_loader)
+
+    def find_duplicates(
+        self, keys: List[Optional[str]], stored_keys_loader: Optional[Callable[[], Set[str]]] = None
+    ) -> Set[str]:
+        """
+        書き込み済みのキーを取得
+
+        LRUとジャーナルのどちらにもないキーがある場合は、stored_keys_loaderで保存先のキー
+        （掃除記録シートのリクエストID列）を1回だけ読み込んで確認します。
+        読み込んだキーは保持せず呼び出しごとに読み込むため、別の実行環境が後から書き込んだキーも見落としません。
+
+        Args:
+            keys: 冪等性キーのリスト（Noneは無視）
+            stored_keys_loader: 保存先に書き込まれているキーの集合を返す関数（オプション）
+
+        Returns:
+            Set[str]: 書き込み済みのキー
+        """
+        keys = [key for key in dict.fromkeys(keys) if key]
+        duplicates = {key for key in keys if key in self._keys}
+        for key in duplicates:
+            self._keys.move_to_end(key)
+
+        unknown = [key for key in keys if key not in duplicates]
+        if unknown:
+            try:
+                duplicates |= self._journal_factory().find_written(unknown)
+            except Exception as e:
+                # ジャーナルが読めない場合は保存先のキーで確認する
+                logger.warning("⚠️ 冪等性キーの確認エラー: %s", e)
+            unknown = [key for key in unknown if key not in duplicates]
+
+        if unknown and stored_keys_loader is not None:
+            try:
+                stored = stored_keys_loader()
+            except Exception as e:
+                # 読み込めない場合は書き込みを優先する
+                logger.warning("⚠️ 保存先の冪等性キーの読み込みエラー: %s", e)
+                stored = set()
+            duplicates.update(key for key in unknown if key in stored)
+
+        for key in duplicates:
+            self._remember(key)
+        return duplicates
+
+    def mark_written(self, key: Optional[str], cleaning_type: str, timestamp: str, note: str = ""):
+        """
+        キーを書き込み済みとして記録
+
+        Args:
+            key: 冪等性キー（Noneの場合は何もしない）
+            cleaning_type: 掃除の種類
+            timestamp: 実施日時
+            note: 備考
+        """
+        self.mark_written_many([(key, cleaning_type, timestamp, note)])
+
+    def mark_written_many(self, records: List[Tuple[Optional[str], str, str, str]]):
+        """
+        複数のキーを書き込み済みとして記録（ジャーナルへの保存は1回のトランザクション）
+
+        Args:
+            records: (冪等性キー, 掃除の種類, 実施日時, 備考) のリスト（キーがNoneの記録は無視）
+        """
+        records = [record for record in records if record[0]]
+        if not records:
+            return
+        for key, _, _, _ in records:
+            self._remember(key)
+        try:
+            self._journal_factory().mark_written_many(records)
+        except Exception as e:
+            # 保存できないと、実行環境の再起動後の再試行を見分けられない
+            logger.error("❌ 冪等性キーの保存エラー: %s", e)
+
+    def _remember(self, key: str):
+        """LRUにキーを追加（上限を超えた場合は最も古いキーを削除）"""
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+
+
+def record_keys(idempotency_key: Optional[str], cleaning_types: List[str]) -> List[Optional[str]]:
+    """
+    1回の発話で記録する掃除種別ごとの冪等性キーを作成
+
+    掃除種別が1件の場合はキーをそのまま使い、複数の場合は「キー#掃除種別」とします
+    （ジャーナルに保存した記録も同じキーで書き出すため、再試行時に一部だけ書き込み済みでも重複しません）。
+
+    Args:
+        idempotency_key: 発話（リクエスト）単位の冪等性キー
+        cleaning_types: 掃除種別のリスト
+
+    Returns:
+        List[Optional[str]]: 掃除種別ごとのキー（idempotency_keyがNoneの場合はNoneのリスト）
+    """
+    if not idempotency_key:
+        return [None] * len(cleaning_types)
+    if len(cleaning_types) == 1:
+        return [idempotency_key]
+    return [f"{idempotency_key}#{cleaning_type}" for cleaning_type in cleaning_types]
+
+
+# ウォームコンテナで共有するIdempotencyGuard
+_shared_guard: Optional[IdempotencyGuard] = None
+
+
+def get_idempotency_guard() -> IdempotencyGuard:
+    """共有のIdempotencyGuardを取得"""
+    global _shared_guard
+    if _shared_guard is None:
+        _shared_guard = IdempotencyGuard(
+            int(os.environ.get(IDEMPOTENCY_CACHE_SIZE_ENV, DEFAULT_IDEMPOTENCY_CACHE_SIZE))
+        )
+    return _shared_guard
@@ -0,0 +1,118 @@
+"""
+追記専用シートの差分読み込みモジュール
+
+掃除記録シートのように末尾へ追記されるだけのシートについて、前回読み込んだ行数を覚えておき、
+それ以降に追加された行だけを取得するリーダーを提供します。
+
+可視化ダッシュボードにも同じ内容のコピー（visualizer/cleaning_visualizer/incremental_reader.py）があります。
+LambdaのZIP（deploy.py）とStreamlit Cloudのダッシュボードは別々にデプロイされ、互いのディレクトリを
+読み込めないため意図的に複製しています。変更する場合は両方を更新してください（test/test_shared_copies.py で差分を検出します）。
+"""
+
+import logging
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _direct_execute(func, *args, **kwargs):
+    """API呼び出しをそのまま実行"""
+    return func(*args, **kwargs)
+
+
+def _trim(row: List) -> List[str]:
+    """比較用に行の末尾の空セルを除去"""
+    values = ["" if value is None else str(value) for value in row]
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+class IncrementalSheetReader:
+    """
+    追記専用シートの差分リーダー
+
+    2回目以降の読み込みでは、ヘッダー行・前回の最終行・それ以降の行を1回のbatch_getで取得します。
+    ヘッダー行または前回の最終行が変化していた場合（行の削除・挿入・編集）は、シート全体を読み込み直します。
+    """
+
+    def __init__(self, execute=None):
+        """
+        リーダーを初期化
+
+        Args:
+            execute: API呼び出しを実行する関数（レート制限付きのスケジューラーなど）
+        """
+        self._execute = execute or _direct_execute
+        self.header: Optional[List[str]] = None
+        self.rows: List[List[str]] = []
+        self.records: List[Dict] = []
+        self.stats = {"full_reloads": 0, "incremental_reads": 0, "rows_fetched": 0}
+
+    def reset(self):
+        """読み込み済みの内容を破棄（次回は全体を読み込む）"""
+        self.header = None
+        self.rows = []
+        self.records = []
+
+    def read(self, sheet) -> List[Dict]:
+        """
+        シートの全レコードを取得（get_all_recordsと同じ形式）
+
+        Args:
+            sheet: 読み込むワークシート
+
+        Returns:
+            List[Dict]: ヘッダーをキーとしたレコードのリスト
+        """
+        if self.header is None:
+            return self._full_reload(sheet)
+
+        from gspread.utils import rowcol_to_a1
+
+        last_col = rowcol_to_a1(1, max(len(self.header), 1))[:-1]
+        known = len(self.rows)
+        ranges = [f"A1:{last_col}1"]
+        if known:
+            ranges.append(f"A{known + 1}:{last_col}{known + 1}")  # 前回の最終行（ヘッダー行を考慮）
+        ranges.append(f"A{known + 2}:{last_col}")
+
+        results = self._execute(sheet.batch_get, ranges)
+        header = results[0][0] if results[0] else []
+        if _trim(header) != _trim(self.header):
+            logger.info("🔄 ヘッダー行が変更されているため、全体を読み込み直します")
+            return self._full_reload(sheet)
+        if known:
+            anchor = results[1][0] if results[1] else []
+            if _trim(anchor) != _trim(self.rows[-1]):
+                logger.info("🔄 既存の行が変更されているため、全体を読み込み直します")
+                return self._full_reload(sheet)
+
+        tail = list(results[-1])
+        self._append_rows(tail)
+        self.stats["incremental_reads"] += 1
+        self.stats["rows_fetched"] += len(tail)
+        logger.info("📥 差分読み込み: 新規%s行（合計%s件）", len(tail), len(self.records))
+        return list(self.records)
+
+    def _full_reload(self, sheet) -> List[Dict]:
+        """シート全体を読み込み直す"""
+        values = self._execute(sheet.get_all_values)
+        self.header = [str(value) for value in values[0]] if values else []
+        self.rows = []
+        self.records = []
+        self._append_rows(values[1:])
+        self.stats["full_reloads"] += 1
+        self.stats["rows_fetched"] += len(values)
+        logger.info("📥 全体読み込み: %s件", len(self.records))
+        return list(self.records)
+
+    def _append_rows(self, rows: List[List]):
+        """読み込んだ行をレコードとして追加"""
+        from gspread.utils import numericise_all
+
+        width = len(self.header)
+        for row in rows:
+            padded = [str(value) for value in row[:width]] + [""] * (width - len(row))
+            self.rows.append(padded)
+            self.records.append(dict(zip(self.header, numericise_all(padded))))
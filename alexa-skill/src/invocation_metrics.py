@@ -0,0 +1,197 @@
+"""
+呼び出しメトリクスモジュール
+
+1回のLambda呼び出しの中で各段階（インポート・認証・ワークシート取得・記録の追記・設定の更新など）の
+所要時間とSheets APIの呼び出し回数を集計し、呼び出しの終了時にCloudWatch Embedded Metric Format（EMF）の
+JSONを1行だけ標準出力へ書き出します。CloudWatch Logsに取り込まれると段階ごとのメトリクスになり、
+p50/p99をグラフにできます。
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# メトリクスの出力を無効にする環境変数（"false"で無効）と、CloudWatchメトリクスの名前空間を指定する環境変数
+METRICS_ENABLED_ENV = "CLEANING_METRICS_ENABLED"
+METRICS_NAMESPACE_ENV = "CLEANING_METRICS_NAMESPACE"
+DEFAULT_METRICS_NAMESPACE = "CleaningManagementSkill"
+
+# 段階名の末尾に付けるメトリクス名の接尾辞
+PHASE_SUFFIX = "Ms"
+API_CALLS_METRIC = "SheetsApiCalls"
+
+
+class InvocationMetrics:
+    """1回の呼び出しの段階別所要時間とカウンター"""
+
+    def __init__(self, cold_start: bool, clock=time.perf_counter):
+        """
+        メトリクスを初期化
+
+        Args:
+            cold_start: コールドスタート（実行環境で最初の呼び出し）かどうか
+            clock: 経過時間の計測に使う関数（テスト用）
+        """
+        self.cold_start = cold_start
+        self._clock = clock
+        self._started = clock()
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {API_CALLS_METRIC: 0}
+        self.dimensions: Dict[str, str] = {"RequestType": "Unknown", "Intent": "None"}
+        self.properties: Dict[str, object] = {}
+
+    def add_phase(self, name: str, duration_ms: float):
+        """段階の所要時間（ミリ秒）を加算（同じ段階を複数回実行した場合は合計）"""
+        self.phases[name] = self.phases.get(name, 0.0) + duration_ms
+
+    def increment(self, name: str, count: int = 1):
+        """カウンターを加算"""
+        self.counters[name] = self.counters.get(name, 0) + count
+
+    def elapsed_ms(self) -> float:
+        """呼び出し開始からの経過時間（ミリ秒）"""
+        return (self._clock() - self._started) * 1000
+
+    def to_emf(self, namespace: str, timestamp_ms: Optional[int] = None) -> Dict:
+        """
+        EMF形式の辞書に変換
+
+        Args:
+            namespace: CloudWatchメトリクスの名前空間
+            timestamp_ms: 記録時刻（エポックミリ秒、省略時は現在時刻）
+
+        Returns:
+            Dict: EMF形式のメトリクスレコード
+        """
+        metrics = [{"Name": f"{name}{PHASE_SUFFIX}", "Unit": "Milliseconds"} for name in self.phases]
+        metrics += [{"Name": name, "Unit": "Count"} for name in self.counters]
+        record = {
+            "_aws": {
+                "Timestamp": timestamp_ms if timestamp_ms is not None else int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": namespace,
+                        # 種別・インテント別と、コールド/ウォーム別の2通りで集計する
+                        "Dimensions": [["RequestType", "Intent"], ["ColdStart"]],
+                        "Metrics": metrics,
+                    }
+                ],
+            },
+            **self.dimensions,
+            "ColdStart": "true" if self.cold_start else "false",
+            **self.properties,
+        }
+        for name, duration_ms in self.phases.items():
+            record[f"{name}{PHASE_SUFFIX}"] = round(duration_ms, 2)
+        record.update(self.counters)
+        return record
+
+
+# 呼び出し中のメトリクス（スレッドごと）
+_local = threading.local()
+
+
+def start_invocation_metrics(cold_start: bool) -> InvocationMetrics:
+    """
+    この呼び出しのメトリクスの集計を開始
+
+    Args:
+        cold_start: コールドスタートかどうか
+
+    Returns:
+        InvocationMetrics: 開始したメトリクス
+    """
+    metrics = InvocationMetrics(cold_start)
+    _local.metrics = metrics
+    return metrics
+
+
+def get_current_metrics() -> Optional[InvocationMetrics]:
+    """呼び出し中のメトリクスを取得（集計していない場合はNone）"""
+    return getattr(_local, "metrics", None)
+
+
+def clear_invocation_metrics():
+    """呼び出し中のメトリクスを破棄"""
+    _local.metrics = None
+
+
+@contextmanager
+def measure_phase(name: str):
+    """
+    with文の中の処理時間を段階の所要時間として記録（集計していない場合は何もしない）
+
+    Args:
+        name: 段階名（メトリクス名は段階名 + "Ms"）
+    """
+    metrics = get_current_metrics()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_phase(name, (time.perf_counter() - started) * 1000)
+
+
+def record_phase(name: str, duration_ms: float):
+    """計測済みの所要時間を段階として記録（集計していない場合は何もしない）"""
+    metrics = get_current_metrics()
+    if metrics is not None:
+        metrics.add_phase(name, duration_ms)
+
+
+def increment_counter(name: str, count: int = 1):
+    """カウンターを加算（集計していない場合は何もしない）"""
+    metrics = get_current_metrics()
+    if metrics is not None:
+        metrics.increment(name, count)
+
+
+def set_dimension(name: str, value):
+    """ディメンション（RequestType・Intent）を設定（集計していない場合は何もしない）"""
+    metrics = get_current_metrics()
+    if metrics is not None and value:
+        metrics.dimensions[name] = str(value)
+
+
+def set_property(name: str, value):
+    """メトリクスにしない補足情報（リクエストIDなど）を設定（集計していない場合は何もしない）"""
+    metrics = get_current_metrics()
+    if metrics is not None:
+        metrics.properties[name] = value
+
+
+def emit_invocation_metrics(total_phase: str = "Total") -> Optional[Dict]:
+    """
+    呼び出し全体の所要時間を記録し、EMF形式のメトリクスを標準出力に1行で書き出す
+
+    ログのフォーマッター（日時やログレベルの接頭辞）を通すとEMFとして認識されないため、標準出力へ直接書き出します。
+
+    Args:
+        total_phase: 呼び出し全体の所要時間として記録する段階名
+
+    Returns:
+        Optional[Dict]: 書き出したレコード（集計していない、または無効の場合はNone）
+    """
+    metrics = get_current_metrics()
+    if metrics is None:
+        return None
+    metrics.add_phase(total_phase, metrics.elapsed_ms())
+    if os.environ.get(METRICS_ENABLED_ENV, "true").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    record = metrics.to_emf(os.environ.get(METRICS_NAMESPACE_ENV, DEFAULT_METRICS_NAMESPACE))
+    try:
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    except Exception as e:
+        logger.warning("⚠️ メトリクス出力エラー: %s", e)
+    return record
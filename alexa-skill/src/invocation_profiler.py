@@ -0,0 +1,170 @@
+"""
+呼び出しプロファイラーモジュール
+
+環境変数またはイベントのフラグで有効にした呼び出しだけ、スキルハンドラーの実行をcProfile
+（指定した場合はtracemallocも）で計測し、累積時間とメモリ割り当ての上位N件をログに出力します。
+生のプロファイルは /tmp に保存するため、ローカルベンチマークなどで集めて詳しく分析できます。
+
+有効にする方法:
+- 環境変数 CLEANING_PROFILE=cpu（cProfileのみ）または cpu,memory（tracemallocも）
+- イベントの "profile" キー（例: {"profile": "cpu,memory", "request": {...}}、trueの場合はcpu）
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# プロファイルの種類（cpu / memory）、ログに出す件数、生のプロファイルの保存先を指定する環境変数
+PROFILE_ENV = "CLEANING_PROFILE"
+PROFILE_TOP_N_ENV = "CLEANING_PROFILE_TOP_N"
+PROFILE_DIR_ENV = "CLEANING_PROFILE_DIR"
+DEFAULT_PROFILE_TOP_N = 15
+DEFAULT_PROFILE_DIR = "/tmp/cleaning_profiles"
+# イベントでプロファイルを有効にするキー
+EVENT_PROFILE_KEY = "profile"
+
+PROFILE_CPU = "cpu"
+PROFILE_MEMORY = "memory"
+# tracemallocで記録するスタックの深さ
+TRACEMALLOC_FRAMES = 5
+
+
+def _parse_modes(value) -> frozenset:
+    """フラグの値（true / "cpu" / "cpu,memory" など）をプロファイルの種類の集合に変換"""
+    if value is True:
+        return frozenset({PROFILE_CPU})
+    if not value or not isinstance(value, str):
+        return frozenset()
+    text = value.strip().lower()
+    if text in ("0", "false", "no", "off"):
+        return frozenset()
+    if text in ("1", "true", "yes", "on"):
+        return frozenset({PROFILE_CPU})
+    modes = {mode.strip() for mode in text.split(",")} & {PROFILE_CPU, PROFILE_MEMORY}
+    # メモリだけを指定した場合も、どの処理で割り当てたかを追えるようにcProfileも実行する
+    return frozenset(modes | {PROFILE_CPU}) if modes else frozenset()
+
+
+def get_profile_modes(event) -> frozenset:
+    """
+    この呼び出しで有効なプロファイルの種類を取得（イベントのフラグを環境変数より優先）
+
+    Args:
+        event: Lambdaに渡されたイベント
+
+    Returns:
+        frozenset: 有効なプロファイルの種類（cpu / memory、無効の場合は空）
+    """
+    if isinstance(event, dict) and EVENT_PROFILE_KEY in event:
+        return _parse_modes(event[EVENT_PROFILE_KEY])
+    return _parse_modes(os.environ.get(PROFILE_ENV))
+
+
+def _top_n() -> int:
+    """ログに出力する件数"""
+    try:
+        return max(int(os.environ.get(PROFILE_TOP_N_ENV, DEFAULT_PROFILE_TOP_N)), 1)
+    except ValueError:
+        return DEFAULT_PROFILE_TOP_N
+
+
+def _short_path(path: str) -> str:
+    """site-packagesなどの長いパスを短縮して表示"""
+    for marker in ("site-packages/", "alexa-skill/", "/var/task/"):
+        if marker in path:
+            return path.split(marker, 1)[1]
+    return path
+
+
+def format_cumulative_summary(stats: pstats.Stats, top_n: int) -> str:
+    """累積時間の上位N件を1行1関数の簡潔な形式で整形"""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+    lines = [f"{'cum(ms)':>9} {'self(ms)':>9} {'calls':>7}  function"]
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in rows:
+        location = f"{_short_path(filename)}:{line}({function})" if line else function
+        lines.append(f"{cumtime * 1000:>9.2f} {tottime * 1000:>9.2f} {ncalls:>7}  {location}")
+    return "\n".join(lines)
+
+
+def format_allocation_summary(snapshot: tracemalloc.Snapshot, top_n: int) -> str:
+    """メモリ割り当ての上位N件（行単位）を整形"""
+    lines = [f"{'size(KiB)':>10} {'count':>7}  location"]
+    for stat in snapshot.statistics("lineno")[:top_n]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:>10.1f} {stat.count:>7}  {_short_path(frame.filename)}:{frame.lineno}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile_invocation(modes: frozenset, label: str):
+    """
+    with文の中の処理をプロファイルし、上位N件をログに出力して生のプロファイルを保存
+
+    Args:
+        modes: プロファイルの種類（空の場合は何もしない）
+        label: 保存するファイル名に使うラベル（リクエストIDなど）
+    """
+    if not modes:
+        yield
+        return
+
+    trace_memory = PROFILE_MEMORY in modes and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = None
+        peak = None
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        try:
+            _report(profiler, snapshot, peak, label)
+        except Exception as e:
+            # プロファイルの出力に失敗しても応答には影響させない
+            logger.warning("⚠️ プロファイル出力エラー: %s", e)
+
+
+def _report(profiler: cProfile.Profile, snapshot, peak, label: str):
+    """プロファイルの上位N件をログに出力し、生のプロファイルを保存"""
+    top_n = _top_n()
+    profile_dir = os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+    os.makedirs(profile_dir, exist_ok=True)
+    # リクエストIDなどをファイル名に使える文字に変換
+    base = os.path.join(profile_dir, f"{int(time.time() * 1000)}_{re.sub(r'[^A-Za-z0-9_.-]', '_', label)}")
+
+    cpu_path = f"{base}.prof"
+    profiler.dump_stats(cpu_path)
+    stats = pstats.Stats(profiler)
+    logger.info(
+        "🔬 プロファイル（累積時間の上位%d件、合計 %.2fms）: %s\n%s",
+        top_n,
+        stats.total_tt * 1000,
+        cpu_path,
+        format_cumulative_summary(stats, top_n),
+    )
+
+    if snapshot is not None:
+        memory_path = f"{base}.tracemalloc"
+        snapshot.dump(memory_path)
+        logger.info(
+            "🔬 メモリ割り当て（上位%d件、ピーク %.1fKiB）: %s\n%s",
+            top_n,
+            peak / 1024,
+            memory_path,
+            format_allocation_summary(snapshot, top_n),
+        )
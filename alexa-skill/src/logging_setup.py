@@ -0,0 +1,153 @@
+"""
+ログ設定モジュール
+
+CloudWatch Logs向けのログ出力を設定します。
+- テキスト形式（デフォルト）またはJSON形式（構造化ログ）
+- キューを使った非同期出力（ログの整形と書き込みを別スレッドで行う）
+  呼び出しの終了時にキューが空になるまで待つため、ログの出力時間そのものは応答時間から消えません。
+  短くなるのはログを出した時点の待ち時間（ハンドラーの処理中にSheets APIの応答待ちと重ねられる分）だけで、
+  終了時の待ち時間はメトリクスの LogFlushMs で確認できます。
+- リクエスト・レスポンス全体のような詳細ログのサンプリング
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# ログ形式（text / json）、ログレベル、キュー出力、詳細ログのサンプリング率を指定する環境変数
+LOG_FORMAT_ENV = "CLEANING_LOG_FORMAT"
+LOG_LEVEL_ENV = "CLEANING_LOG_LEVEL"
+LOG_QUEUE_ENV = "CLEANING_LOG_QUEUE"
+LOG_SAMPLE_RATE_ENV = "CLEANING_LOG_SAMPLE_RATE"
+
+LOG_FORMAT_TEXT = "text"
+LOG_FORMAT_JSON = "json"
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# LogRecordの標準属性（これ以外の属性はextraで渡された項目としてJSONに含める）
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_log_queue: Optional[queue.Queue] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """1行1レコードのJSON形式でログを整形（extraで渡した項目もフィールドとして出力）"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    メッセージの組み立てだけを行ってキューに積むハンドラー
+
+    標準のQueueHandlerは呼び出し側のスレッドでフォーマッターを通すため、
+    JSON整形などはリスナースレッドで行うようにします。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # 引数は後から変更される可能性があるため、メッセージだけはここで組み立てる
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _is_enabled(name: str) -> bool:
+    """環境変数が有効（"1", "true", "yes", "on"）かどうか"""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def configure_logging() -> logging.Logger:
+    """
+    ルートロガーを設定（既存のハンドラーは削除）
+
+    Returns:
+        logging.Logger: 設定したルートロガー
+    """
+    global _listener, _log_queue
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(os.environ.get(LOG_LEVEL_ENV, "INFO").upper())
+
+    # 既存ハンドラーをクリア（Lambdaランタイムが追加したハンドラーを含む）
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    _stop_listener()
+
+    # CloudWatch用のストリームハンドラー
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if os.environ.get(LOG_FORMAT_ENV, LOG_FORMAT_TEXT).strip().lower() == LOG_FORMAT_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    if _is_enabled(LOG_QUEUE_ENV):
+        # 呼び出し側はキューに積むだけにし、整形と標準出力への書き込みはリスナースレッドで行う
+        _log_queue = queue.Queue(-1)
+        root_logger.addHandler(_DeferredQueueHandler(_log_queue))
+        _listener = QueueListener(_log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+    else:
+        _log_queue = None
+        root_logger.addHandler(stream_handler)
+
+    return root_logger
+
+
+def _stop_listener():
+    """プロセス終了時にキューの残りを書き出してリスナーを停止"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def flush_logs():
+    """
+    キューに残っているログを書き出すまで待つ
+
+    Lambdaは応答を返すと実行環境を凍結するため、呼び出しの終了時に実行します。
+    凍結中にログが失われないよう、まだ整形・書き込みされていないログの分だけ応答が遅れます（トレードオフ）。
+    """
+    if _log_queue is not None and _listener is not None:
+        _log_queue.join()
+
+
+def get_sample_rate() -> float:
+    """詳細ログのサンプリング率（0.0〜1.0、デフォルト: 1.0）"""
+    try:
+        return min(max(float(os.environ.get(LOG_SAMPLE_RATE_ENV, "1.0")), 0.0), 1.0)
+    except ValueError:
+        return 1.0
+
+
+def should_log_verbose() -> bool:
+    """今回の呼び出しでリクエスト・レスポンス全体などの詳細ログを出力するかどうか（サンプリング）"""
+    rate = get_sample_rate()
+    return rate >= 1.0 or random.random() < rate
@@ -0,0 +1,356 @@
+"""
+掃除記録ジャーナルモジュール
+
+ライトビハインドモード用に、掃除記録をローカルのSQLiteジャーナルへ先に保存し、
+後からGoogleスプレッドシートへ書き出す機能を提供します。
+"""
+
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from typing import List, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ライトビハインドモードを有効にする環境変数（"1", "true", "yes", "on" で有効）
+WRITE_BEHIND_ENV = "CLEANING_WRITE_BEHIND"
+# ジャーナルファイルのパスを指定する環境変数
+JOURNAL_PATH_ENV = "CLEANING_JOURNAL_PATH"
+DEFAULT_JOURNAL_PATH = "/tmp/cleaning_record_journal.sqlite3"
+
+STATUS_PENDING = "pending"
+STATUS_FLUSHED = "flushed"
+
+# 書き込み済みの記録（冪等性キーの確認用）をジャーナルに残す期間（秒）
+WRITTEN_RETENTION_SECONDS = 24 * 60 * 60
+
+
+def is_write_behind_enabled() -> bool:
+    """ライトビハインドモードが有効かどうか"""
+    return os.environ.get(WRITE_BEHIND_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class RecordJournal:
+    """掃除記録のライトビハインド用ジャーナル（SQLite）"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        ジャーナルを初期化
+
+        Args:
+            path: ジャーナルファイルのパス（省略時は環境変数または /tmp 配下）
+        """
+        self.path = path or os.environ.get(JOURNAL_PATH_ENV, DEFAULT_JOURNAL_PATH)
+        # 未書き出しの記録があるかどうか（None: 未確認）。ジャーナルに書き込むのはこの実行環境だけのため、
+        # 一度確認した後はenqueueとflushで更新し、ウォームコンテナでは保留がなければSQLiteを開かない
+        self._has_pending: Optional[bool] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """ジャーナルに接続（テーブルがなければ作成）"""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+                entry_id TEXT PRIMARY KEY,
+                cleaning_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                note TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                flushed_at REAL
+            )
+            """
+        )
+        return conn
+
+    def exists(self) -> bool:
+        """ジャーナルファイルが存在するかどうか"""
+        return os.path.exists(self.path)
+
+    def has_pending(self) -> bool:
+        """
+        未書き出しの記録があるかどうか
+
+        初回のみジャーナルを確認し、以降は実行環境内で覚えている状態を返します。
+        """
+        if self._has_pending is None:
+            self._has_pending = self.exists() and bool(self.pending())
+        return self._has_pending
+
+    def enqueue(
+        self,
+        cleaning_type: str,
+        timestamp: str,
+        note: str = "",
+        entry_id: Optional[str] = None,
+        attempted: bool = False,
+    ) -> bool:
+        """
+        掃除記録をジャーナルに追加
+
+        同じentry_id（AlexaのリクエストIDなど）の記録が既にある場合は追加しません。
+
+        Args:
+            cleaning_type: 掃除の種類
+            timestamp: 実施日時（%Y-%m-%d %H:%M:%S）
+            note: 備考（オプション）
+            entry_id: 重複排除用のID（省略時は自動採番）
+            attempted: スプレッドシートへの書き込みを試行済みの場合True
+                （書き出し前にスプレッドシートに同じ記録がないかを確認する）
+
+        Returns:
+            bool: 新しく追加された場合True（重複の場合False）
+        """
+        entry_id = entry_id or uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO journal (entry_id, cleaning_type, timestamp, note, attempts, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (entry_id, cleaning_type, timestamp, note, 1 if attempted else 0, time.time()),
+                )
+        finally:
+            conn.close()
+
+        if cursor.rowcount == 0:
+            logger.info("♻️ ジャーナルに登録済みの記録です: %s", entry_id)
+            return False
+
+        self._has_pending = True
+        logger.info("📓 ジャーナルに記録を追加: %s (%s)", cleaning_type, entry_id)
+        return True
+
+    def is_written(self, entry_id: str) -> bool:
+        """
+        指定したID（冪等性キー）の記録が書き込み済みかどうか
+
+        未書き出し（pending）の記録は書き込み済みとみなしません。
+
+        Args:
+            entry_id: 記録のID（AlexaのリクエストIDなど）
+
+        Returns:
+            bool: 書き込み済みの場合True
+        """
+        return entry_id in self.find_written([entry_id])
+
+    def find_written(self, entry_ids: List[str]) -> Set[str]:
+        """
+        指定したID（冪等性キー）のうち書き込み済みのものを1回の接続で取得
+
+        Args:
+            entry_ids: 記録のIDのリスト
+
+        Returns:
+            Set[str]: 書き込み済みのID
+        """
+        if not entry_ids or not self.exists():
+            return set()
+        written = set()
+        conn = self._connect()
+        try:
+            # SQLiteのパラメータ数の上限（999）を超えないよう分割して問い合わせる
+            for start in range(0, len(entry_ids), 500):
+                chunk = entry_ids[start : start + 500]
+                rows = conn.execute(
+                    f"SELECT entry_id FROM journal WHERE status = ? AND entry_id IN ({', '.join('?' * len(chunk))})",
+                    [STATUS_FLUSHED] + list(chunk),
+                ).fetchall()
+                written.update(row["entry_id"] for row in rows)
+        finally:
+            conn.close()
+        return written
+
+    def mark_written(self, entry_id: str, cleaning_type: str, timestamp: str, note: str = ""):
+        """
+        記録を書き込み済みとして残す（未書き出しの記録の場合は書き出し済みにする）
+
+        Args:
+            entry_id: 記録のID（AlexaのリクエストIDなど）
+            cleaning_type: 掃除の種類
+            timestamp: 実施日時
+            note: 備考
+        """
+        self.mark_written_many([(entry_id, cleaning_type, timestamp, note)])
+
+    def mark_written_many(self, records: List[Tuple[str, str, str, str]]):
+        """
+        複数の記録を1回のトランザクションで書き込み済みとして残す
+
+        保存期間を過ぎた書き込み済みの記録は、あわせて削除します。
+
+        Args:
+            records: (記録のID, 掃除の種類, 実施日時, 備考) のリスト
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                # Lambdaランタイムの古いSQLite（3.24未満）はUPSERT（ON CONFLICT DO UPDATE）に対応していないため、
+                # 既存の記録を更新してから、なければ追加する
+                conn.executemany(
+                    "UPDATE journal SET status = ?, flushed_at = ? WHERE entry_id = ?",
+                    [(STATUS_FLUSHED, now, entry_id) for entry_id, _, _, _ in records],
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO journal (entry_id, cleaning_type, timestamp, note, status, created_at, flushed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (entry_id, cleaning_type, timestamp, note, STATUS_FLUSHED, now, now)
+                        for entry_id, cleaning_type, timestamp, note in records
+                    ],
+                )
+                conn.execute(
+                    "DELETE FROM journal WHERE status = ? AND flushed_at < ?",
+                    (STATUS_FLUSHED, now - WRITTEN_RETENTION_SECONDS),
+                )
+        finally:
+            conn.close()
+
+    def pending(self) -> List[Dict]:
+        """
+        未書き出しの記録を取得
+
+        Returns:
+            List[Dict]: 未書き出しの記録（登録順）
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM journal WHERE status = ? ORDER BY created_at", (STATUS_PENDING,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def _mark_attempts(self, entry_ids: List[str]):
+        """書き出しの試行回数を1回のトランザクションで記録"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE journal SET attempts = attempts + 1 WHERE entry_id = ?", [(entry_id,) for entry_id in entry_ids]
+                )
+        finally:
+            conn.close()
+
+    def _mark_flushed(self, entry_ids: List[str]):
+        """記録を1回のトランザクションで書き出し済みにする"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE journal SET status = ?, flushed_at = ? WHERE entry_id = ?",
+                    [(STATUS_FLUSHED, now, entry_id) for entry_id in entry_ids],
+                )
+        finally:
+            conn.close()
+
+    def flush(self, sheets_manager) -> int:
+        """
+        未書き出しの記録をスプレッドシートへ書き出す
+
+        書き出す記録は1回のadd_cleaning_entriesでまとめて書き込むため、件数によらず
+        掃除記録の追記と掃除種別設定の更新はそれぞれ1回のAPI呼び出しです。
+        書き出し済みの記録は二度と書き出しません。前回の書き出しが途中で失敗した記録は、
+        スプレッドシートのリクエストID列に同じIDが既にないかを確認してから書き出します。
+        リクエストID列を読み込めない場合は、書き込み済みかどうかを判断できないため、その記録は保留のまま次回再試行します。
+
+        Args:
+            sheets_manager: 書き出し先のGoogleSheetsManager
+
+        Returns:
+            int: 書き出した件数
+        """
+        entries = self.pending()
+        if not entries:
+            self._has_pending = False
+            return 0
+
+        logger.info("📤 ジャーナルの書き出し開始: %s件", len(entries))
+        existing_ids = None
+        if any(entry["attempts"] > 0 for entry in entries):
+            # 前回の試行でスプレッドシートへの書き込みだけ成功している可能性がある
+            # （書き込みには必ずentry_idをリクエストID列に含めるため、IDだけで確認できる）
+            try:
+                existing_ids = sheets_manager.get_written_request_ids()
+            except Exception as e:
+                # 読み込みの失敗を「未書き込み」とみなすと二重に追記するため、試行済みの記録は保留のままにする
+                logger.error("❌ 書き込み済みの確認に失敗したため、試行済みの記録の書き出しを見送ります（次回再試行）: %s", e)
+
+        to_write = []
+        # 書き出した、または書き込み済みと確認できた記録のID
+        resolved_ids = []
+        for entry in entries:
+            if entry["attempts"] > 0:
+                if existing_ids is None:
+                    continue
+                if entry["entry_id"] in existing_ids:
+                    logger.info("♻️ 書き込み済みのためスキップ: %s (%s)", entry["cleaning_type"], entry["entry_id"])
+                    resolved_ids.append(entry["entry_id"])
+                    continue
+            to_write.append(entry)
+
+        flushed = 0
+        if to_write:
+            write_ids = [entry["entry_id"] for entry in to_write]
+            self._mark_attempts(write_ids)
+            success = sheets_manager.add_cleaning_entries(
+                [
+                    {
+                        "cleaning_type": entry["cleaning_type"],
+                        "timestamp": entry["timestamp"],
+                        "note": entry["note"],
+                        "idempotency_key": entry["entry_id"],
+                    }
+                    for entry in to_write
+                ]
+            )
+            if success:
+                resolved_ids.extend(write_ids)
+                flushed = len(write_ids)
+            else:
+                logger.error("❌ ジャーナルの書き出し失敗（次回再試行）: %s件", len(to_write))
+
+        if resolved_ids:
+            self._mark_flushed(resolved_ids)
+        self._has_pending = len(resolved_ids) < len(entries)
+        logger.info("✅ ジャーナルの書き出し完了: %s/%s件", flushed, len(entries))
+        return flushed
+
+
+# ウォームコンテナで共有するジャーナル
+_shared_journal: Optional[RecordJournal] = None
+
+
+def get_record_journal() -> RecordJournal:
+    """共有のRecordJournalを取得"""
+    global _shared_journal
+    if _shared_journal is None:
+        _shared_journal = RecordJournal()
+    return _shared_journal
+
+
+def flush_pending_records(sheets_manager_factory) -> int:
+    """
+    ジャーナルに未書き出しの記録があればスプレッドシートへ書き出す
+
+    未書き出しの記録がない場合はGoogle Sheetsに接続せずに終了します
+    （ウォームコンテナでは、保留がないことを覚えているためジャーナルも開きません）。
+
+    Args:
+        sheets_manager_factory: GoogleSheetsManagerを返す関数
+
+    Returns:
+        int: 書き出した件数
+    """
+    journal = get_record_journal()
+    if not journal.has_pending():
+        return 0
+    return journal.flush(sheets_manager_factory())
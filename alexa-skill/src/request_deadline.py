@@ -0,0 +1,123 @@
+"""
+リクエスト期限管理モジュール
+
+Lambda実行コンテキストの残り時間（get_remaining_time_in_millis）から1回のリクエストで使える
+時間予算を決め、Sheets API呼び出しのタイムアウトや再試行の待機をその範囲に収めるための機能を提供します。
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 1回のリクエストで使える時間予算の上限（ミリ秒）を指定する環境変数
+# Alexaは約8秒で応答を打ち切るため、Lambdaのタイムアウトが長くてもこの値で制限する
+REQUEST_BUDGET_ENV = "CLEANING_REQUEST_BUDGET_MS"
+DEFAULT_REQUEST_BUDGET_MS = 6000
+# 応答の組み立てと返却のために残しておく時間（ミリ秒）を指定する環境変数
+RESPONSE_MARGIN_ENV = "CLEANING_RESPONSE_MARGIN_MS"
+DEFAULT_RESPONSE_MARGIN_MS = 1000
+
+# Sheets API呼び出し1回のタイムアウトの上限と、呼び出しを始めるのに必要な最低限の残り時間（秒）
+DEFAULT_CALL_TIMEOUT_SECONDS = 10.0
+MIN_CALL_SECONDS = 0.3
+
+
+class DeadlineExceeded(Exception):
+    """リクエストの時間予算を使い切った"""
+
+
+class RequestDeadline:
+    """1回のリクエストの時間予算"""
+
+    def __init__(self, budget_seconds: float, clock=time.monotonic):
+        """
+        時間予算を初期化
+
+        Args:
+            budget_seconds: 使える時間（秒）
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.budget_seconds = max(budget_seconds, 0.0)
+        self._clock = clock
+        self._expires_at = clock() + self.budget_seconds
+
+    @classmethod
+    def from_context(cls, context) -> "RequestDeadline":
+        """
+        Lambda実行コンテキストの残り時間から時間予算を作成
+
+        Args:
+            context: Lambda実行コンテキスト
+
+        Returns:
+            RequestDeadline: 残り時間から応答用の余裕を引き、上限で制限した時間予算
+        """
+        budget_ms = int(os.environ.get(REQUEST_BUDGET_ENV, DEFAULT_REQUEST_BUDGET_MS))
+        margin_ms = int(os.environ.get(RESPONSE_MARGIN_ENV, DEFAULT_RESPONSE_MARGIN_MS))
+        remaining_ms = context.get_remaining_time_in_millis() - margin_ms
+        return cls(min(budget_ms, remaining_ms) / 1000.0)
+
+    def remaining(self) -> float:
+        """残り時間（秒）"""
+        return max(self._expires_at - self._clock(), 0.0)
+
+    def exhausted(self) -> bool:
+        """Sheets APIを呼び出す時間が残っていないかどうか"""
+        return self.remaining() < MIN_CALL_SECONDS
+
+    def check(self, operation: str = ""):
+        """
+        時間が残っているか確認
+
+        Args:
+            operation: ログ用の処理名
+
+        Raises:
+            DeadlineExceeded: 時間予算を使い切っている場合
+        """
+        if self.exhausted():
+            raise DeadlineExceeded(f"時間予算を使い切りました（残り{self.remaining():.2f}秒）: {operation}")
+
+    def call_timeout(self, default: float = DEFAULT_CALL_TIMEOUT_SECONDS) -> float:
+        """API呼び出し1回のタイムアウト（秒、残り時間を超えない）"""
+        return max(min(default, self.remaining()), MIN_CALL_SECONDS)
+
+
+# 処理中のリクエストの時間予算（スレッドごと）
+_local = threading.local()
+
+
+def start_request_deadline(context) -> RequestDeadline:
+    """
+    Lambda実行コンテキストから時間予算を作成し、処理中のリクエストの時間予算として設定
+
+    Args:
+        context: Lambda実行コンテキスト
+
+    Returns:
+        RequestDeadline: 設定した時間予算
+    """
+    deadline = RequestDeadline.from_context(context)
+    _local.deadline = deadline
+    logger.info("⏱️ リクエストの時間予算: %.2f秒", deadline.budget_seconds)
+    return deadline
+
+
+def get_current_deadline() -> Optional[RequestDeadline]:
+    """処理中のリクエストの時間予算を取得（設定されていない場合はNone）"""
+    return getattr(_local, "deadline", None)
+
+
+def clear_request_deadline():
+    """処理中のリクエストの時間予算を解除"""
+    _local.deadline = None
+
+
+def is_deadline_exhausted() -> bool:
+    """処理中のリクエストの時間予算を使い切っているかどうか"""
+    deadline = get_current_deadline()
+    return deadline is not None and deadline.exhausted()
@@ -5,9 +5,6 @@ Google Sheetsで使用するシート名、列名、その他の定数をEnumク
 """
 
 from enum import Enum
-from pathlib import Path
-
-import yaml
 
 
 class CleaningRecordsSheet(str, Enum):
@@ -18,6 +15,7 @@ class CleaningRecordsSheet(str, Enum):
     TYPE = "掃除種別"
     RECORDER = "記録者"
     NOTE = "備考"
+    REQUEST_ID = "リクエストID"
 
 
 class CleaningSettingsSheet(str, Enum):
@@ -61,93 +59,31 @@ class DefaultValue(Enum):
     FREQUENCY = 7
 
 
-def _load_default_cleaning_settings():
-    """YAMLファイルからデフォルト掃除種別設定を読み込む"""
-    try:
-        # Lambda環境とローカル環境の両方に対応したパス解決
-        current_dir = Path(__file__).parent
-
-        # 複数のパスを試行（Lambda環境とローカル環境の違いに対応）
-        possible_paths = [
-            current_dir.parent / "config" / "default_cleaning_settings.yaml",  # ローカル環境
-            current_dir / "config" / "default_cleaning_settings.yaml",  # Lambda環境（srcと同じレベル）
-            Path("config") / "default_cleaning_settings.yaml",  # Lambda環境（ルートレベル）
-            Path("default_cleaning_settings.yaml"),  # Lambda環境（直接ルート）
-        ]
-
-        config_path = None
-        for path in possible_paths:
-            if path.exists():
-                config_path = path
-                break
-
-        if config_path is None:
-            raise FileNotFoundError(f"YAMLファイルが見つかりません。試行したパス: {possible_paths}")
-
-        print(f"YAMLファイルを読み込み中: {config_path}")
-
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-
-        # ヘッダー行を作成
-        settings = [
-            [
-                CleaningSettingsSheet.TYPE,
-                CleaningSettingsSheet.FREQUENCY,
-                CleaningSettingsSheet.LAST_DATE,
-                CleaningSettingsSheet.NEXT_DATE,
-                CleaningSettingsSheet.PRIORITY,
-            ]
-        ]
-
-        # 各掃除種別の設定を追加
-        for cleaning_type in config["cleaning_types"]:
-            settings.append(
-                [
-                    cleaning_type["name"],
-                    str(cleaning_type["frequency"]),
-                    "",  # 最終実施日は空
-                    "",  # 次回予定日は空
-                    cleaning_type["priority"],
-                ]
-            )
-
-        return settings
-
-    except Exception as e:
-        # YAMLファイルの読み込みに失敗した場合のフォールバック
-        print(f"警告: デフォルト設定YAMLファイルの読み込みに失敗しました: {e}")
-        print(f"現在の作業ディレクトリ: {Path.cwd()}")
-        print(f"__file__の場所: {Path(__file__).parent}")
-
-        # ディレクトリ構造をデバッグ出力
-        try:
-            current_dir = Path(__file__).parent
-            print(f"現在のディレクトリ内容: {list(current_dir.iterdir())}")
-            if current_dir.parent.exists():
-                print(f"親ディレクトリの内容: {list(current_dir.parent.iterdir())}")
-            if Path.cwd() != current_dir:
-                print(f"作業ディレクトリの内容: {list(Path.cwd().iterdir())}")
-        except Exception as debug_e:
-            print(f"ディレクトリ構造のデバッグ中にエラー: {debug_e}")
-
-        print("フォールバック設定を使用します")
-
-        return [
-            [
-                CleaningSettingsSheet.TYPE,
-                CleaningSettingsSheet.FREQUENCY,
-                CleaningSettingsSheet.LAST_DATE,
-                CleaningSettingsSheet.NEXT_DATE,
-                CleaningSettingsSheet.PRIORITY,
-            ],
-            ["トイレ掃除", "3", "", "", Priority.HIGH],
-            ["風呂掃除", "7", "", "", Priority.HIGH],
-            ["キッチン掃除", "3", "", "", Priority.HIGH],
-            ["床掃除", "7", "", "", Priority.MEDIUM],
-            ["窓掃除", "14", "", "", Priority.LOW],
-            ["掃除機かけ", "3", "", "", Priority.MEDIUM],
-        ]
+_default_cleaning_settings = None
+
+
+def get_default_cleaning_settings():
+    """
+    デフォルト掃除種別設定を取得（初回のみ読み込み、以降は読み込み結果を再利用）
+
+    設定はデプロイ時にYAMLから変換した成果物（src/default_cleaning_settings.json）から読み込みます。
+
+    Returns:
+        list: ヘッダー行を含む掃除種別設定の行のリスト
+    """
+    global _default_cleaning_settings
+    if _default_cleaning_settings is None:
+        from .default_settings import load_default_cleaning_settings
+
+        _default_cleaning_settings = load_default_cleaning_settings()
+    return _default_cleaning_settings
+
+
+class _DefaultCleaningSettings:
+    """SheetConstants.DEFAULT_CLEANING_SETTINGSへの最初のアクセスまで読み込みを遅らせるディスクリプタ"""
+
+    def __get__(self, instance, owner):
+        return get_default_cleaning_settings()
 
 
 class SheetConstants:
@@ -159,6 +95,7 @@ class SheetConstants:
         CleaningRecordsSheet.TYPE,
         CleaningRecordsSheet.RECORDER,
         CleaningRecordsSheet.NOTE,
+        CleaningRecordsSheet.REQUEST_ID,
     ]
 
     CLEANING_SETTINGS_HEADERS = [
@@ -185,5 +122,5 @@ class SheetConstants:
         Priority.LOW: 2,
     }
 
-    # デフォルトの掃除種別設定（YAMLから動的に読み込み）
-    DEFAULT_CLEANING_SETTINGS = _load_default_cleaning_settings()
+    # デフォルトの掃除種別設定（デプロイ時に生成した成果物から、設定シートの作成時など初回アクセス時に読み込む）
+    DEFAULT_CLEANING_SETTINGS = _DefaultCleaningSettings()
@@ -0,0 +1,545 @@
+"""
+ストレージバックエンドモジュール
+
+掃除記録の保存先を切り替えるためのインターフェースと、Google APIを使わずに
+負荷試験・ベンチマークを行うためのSQLite実装を提供します。
+
+使用するバックエンドは環境変数 CLEANING_STORAGE_BACKEND で選択します。
+- sheets（デフォルト）: GoogleSheetsManager
+- sqlite: SQLiteStorageBackend（疑似的な遅延・クォータエラーを注入可能）
+"""
+
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import List, Dict, Optional
+
+from .sheet_constants import (
+    CleaningRecordsSheet,
+    CleaningSettingsSheet,
+    Priority,
+    DefaultValue,
+    SheetConstants,
+)
+from .idempotency import get_idempotency_guard, record_keys
+from .invocation_metrics import API_CALLS_METRIC, increment_counter, measure_phase
+from .request_deadline import DeadlineExceeded, get_current_deadline
+
+logger = logging.getLogger(__name__)
+
+# バックエンドの選択
+STORAGE_BACKEND_ENV = "CLEANING_STORAGE_BACKEND"
+BACKEND_SHEETS = "sheets"
+BACKEND_SQLITE = "sqlite"
+
+# SQLiteバックエンドの設定
+SQLITE_PATH_ENV = "CLEANING_SQLITE_PATH"
+FAKE_LATENCY_MS_ENV = "CLEANING_FAKE_LATENCY_MS"
+FAKE_QUOTA_ERROR_RATE_ENV = "CLEANING_FAKE_QUOTA_ERROR_RATE"
+FAKE_RECORD_COUNT_ENV = "CLEANING_FAKE_RECORD_COUNT"
+FAKE_SETTINGS_COUNT_ENV = "CLEANING_FAKE_SETTINGS_COUNT"
+
+
+class QuotaExceededError(Exception):
+    """疑似的なクォータ超過エラー（Sheets APIの429に相当）"""
+
+    code = 429
+
+
+class CleaningStorageBackend(ABC):
+    """掃除記録ストレージのインターフェース"""
+
+    @abstractmethod
+    def add_cleaning_record(
+        self,
+        cleaning_type: str,
+        note: str = "",
+        timestamp: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> bool:
+        """掃除記録を追加し、成功した場合（idempotency_keyが書き込み済みの場合を含む）Trueを返す"""
+
+    @abstractmethod
+    def add_cleaning_records(
+        self,
+        cleaning_types: List[str],
+        note: str = "",
+        timestamp: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> bool:
+        """複数の掃除記録を一定回数のAPI呼び出しでまとめて追加し、成功した場合Trueを返す"""
+
+    @abstractmethod
+    def add_cleaning_entries(self, entries: List[Dict]) -> bool:
+        """実施日時・備考・冪等性キーが記録ごとに異なる掃除記録を一定回数のAPI呼び出しでまとめて追加し、成功した場合Trueを返す"""
+
+    @abstractmethod
+    def get_cleaning_records(self) -> List[Dict]:
+        """掃除記録のリストを取得"""
+
+    @abstractmethod
+    def get_written_request_ids(self) -> set:
+        """掃除記録に書き込まれているリクエストID（冪等性キー）の集合を取得（読み込みに失敗した場合は例外）"""
+
+    @abstractmethod
+    def get_overdue_cleanings(self) -> List[Dict]:
+        """期限切れの掃除リスト（優先度順）を取得"""
+
+    @abstractmethod
+    def get_cleaning_settings(self) -> List[Dict]:
+        """掃除種別設定のリストを取得"""
+
+
+class SQLiteStorageBackend(CleaningStorageBackend):
+    """SQLiteを使ったストレージバックエンド（ローカルでの負荷試験・ベンチマーク用）"""
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        latency_ms: float = 0.0,
+        quota_error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        SQLiteバックエンドを初期化
+
+        Args:
+            path: SQLiteファイルのパス（デフォルトはインメモリ）
+            latency_ms: 疑似API呼び出し1回あたりに注入する遅延（ミリ秒）
+            quota_error_rate: 疑似API呼び出しがクォータ超過エラーになる確率（0.0〜1.0）
+            seed: 乱数シード（エラー注入の再現用）
+        """
+        self.path = path
+        self.latency_ms = latency_ms
+        self.quota_error_rate = quota_error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self.api_call_count = 0
+        self.last_api_call_count = 0
+        self._initialize()
+
+    def _initialize(self):
+        """テーブルを作成し、設定が空ならデフォルト設定を投入"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, cleaning_type TEXT, recorder TEXT, note TEXT, "
+                "request_id TEXT NOT NULL DEFAULT '')"
+            )
+            # リクエストID列がない以前のファイルには列を追加
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(records)")]
+            if "request_id" not in columns:
+                self._conn.execute("ALTER TABLE records ADD COLUMN request_id TEXT NOT NULL DEFAULT ''")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS settings ("
+                "row_num INTEGER PRIMARY KEY, cleaning_type TEXT, frequency TEXT, "
+                "last_date TEXT, next_date TEXT, priority TEXT)"
+            )
+            if self._conn.execute("SELECT COUNT(*) FROM settings").fetchone()[0] == 0:
+                rows = [
+                    [value.value if isinstance(value, Enum) else str(value) for value in row]
+                    for row in SheetConstants.DEFAULT_CLEANING_SETTINGS[1:]
+                ]
+                self._conn.executemany(
+                    "INSERT INTO settings (row_num, cleaning_type, frequency, last_date, next_date, priority) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [[row_num] + row for row_num, row in enumerate(rows, 2)],
+                )
+        logger.info("✅ SQLiteバックエンド初期化成功: %s", self.path)
+
+    def _simulate_api_call(self):
+        """疑似的なSheets API呼び出し（遅延とクォータエラーを注入、時間予算を超える遅延はタイムアウト）"""
+        self.api_call_count += 1
+        increment_counter(API_CALLS_METRIC)
+        deadline = get_current_deadline()
+        if deadline is not None:
+            deadline.check("sqlite")
+        if self.latency_ms > 0:
+            latency = self.latency_ms / 1000.0
+            if deadline is not None and latency > deadline.call_timeout():
+                time.sleep(deadline.call_timeout())
+                raise DeadlineExceeded(f"疑似API呼び出しがタイムアウトしました（{self.latency_ms}ms）")
+            time.sleep(latency)
+        if self.quota_error_rate > 0 and self._random.random() < self.quota_error_rate:
+            raise QuotaExceededError("Quota exceeded for quota metric 'Read/Write requests' (simulated)")
+
+    def count_records(self) -> int:
+        """掃除記録の件数を取得（疑似API呼び出しには数えない）"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def seed_cleaning_types(self, count: int):
+        """
+        負荷試験用に掃除種別を追加（掃除種別設定シートのサイズの再現用）
+
+        追加済みの場合（ファイルに保存したSQLiteを再利用する場合など）は何もしません。
+
+        Args:
+            count: 追加する掃除種別の件数
+        """
+        priorities = [priority.value for priority in Priority]
+        with self._lock, self._conn:
+            if count <= 0 or self._conn.execute(
+                "SELECT 1 FROM settings WHERE cleaning_type = ?", ("掃除種別1",)
+            ).fetchone():
+                return
+            last_row = self._conn.execute("SELECT COALESCE(MAX(row_num), 1) FROM settings").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO settings (row_num, cleaning_type, frequency, last_date, next_date, priority) "
+                "VALUES (?, ?, ?, '', '', ?)",
+                [
+                    (last_row + i, f"掃除種別{i}", str(i % 14 + 1), priorities[i % len(priorities)])
+                    for i in range(1, count + 1)
+                ],
+            )
+
+    def seed_records(self, count: int, days: int = 365):
+        """
+        負荷試験用に掃除記録を投入（シートサイズの再現用）
+
+        Args:
+            count: 投入する記録の件数
+            days: 記録を分散させる過去の日数
+        """
+        with self._lock:
+            types = [row[0] for row in self._conn.execute("SELECT cleaning_type FROM settings ORDER BY row_num")]
+        if not types or count <= 0:
+            return
+
+        start = datetime.now() - timedelta(days=days)
+        step = timedelta(days=days) / count
+        rows = [
+            (
+                (start + step * i).strftime("%Y-%m-%d %H:%M:%S"),
+                types[i % len(types)],
+                DefaultValue.RECORDER.value,
+                "",
+            )
+            for i in range(count)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO records (timestamp, cleaning_type, recorder, note) VALUES (?, ?, ?, ?)", rows
+            )
+            # 投入した記録に合わせて最終実施日・次回予定日を設定
+            settings = self._conn.execute(
+                "SELECT s.row_num, s.frequency, MAX(r.timestamp) FROM settings s "
+                "JOIN records r ON r.cleaning_type = s.cleaning_type GROUP BY s.row_num"
+            ).fetchall()
+            for row_num, frequency, last_date in settings:
+                next_date = (
+                    datetime.strptime(last_date, "%Y-%m-%d %H:%M:%S") + timedelta(days=int(frequency))
+                ).strftime("%Y-%m-%d")
+                self._conn.execute(
+                    "UPDATE settings SET last_date = ?, next_date = ? WHERE row_num = ?", (last_date, next_date, row_num)
+                )
+        logger.info("📊 掃除記録を投入しました: %s件", count)
+
+    def add_cleaning_record(
+        self,
+        cleaning_type: str,
+        note: str = "",
+        timestamp: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> bool:
+        """
+        掃除記録を追加（記録の追加と設定の更新でそれぞれ1回の疑似API呼び出し）
+
+        Args:
+            cleaning_type: 掃除の種類
+            note: 備考（オプション）
+            timestamp: 実施日時（省略時は現在日時）
+            idempotency_key: 再試行による二重書き込みを防ぐためのキー（書き込み済みの場合は何もせずTrue）
+
+        Returns:
+            bool: 成功した場合（書き込み済みの場合を含む）True
+        """
+        return self.add_cleaning_records([cleaning_type], note=note, timestamp=timestamp, idempotency_key=idempotency_key)
+
+    def add_cleaning_records(
+        self,
+        cleaning_types: List[str],
+        note: str = "",
+        timestamp: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> bool:
+        """
+        複数の掃除記録をまとめて追加（件数によらず、記録の追加と設定の更新でそれぞれ1回の疑似API呼び出し）
+
+        Args:
+            cleaning_types: 掃除の種類のリスト（重複は除く）
+            note: 備考（オプション）
+            timestamp: 実施日時（省略時は現在日時）
+            idempotency_key: 再試行による二重書き込みを防ぐためのキー（書き込み済みの記録は追加しない）
+
+        Returns:
+            bool: 成功した場合（全て書き込み済みの場合を含む）True
+        """
+        cleaning_types = list(dict.fromkeys(cleaning_types))
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.add_cleaning_entries(
+            [
+                {"cleaning_type": cleaning_type, "timestamp": timestamp, "note": note, "idempotency_key": key}
+                for cleaning_type, key in zip(cleaning_types, record_keys(idempotency_key, cleaning_types))
+            ]
+        )
+
+    def add_cleaning_entries(self, entries: List[Dict]) -> bool:
+        """
+        実施日時・備考・冪等性キーが記録ごとに異なる掃除記録をまとめて追加
+        （件数によらず、記録の追加と設定の更新でそれぞれ1回の疑似API呼び出し）
+
+        Args:
+            entries: 記録のリスト（cleaning_type, timestamp, note, idempotency_key を持つ辞書）
+
+        Returns:
+            bool: 成功した場合（全て書き込み済みの場合を含む）True
+        """
+        guard = get_idempotency_guard()
+        # 別の実行環境で書き込んだキーは、リクエストID列を1回だけ読み込んで確認する
+        duplicates = guard.find_duplicates([entry["idempotency_key"] for entry in entries], self.get_written_request_ids)
+        records = [entry for entry in entries if entry["idempotency_key"] not in duplicates]
+        if not records:
+            logger.info(
+                "♻️ 書き込み済みのリクエストのためスキップ: %s (%s)",
+                [entry["cleaning_type"] for entry in entries],
+                [entry["idempotency_key"] for entry in entries],
+            )
+            self.last_api_call_count = 0
+            return True
+
+        calls_before = self.api_call_count
+        try:
+            last_dates: Dict[str, str] = {}
+            for entry in records:
+                last_dates[entry["cleaning_type"]] = max(last_dates.get(entry["cleaning_type"], ""), entry["timestamp"])
+
+            with measure_phase("RecordAppend"):
+                self._simulate_api_call()
+                with self._lock, self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO records (timestamp, cleaning_type, recorder, note, request_id) VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (
+                                entry["timestamp"],
+                                entry["cleaning_type"],
+                                DefaultValue.RECORDER.value,
+                                entry["note"],
+                                entry["idempotency_key"] or "",
+                            )
+                            for entry in records
+                        ],
+                    )
+            guard.mark_written_many(
+                [(entry["idempotency_key"], entry["cleaning_type"], entry["timestamp"], entry["note"]) for entry in records]
+            )
+
+            try:
+                with measure_phase("SettingsUpdate"):
+                    self._simulate_api_call()
+                    with self._lock, self._conn:
+                        for cleaning_type, timestamp in last_dates.items():
+                            row = self._conn.execute(
+                                "SELECT row_num, frequency FROM settings WHERE cleaning_type = ? ORDER BY row_num LIMIT 1",
+                                (cleaning_type,),
+                            ).fetchone()
+                            if row is None:
+                                logger.warning("⚠️ 掃除種別'%s'が設定にありません", cleaning_type)
+                                continue
+                            next_date = (
+                                datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S") + timedelta(days=int(row[1]))
+                            ).strftime("%Y-%m-%d")
+                            self._conn.execute(
+                                "UPDATE settings SET last_date = ?, next_date = ? WHERE row_num = ?",
+                                (timestamp, next_date, row[0]),
+                            )
+            except Exception as e:
+                # GoogleSheetsManagerと同様、設定の更新エラーは記録の成否に影響させない
+                logger.error("❌ 最終実施日更新エラー: %s", e)
+
+            return True
+
+        except Exception as e:
+            logger.error("❌ 掃除記録追加エラー: %s", e)
+            return False
+
+        finally:
+            self.last_api_call_count = self.api_call_count - calls_before
+
+    def get_cleaning_records(self) -> List[Dict]:
+        """
+        掃除記録を取得
+
+        Returns:
+            List[Dict]: 掃除記録のリスト
+        """
+        try:
+            self._simulate_api_call()
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT timestamp, cleaning_type, recorder, note, request_id FROM records ORDER BY id"
+                ).fetchall()
+            return [
+                {
+                    CleaningRecordsSheet.DATETIME.value: row[0],
+                    CleaningRecordsSheet.TYPE.value: row[1],
+                    CleaningRecordsSheet.RECORDER.value: row[2],
+                    CleaningRecordsSheet.NOTE.value: row[3],
+                    CleaningRecordsSheet.REQUEST_ID.value: row[4],
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error("❌ 掃除記録取得エラー: %s", e)
+            return []
+
+    def get_written_request_ids(self) -> set:
+        """
+        掃除記録のリクエストID列に書き込まれているIDを取得（1回の疑似API呼び出し）
+
+        Returns:
+            set: リクエストIDの集合（空の値は含まない）
+        """
+        self._simulate_api_call()
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT request_id FROM records WHERE request_id != ''").fetchall()
+        return {row[0] for row in rows}
+
+    def get_overdue_cleanings(self) -> List[Dict]:
+        """
+        期限切れの掃除種別を取得
+
+        Returns:
+            List[Dict]: 期限切れの掃除リスト（優先度順）
+        """
+        try:
+            today = datetime.now().date()
+            with measure_phase("OverdueRead"):
+                self._simulate_api_call()
+                with self._lock:
+                    rows = self._conn.execute(
+                        "SELECT cleaning_type, frequency, next_date, priority FROM settings "
+                        "WHERE next_date != '' AND next_date <= ? ORDER BY row_num",
+                        (today.strftime("%Y-%m-%d"),),
+                    ).fetchall()
+
+            overdue_list = []
+            for cleaning_type, frequency, next_date_str, priority in rows:
+                try:
+                    next_date = datetime.strptime(next_date_str, "%Y-%m-%d").date()
+                except ValueError:
+                    continue
+                overdue_list.append(
+                    {
+                        "type": cleaning_type,
+                        "priority": priority or Priority.MEDIUM,
+                        "days_overdue": (today - next_date).days,
+                        "frequency": _numericise(frequency),
+                    }
+                )
+
+            overdue_list.sort(key=lambda x: (SheetConstants.PRIORITY_ORDER.get(x["priority"], 1), -x["days_overdue"]))
+            return overdue_list
+
+        except Exception as e:
+            logger.error("❌ 期限切れ掃除取得エラー: %s", e)
+            return []
+
+    def get_cleaning_settings(self) -> List[Dict]:
+        """
+        掃除種別設定を取得
+
+        Returns:
+            List[Dict]: 掃除種別設定のリスト
+        """
+        try:
+            self._simulate_api_call()
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT cleaning_type, frequency, last_date, next_date, priority FROM settings ORDER BY row_num"
+                ).fetchall()
+            return [
+                {
+                    CleaningSettingsSheet.TYPE.value: row[0],
+                    CleaningSettingsSheet.FREQUENCY.value: _numericise(row[1]),
+                    CleaningSettingsSheet.LAST_DATE.value: row[2],
+                    CleaningSettingsSheet.NEXT_DATE.value: row[3],
+                    CleaningSettingsSheet.PRIORITY.value: row[4],
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error("❌ 掃除種別設定取得エラー: %s", e)
+            return []
+
+
+def _numericise(value):
+    """get_all_recordsと同様に、数値として読める文字列を数値に変換"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def get_backend_name() -> str:
+    """設定されているバックエンド名を取得"""
+    return os.environ.get(STORAGE_BACKEND_ENV, BACKEND_SHEETS).strip().lower() or BACKEND_SHEETS
+
+
+def create_sqlite_backend_from_env() -> SQLiteStorageBackend:
+    """環境変数の設定からSQLiteバックエンドを作成"""
+    backend = SQLiteStorageBackend(
+        path=os.environ.get(SQLITE_PATH_ENV, ":memory:"),
+        latency_ms=float(os.environ.get(FAKE_LATENCY_MS_ENV, "0")),
+        quota_error_rate=float(os.environ.get(FAKE_QUOTA_ERROR_RATE_ENV, "0")),
+    )
+    # 追加の掃除種別にも記録が行き渡るよう、記録より先に投入する
+    backend.seed_cleaning_types(int(os.environ.get(FAKE_SETTINGS_COUNT_ENV, "0")))
+    record_count = int(os.environ.get(FAKE_RECORD_COUNT_ENV, "0"))
+    if record_count > 0 and backend.count_records() == 0:
+        backend.seed_records(record_count)
+    return backend
+
+
+# ウォームコンテナで共有するSQLiteバックエンド
+_shared_sqlite_backend: Optional[SQLiteStorageBackend] = None
+
+
+def get_storage_backend() -> CleaningStorageBackend:
+    """
+    設定に応じた共有ストレージバックエンドを取得
+
+    Returns:
+        CleaningStorageBackend: GoogleSheetsManagerまたはSQLiteStorageBackend
+    """
+    global _shared_sqlite_backend
+    backend_name = get_backend_name()
+
+    if backend_name == BACKEND_SQLITE:
+        if _shared_sqlite_backend is None:
+            _shared_sqlite_backend = create_sqlite_backend_from_env()
+        return _shared_sqlite_backend
+
+    if backend_name != BACKEND_SHEETS:
+        raise ValueError(f"未対応のストレージバックエンドです: {backend_name}")
+
+    from .google_sheets_manager import get_sheets_manager
+
+    return get_sheets_manager()
+
+
+def reset_storage_backend():
+    """共有ストレージバックエンドを破棄（次回取得時に再作成）"""
+    global _shared_sqlite_backend
+    _shared_sqlite_backend = None
+
+    from .google_sheets_manager import reset_sheets_manager
+
+    reset_sheets_manager()
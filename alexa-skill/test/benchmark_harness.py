@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+ローカルベンチマーク
+
+lambda_handler_wrapper を同じプロセス内で直接呼び出し、SQLiteバックエンド（疑似的なSheets API）に対して
+LaunchRequest・RecordCleaningIntent・CheckCleaningStatusIntent のイベントを再生します。
+スループット、p50/p95/p99のレイテンシ、1リクエストあたりのAPI呼び出し回数、コールドスタートとウォームの
+所要時間を表示し、コミット間で比較できるように結果をJSONファイルに保存します。
+
+使用方法:
+    python test/benchmark_harness.py [--requests 200] [--mix launch=1,record=2,check=1]
+                                     [--latency-ms 80] [--record-count 5000] [--settings-count 50]
+                                     [--cold-runs 3] [--output results.json] [--compare baseline.json]
+                                     [--profile cpu|cpu,memory]
+
+オプション:
+    --requests: ウォーム状態で再生するリクエスト数（デフォルト: 200）
+    --mix: リクエスト種別の比率（launch / record / check）
+    --latency-ms: 疑似API呼び出し1回あたりの遅延（ミリ秒、デフォルト: 0）
+    --quota-error-rate: 疑似API呼び出しがクォータ超過エラーになる確率（0.0〜1.0、デフォルト: 0）
+    --record-count: 事前に投入する掃除記録の件数（掃除記録シートのサイズ、デフォルト: 1000）
+    --settings-count: 追加する掃除種別の件数（掃除種別設定シートのサイズ、デフォルト: 0）
+    --cold-runs: コールドスタートを計測する回数（回ごとに新しいプロセスで実行、デフォルト: 3）
+    --seed: イベントの並びを決める乱数シード（デフォルト: 1）
+    --output: 結果を保存するJSONファイル（省略時は benchmark_results/ にコミットIDと日時の名前で保存）
+    --compare: 比較する過去の結果（JSONファイル）
+    --profile: ウォーム計測のイベントにプロファイルのフラグを付け、生のプロファイルを結果と同じ場所に集める
+               （プロファイルの負荷でレイテンシは大きくなるため、比較用の計測とは分けて実行してください）
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import pstats
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PAYLOAD_PATH = Path(__file__).resolve().parent / "test-payload.json"
+RESULTS_DIR = PROJECT_ROOT / "benchmark_results"
+
+REQUEST_KINDS = ("launch", "record", "check")
+# 記録する掃除種別（掃除種別設定シートの作成時と同じデフォルト設定から、初回利用時に読み込む）
+_cleaning_types = None
+
+# コールドスタート計測用の子プロセスで実行するコード（モジュール読み込みと最初の呼び出しを計測）
+COLD_WORKER = """
+import json, sys, time
+started = time.perf_counter()
+import lambda_function
+imported = time.perf_counter()
+sys.path.insert(0, {harness_dir!r})
+import benchmark_harness
+event = benchmark_harness.build_event({kind!r}, 0, random_state=None)
+result = benchmark_harness.invoke(lambda_function, event)
+result["import_ms"] = (imported - started) * 1000
+print("BENCHMARK_RESULT " + json.dumps(result))
+"""
+
+
+class BenchmarkContext:
+    """Lambda実行コンテキストの代わり"""
+
+    function_name = "cleaning-management-alexa-skill-benchmark"
+    memory_limit_in_mb = 128
+
+    def __init__(self, request_id: str, timeout_ms: int = 8000):
+        self.aws_request_id = request_id
+        self._deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(int((self._deadline - time.monotonic()) * 1000), 0)
+
+
+def default_cleaning_types():
+    """デフォルト掃除種別設定（config/default_cleaning_settings.yaml）の掃除種別名"""
+    global _cleaning_types
+    if _cleaning_types is None:
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+        from src.sheet_constants import SheetConstants
+
+        _cleaning_types = [str(row[0]) for row in SheetConstants.DEFAULT_CLEANING_SETTINGS[1:]]
+    return _cleaning_types
+
+
+def build_event(kind: str, index: int, random_state=None, profile: str = None):
+    """
+    test-payload.json を元にAlexaリクエストイベントを作成
+
+    Args:
+        kind: リクエスト種別（launch / record / check）
+        index: 通し番号（リクエストIDとセッションIDに使用）
+        random_state: 掃除種別を選ぶ乱数（Noneの場合は先頭の掃除種別）
+        profile: 指定した場合、イベントのプロファイルのフラグ（cpu / cpu,memory）
+
+    Returns:
+        dict: Alexaリクエストイベント
+    """
+    event = json.loads(PAYLOAD_PATH.read_text(encoding="utf-8"))
+    event["session"]["sessionId"] = f"benchmark-session-{index}"
+    request = {
+        "requestId": f"benchmark-request-{index}-{kind}",
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "locale": "ja-JP",
+    }
+    if kind == "launch":
+        request["type"] = "LaunchRequest"
+    elif kind == "record":
+        cleaning_types = default_cleaning_types()
+        cleaning_type = random_state.choice(cleaning_types) if random_state else cleaning_types[0]
+        request["type"] = "IntentRequest"
+        request["intent"] = {
+            "name": "RecordCleaningIntent",
+            "confirmationStatus": "NONE",
+            "slots": {"CleaningType": {"name": "CleaningType", "value": cleaning_type}},
+        }
+    elif kind == "check":
+        request["type"] = "IntentRequest"
+        request["intent"] = {"name": "CheckCleaningStatusIntent", "confirmationStatus": "NONE", "slots": {}}
+    else:
+        raise ValueError(f"未対応のリクエスト種別です: {kind}")
+    event["request"] = request
+    if profile:
+        event["profile"] = profile
+    return event
+
+
+def invoke(lambda_module, event):
+    """
+    lambda_handler_wrapper を1回呼び出し、所要時間・API呼び出し回数・段階別の所要時間を返す
+
+    呼び出しごとに出力されるEMF形式のメトリクスを標準出力から取り込み、段階別の所要時間とAPI呼び出し回数として使います。
+    """
+    captured = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(captured):
+        response = lambda_module.lambda_handler_wrapper(event, BenchmarkContext(event["request"]["requestId"]))
+    latency_ms = (time.perf_counter() - started) * 1000
+
+    phases = {}
+    api_calls = 0
+    for line in captured.getvalue().splitlines():
+        if '"_aws"' not in line:
+            continue
+        record = json.loads(line)
+        for metric in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]:
+            if metric["Unit"] == "Milliseconds":
+                phases[metric["Name"]] = record[metric["Name"]]
+        api_calls = record.get("SheetsApiCalls", 0)
+
+    speech = response.get("response", {}).get("outputSpeech", {})
+    return {
+        "latency_ms": latency_ms,
+        "api_calls": api_calls,
+        "phases": phases,
+        "error": "システムエラー" in (speech.get("text") or speech.get("ssml") or ""),
+    }
+
+
+def percentile(values, ratio: float) -> float:
+    """最近傍順位法によるパーセンタイル"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(int(round(ratio * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(samples):
+    """サンプルのレイテンシ・API呼び出し回数を集計"""
+    latencies = [sample["latency_ms"] for sample in samples]
+    return {
+        "count": len(samples),
+        "errors": sum(1 for sample in samples if sample["error"]),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(max(latencies), 3) if latencies else 0.0,
+        "api_calls_per_request": round(sum(sample["api_calls"] for sample in samples) / len(samples), 3)
+        if samples
+        else 0.0,
+    }
+
+
+def summarize_phases(samples):
+    """段階別の所要時間（p50/p95）を集計"""
+    by_phase = {}
+    for sample in samples:
+        for name, value in sample["phases"].items():
+            by_phase.setdefault(name, []).append(value)
+    return {
+        name: {"count": len(values), "p50_ms": round(percentile(values, 0.50), 3), "p95_ms": round(percentile(values, 0.95), 3)}
+        for name, values in sorted(by_phase.items())
+    }
+
+
+def parse_mix(text: str):
+    """--mix の指定（launch=1,record=2,check=1）を比率の辞書に変換"""
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in REQUEST_KINDS:
+            raise argparse.ArgumentTypeError(f"未対応のリクエスト種別です: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def configure_environment(args, work_dir: str):
+    """SQLiteバックエンドとベンチマーク用の設定を環境変数に設定（コールドスタート計測の子プロセスにも引き継ぐ）"""
+    os.environ.update(
+        {
+            "CLEANING_STORAGE_BACKEND": "sqlite",
+            "CLEANING_SQLITE_PATH": ":memory:",
+            "CLEANING_FAKE_LATENCY_MS": str(args.latency_ms),
+            "CLEANING_FAKE_QUOTA_ERROR_RATE": str(args.quota_error_rate),
+            "CLEANING_FAKE_RECORD_COUNT": str(args.record_count),
+            "CLEANING_FAKE_SETTINGS_COUNT": str(args.settings_count),
+            "CLEANING_JOURNAL_PATH": str(Path(work_dir) / "journal.sqlite3"),
+            "CLEANING_LOG_LEVEL": "WARNING",
+            "CLEANING_METRICS_ENABLED": "true",
+            "CLEANING_PROFILE_DIR": str(Path(work_dir) / "profiles"),
+        }
+    )
+
+
+def measure_cold_starts(runs: int, kind: str = "launch"):
+    """新しいプロセスでモジュール読み込みと最初の呼び出しを計測"""
+    samples = []
+    code = COLD_WORKER.format(harness_dir=str(Path(__file__).resolve().parent), kind=kind)
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, env=os.environ.copy()
+        )
+        lines = [line for line in result.stdout.splitlines() if line.startswith("BENCHMARK_RESULT ")]
+        if result.returncode != 0 or not lines:
+            raise RuntimeError(f"コールドスタートの計測に失敗しました:\n{result.stderr[-2000:]}")
+        samples.append(json.loads(lines[-1][len("BENCHMARK_RESULT ") :]))
+    return samples
+
+
+def run_warm(args):
+    """同じプロセスで最初の呼び出しを済ませた後、指定した比率でリクエストを再生"""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    import lambda_function
+
+    # 最初の呼び出し（ask_sdkの読み込みとバックエンドの作成）はウォームの計測から除く
+    invoke(lambda_function, build_event("launch", 0))
+
+    random_state = random.Random(args.seed)
+    kinds = list(args.mix)
+    weights = [args.mix[kind] for kind in kinds]
+    samples = {kind: [] for kind in kinds}
+    started = time.perf_counter()
+    for index in range(1, args.requests + 1):
+        kind = random_state.choices(kinds, weights)[0]
+        samples[kind].append(invoke(lambda_function, build_event(kind, index, random_state, args.profile)))
+    elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def collect_profiles(work_dir: str, destination: Path, top_n: int = 20):
+    """
+    ウォーム計測で保存された生のプロファイルを集めて合算し、累積時間の上位N件を表示
+
+    Returns:
+        dict: 集めたファイルの保存先と件数（プロファイルがない場合はNone）
+    """
+    from src.invocation_profiler import format_cumulative_summary
+
+    source = Path(work_dir) / "profiles"
+    files = sorted(source.glob("*.prof")) if source.exists() else []
+    if not files:
+        return None
+    shutil.copytree(source, destination, dirs_exist_ok=True)
+    combined = pstats.Stats(*[str(path) for path in files])
+    print(f"🔬 プロファイル（{len(files)}件を合算、累積時間の上位{top_n}件）")
+    print(format_cumulative_summary(combined, top_n))
+    return {"directory": str(destination), "files": len(files)}
+
+
+def git_commit() -> str:
+    """現在のコミットID（取得できない場合はunknown）"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def print_report(results, baseline=None):
+    """結果を表示（比較対象があればp50/p95の差分も表示）"""
+    print(f"📊 ベンチマーク結果（コミット: {results['commit']}）")
+    print(f"⚡ スループット: {results['warm']['throughput_rps']:.1f} req/s（{results['warm']['overall']['count']}件）")
+    header = f"{'':<10}{'count':>7}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'API/req':>9}"
+    print(header)
+    rows = [("cold", results["cold"]), ("warm", results["warm"]["overall"])]
+    rows += [(kind, summary) for kind, summary in results["warm"]["by_kind"].items()]
+    for name, summary in rows:
+        line = (
+            f"{name:<10}{summary['count']:>7}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}"
+            f"{summary['p99_ms']:>10.2f}{summary['api_calls_per_request']:>9.2f}"
+        )
+        if baseline is not None:
+            previous = baseline["cold"] if name == "cold" else baseline["warm"]["overall"] if name == "warm" else None
+            if previous is None:
+                previous = baseline["warm"]["by_kind"].get(name)
+            if previous:
+                line += f"  (p50 {summary['p50_ms'] - previous['p50_ms']:+.2f}ms, p95 {summary['p95_ms'] - previous['p95_ms']:+.2f}ms)"
+        print(line)
+    if results["cold"]["count"]:
+        print(f"🧊 コールドスタート時のモジュール読み込み: p50 {results['cold']['import_p50_ms']:.2f}ms")
+    print("⏱️ 段階別の所要時間（ウォーム）")
+    for name, summary in results["warm"]["phases"].items():
+        print(f"  {name:<22} p50 {summary['p50_ms']:>8.2f}ms  p95 {summary['p95_ms']:>8.2f}ms  ({summary['count']}件)")
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="音声ベース掃除記録システム - ローカルベンチマーク")
+    parser.add_argument("--requests", type=int, default=200, help="ウォーム状態で再生するリクエスト数")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("launch=1,record=2,check=1"), help="リクエスト種別の比率")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="疑似API呼び出し1回あたりの遅延（ミリ秒）")
+    parser.add_argument("--quota-error-rate", type=float, default=0.0, help="疑似クォータエラーの確率")
+    parser.add_argument("--record-count", type=int, default=1000, help="事前に投入する掃除記録の件数")
+    parser.add_argument("--settings-count", type=int, default=0, help="追加する掃除種別の件数")
+    parser.add_argument("--cold-runs", type=int, default=3, help="コールドスタートを計測する回数")
+    parser.add_argument("--seed", type=int, default=1, help="イベントの並びを決める乱数シード")
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--compare", help="比較する過去の結果（JSONファイル）")
+    parser.add_argument("--profile", choices=["cpu", "cpu,memory"], help="ウォーム計測をプロファイル")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    profile = None
+    with tempfile.TemporaryDirectory() as work_dir:
+        configure_environment(args, work_dir)
+        print(f"🧊 コールドスタート計測中...（{args.cold_runs}回）")
+        cold_samples = measure_cold_starts(args.cold_runs)
+        print(f"🔥 ウォーム計測中...（{args.requests}件）")
+        warm_samples, elapsed = run_warm(args)
+        if args.profile:
+            profile = collect_profiles(work_dir, output.with_name(f"{output.stem}_profiles"))
+
+    all_warm = [sample for samples in warm_samples.values() for sample in samples]
+    cold_summary = summarize(cold_samples)
+    cold_summary["import_p50_ms"] = round(percentile([sample["import_ms"] for sample in cold_samples], 0.50), 3)
+    cold_summary["phases"] = summarize_phases(cold_samples)
+    results = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "parameters": {
+            "requests": args.requests,
+            "mix": args.mix,
+            "latency_ms": args.latency_ms,
+            "quota_error_rate": args.quota_error_rate,
+            "record_count": args.record_count,
+            "settings_count": args.settings_count,
+            "cold_runs": args.cold_runs,
+            "seed": args.seed,
+            "profile": args.profile,
+        },
+        "cold": cold_summary,
+        "warm": {
+            "throughput_rps": round(len(all_warm) / elapsed, 3) if elapsed > 0 else 0.0,
+            "overall": summarize(all_warm),
+            "by_kind": {kind: summarize(samples) for kind, samples in warm_samples.items() if samples},
+            "phases": summarize_phases(all_warm),
+        },
+        "profile": profile,
+    }
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+    print_report(results, baseline)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 結果を保存しました: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+サーキットブレーカーテスト
+
+Google Sheetsの代わりに失敗し続けるスタンドインを使い、
+ブレーカーが開いた後はAPIを呼ばずにすぐ失敗すること、
+クールダウン後に試行呼び出しが1回だけ通ることを確認します。
+
+実行方法:
+    poetry run pytest test/test_circuit_breaker.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.circuit_breaker import (  # noqa: E402
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from src.google_sheets_manager import GoogleSheetsManager  # noqa: E402
+from src.request_deadline import DeadlineExceeded  # noqa: E402
+from src.sheet_constants import CleaningSettingsSheet  # noqa: E402
+
+# スタンドインが1回の呼び出しにかける時間（秒）
+STAND_IN_LATENCY = 0.05
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingWorksheet:
+    """接続エラーで失敗し続けるワークシートのスタンドイン"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _fail(self, *args, **kwargs):
+        self.calls += 1
+        time.sleep(STAND_IN_LATENCY)
+        raise ConnectionError("Sheets API unavailable (stand-in)")
+
+    def batch_get(self, *args, **kwargs):
+        return self._fail()
+
+    def get_all_values(self, *args, **kwargs):
+        return self._fail()
+
+    def get_all_records(self, *args, **kwargs):
+        return self._fail()
+
+
+class StandInSheetsManager(GoogleSheetsManager):
+    """Google APIに接続せず、スタンドインのワークシートを使うGoogleSheetsManager"""
+
+    def __init__(self, worksheet, breaker):
+        self.stand_in = worksheet
+        super().__init__()
+        self.breaker = breaker
+
+    def _initialize(self):
+        self._worksheets = {CleaningSettingsSheet.SHEET_NAME: self.stand_in}
+
+
+def test_opens_after_consecutive_failures():
+    """連続失敗がしきい値に達するとopenになり、呼び出しを遮断する"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=3, cool_down=30, clock=clock)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure(ConnectionError("down"))
+    assert breaker.state == STATE_CLOSED
+
+    breaker.before_call()
+    breaker.record_failure(ConnectionError("down"))
+    assert breaker.state == STATE_OPEN
+    assert breaker.stats["trips"] == 1
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats["short_circuits"] == 1
+
+
+def test_success_resets_failure_count():
+    """成功すると連続失敗回数がリセットされる"""
+    breaker = CircuitBreaker("test", failure_threshold=2, cool_down=30, clock=FakeClock())
+
+    breaker.before_call()
+    breaker.record_failure(ConnectionError("down"))
+    breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    breaker.record_failure(ConnectionError("down"))
+
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_lets_single_probe_through():
+    """クールダウン後は試行呼び出しを1回だけ通し、成功すればclosedに戻る"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, cool_down=30, clock=clock)
+    breaker.before_call()
+    breaker.record_failure(ConnectionError("down"))
+
+    clock.now = 29.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 30.0
+    breaker.before_call()
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.stats["probes"] == 1
+
+    # 試行呼び出しの結果が出るまで、他の呼び出しは遮断する
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    """試行呼び出しが失敗すると再びopenになり、トリップ回数が増える"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, cool_down=30, clock=clock)
+    breaker.before_call()
+    breaker.record_failure(ConnectionError("down"))
+
+    clock.now = 30.0
+    breaker.before_call()
+    breaker.record_failure(ConnectionError("still down"))
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.stats["trips"] == 2
+    clock.now = 59.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_sheets_manager_fails_fast_while_open():
+    """GoogleSheetsManagerはブレーカーが開いている間スタンドインを呼ばず、すぐに失敗する"""
+    worksheet = FailingWorksheet()
+    breaker = CircuitBreaker("Google Sheets", failure_threshold=3, cool_down=30, clock=FakeClock())
+    manager = StandInSheetsManager(worksheet, breaker)
+
+    for _ in range(3):
+        assert manager.get_overdue_cleanings() == []
+    assert breaker.state == STATE_OPEN
+    assert worksheet.calls == 3
+
+    started = time.perf_counter()
+    assert manager.get_overdue_cleanings() == []
+    elapsed = time.perf_counter() - started
+
+    assert worksheet.calls == 3
+    assert isinstance(manager.last_overdue_error, CircuitOpenError)
+    assert elapsed < STAND_IN_LATENCY
+    assert breaker.stats["short_circuits"] == 1
+
+
+def _open_then_half_open(clock, breaker, manager):
+    """ブレーカーを開き、クールダウン後の状態（次の呼び出しが試行呼び出し）にする"""
+    for _ in range(breaker.failure_threshold):
+        manager.get_overdue_cleanings()
+    assert breaker.state == STATE_OPEN
+    clock.now = breaker.cool_down
+
+
+def test_deadline_exceeded_probe_keeps_half_open():
+    """試行呼び出しが時間予算切れで送られなかった場合は、closedにもopenにもせず次の呼び出しを試行呼び出しにする"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("Google Sheets", failure_threshold=1, cool_down=30, clock=clock)
+    manager = StandInSheetsManager(FailingWorksheet(), breaker)
+    _open_then_half_open(clock, breaker, manager)
+
+    def out_of_budget():
+        raise DeadlineExceeded("stand-in")
+
+    with pytest.raises(DeadlineExceeded):
+        manager._call(out_of_budget)
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.stats["trips"] == 1
+
+    # 試行呼び出しの枠は解放されている
+    assert manager._call(lambda: "ok") == "ok"
+    assert breaker.state == STATE_CLOSED
+
+
+def test_worksheet_not_found_is_not_a_dependency_failure():
+    """シート名の検索でWorksheetNotFoundになっても、試行呼び出しは成功として扱い、ブレーカーを開き直さない"""
+    from gspread.exceptions import WorksheetNotFound
+
+    clock = FakeClock()
+    breaker = CircuitBreaker("Google Sheets", failure_threshold=1, cool_down=30, clock=clock)
+    manager = StandInSheetsManager(FailingWorksheet(), breaker)
+    _open_then_half_open(clock, breaker, manager)
+
+    def missing_sheet():
+        raise WorksheetNotFound("掃除記録")
+
+    with pytest.raises(WorksheetNotFound):
+        manager._call(missing_sheet)
+    assert breaker.state == STATE_CLOSED
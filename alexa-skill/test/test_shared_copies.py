@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+複製モジュールの差分テスト
+
+LambdaのZIPとStreamlit Cloudのダッシュボードは別々にデプロイされるため、
+差分読み込みとSheets APIスケジューラーのモジュールは両方に同じ内容を置いています。
+片方だけが変更されて内容がずれていないことを確認します（モジュールのdocstringとコメントは比較しません）。
+
+実行方法:
+    poetry run pytest test/test_shared_copies.py
+"""
+
+import ast
+from pathlib import Path
+
+ALEXA_SRC = Path(__file__).resolve().parent.parent / "src"
+VISUALIZER_SRC = Path(__file__).resolve().parents[2] / "visualizer" / "cleaning_visualizer"
+
+# Alexaスキル側にだけある、リクエストの時間予算による打ち切り
+DEADLINE_ONLY = {
+    "from .request_deadline import DeadlineExceeded, MIN_CALL_SECONDS, get_current_deadline",
+    "TokenBucket.acquire",
+    "SheetsRequestScheduler.execute",
+}
+
+
+def _definitions(path: Path) -> dict:
+    """モジュールのトップレベルの定義（クラスはメソッドごと）を、名前 -> ASTの内容 で取得"""
+    module = ast.parse(path.read_text(encoding="utf-8"))
+    definitions = {}
+    for node in module.body:
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            continue  # モジュールのdocstring
+        if isinstance(node, ast.ClassDef):
+            for item in node.body:
+                name = getattr(item, "name", None) or ast.unparse(item)
+                definitions[f"{node.name}.{name}"] = ast.dump(item)
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            name = node.name
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            name = ", ".join(ast.unparse(target) for target in targets)
+        else:
+            name = ast.unparse(node)
+        definitions[name] = ast.dump(node)
+    return definitions
+
+
+def _differences(module_name: str, allowed=frozenset()) -> list:
+    """両方のコピーで内容が異なる定義の名前"""
+    alexa = _definitions(ALEXA_SRC / module_name)
+    visualizer = _definitions(VISUALIZER_SRC / module_name)
+    names = (set(alexa) | set(visualizer)) - set(allowed)
+    return sorted(name for name in names if alexa.get(name) != visualizer.get(name))
+
+
+def test_incremental_reader_copies_match():
+    """差分読み込みのモジュールは両方で同じ内容"""
+    assert _differences("incremental_reader.py") == []
+
+
+def test_sheets_rate_limiter_copies_match():
+    """Sheets APIスケジューラーは、時間予算による打ち切り以外は両方で同じ内容"""
+    assert _differences("sheets_rate_limiter.py", DEADLINE_ONLY) == []
@@ -14,6 +14,8 @@ from google.oauth2.service_account import Credentials
 import streamlit as st
 
 from .config import AppConfig
+from .incremental_reader import IncrementalSheetReader
+from .sheets_rate_limiter import get_request_scheduler
 
 
 logger = logging.getLogger(__name__)
@@ -26,6 +28,8 @@ class DataManager:
         """データマネージャーを初期化"""
         self.gc = None
         self.spreadsheet = None
+        # 掃除記録シート（追記専用）の差分リーダー
+        self._records_reader = IncrementalSheetReader(get_request_scheduler().execute)
         self._initialize_google_sheets()
 
     def _initialize_google_sheets(self) -> None:
@@ -49,7 +53,7 @@ class DataManager:
             )
 
             self.gc = gspread.authorize(credentials)
-            self.spreadsheet = self.gc.open_by_key(spreadsheet_id)
+            self.spreadsheet = get_request_scheduler().execute(self.gc.open_by_key, spreadsheet_id)
 
             logger.info("Google Sheets初期化完了")
 
@@ -62,8 +66,10 @@ class DataManager:
     def get_cleaning_records(_self) -> pd.DataFrame:
         """掃除記録データを取得"""
         try:
-            sheet = _self.spreadsheet.worksheet(AppConfig.CLEANING_RECORDS_SHEET)
-            records = sheet.get_all_records()
+            scheduler = get_request_scheduler()
+            sheet = scheduler.execute(_self.spreadsheet.worksheet, AppConfig.CLEANING_RECORDS_SHEET)
+            # 2回目以降は前回読み込んだ行より後の行だけを取得
+            records = _self._records_reader.read(sheet)
 
             if not records:
                 return pd.DataFrame(columns=["日時", "掃除種別", "記録者", "備考"])
@@ -89,8 +95,9 @@ class DataManager:
     def get_cleaning_settings(_self) -> pd.DataFrame:
         """掃除種別設定データを取得"""
         try:
-            sheet = _self.spreadsheet.worksheet(AppConfig.CLEANING_SETTINGS_SHEET)
-            settings = sheet.get_all_records()
+            scheduler = get_request_scheduler()
+            sheet = scheduler.execute(_self.spreadsheet.worksheet, AppConfig.CLEANING_SETTINGS_SHEET)
+            settings = scheduler.execute(sheet.get_all_records)
 
             if not settings:
                 return pd.DataFrame(columns=["掃除種別", "推奨頻度（日）", "最終実施日", "次回予定日", "優先度"])
@@ -0,0 +1,229 @@
+"""
+Sheets APIリクエストスケジューラーモジュール
+
+Google Sheets APIの1分あたりの読み取り・書き込みクォータに合わせて
+リクエストを送るためのトークンバケットと、429/5xxエラー時に
+ジッター付き指数バックオフで再試行するスケジューラーを提供します。
+
+Alexaスキルにもコピー（alexa-skill/src/sheets_rate_limiter.py）があります。
+LambdaのZIP（deploy.py）とStreamlit Cloudのダッシュボードは別々にデプロイされ、互いのディレクトリを
+読み込めないため意図的に複製しています。違いはAlexaスキル側にだけリクエストの時間予算による打ち切りが
+あることで、それ以外を変更する場合は両方を更新してください（alexa-skill/test/test_shared_copies.py で差分を検出します）。
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# クォータ（1分あたりのリクエスト数）を上書きする環境変数
+READ_QUOTA_ENV = "CLEANING_SHEETS_READ_QUOTA_PER_MINUTE"
+WRITE_QUOTA_ENV = "CLEANING_SHEETS_WRITE_QUOTA_PER_MINUTE"
+
+# Sheets APIのユーザーあたりのデフォルトクォータ（1分あたり）
+DEFAULT_READ_QUOTA_PER_MINUTE = 60
+DEFAULT_WRITE_QUOTA_PER_MINUTE = 60
+
+REQUEST_KIND_READ = "read"
+REQUEST_KIND_WRITE = "write"
+
+# 書き込みクォータを消費するgspreadのメソッド
+WRITE_METHODS = {
+    "update",
+    "batch_update",
+    "append_row",
+    "append_rows",
+    "add_worksheet",
+    "del_worksheet",
+    "clear",
+    "batch_clear",
+}
+
+# 5xxで失敗した場合にサーバー側で適用済みの可能性があり、再送すると重複するメソッド
+NON_IDEMPOTENT_METHODS = {"append_row", "append_rows", "add_worksheet"}
+
+
+class TokenBucket:
+    """トークンバケットによるレート制限"""
+
+    def __init__(self, capacity: float, refill_per_second: float, clock=time.monotonic, sleep=time.sleep):
+        """
+        トークンバケットを初期化
+
+        Args:
+            capacity: バケットの容量（バースト可能なリクエスト数）
+            refill_per_second: 1秒あたりに補充されるトークン数
+            clock: 現在時刻（秒）を返す関数
+            sleep: 指定秒数待機する関数
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """経過時間に応じてトークンを補充"""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        トークンを1つ取得（足りない場合は補充されるまで待機）
+
+        Returns:
+            float: 待機した秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.refill_per_second
+            self._sleep(wait)
+            waited += wait
+
+
+class SheetsRequestScheduler:
+    """Sheets APIリクエストのスケジューラー（レート制限とバックオフ付き再試行）"""
+
+    def __init__(
+        self,
+        read_per_minute: Optional[int] = None,
+        write_per_minute: Optional[int] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """
+        スケジューラーを初期化
+
+        Args:
+            read_per_minute: 1分あたりの読み取りクォータ（省略時は環境変数またはデフォルト値）
+            write_per_minute: 1分あたりの書き込みクォータ（省略時は環境変数またはデフォルト値）
+            max_retries: 429/5xxエラー時の最大再試行回数
+            base_delay: バックオフの基準待機時間（秒）
+            max_delay: バックオフの最大待機時間（秒）
+            clock: 現在時刻（秒）を返す関数
+            sleep: 指定秒数待機する関数
+        """
+        read_per_minute = read_per_minute or int(os.environ.get(READ_QUOTA_ENV, DEFAULT_READ_QUOTA_PER_MINUTE))
+        write_per_minute = write_per_minute or int(os.environ.get(WRITE_QUOTA_ENV, DEFAULT_WRITE_QUOTA_PER_MINUTE))
+        self.buckets = {
+            REQUEST_KIND_READ: TokenBucket(read_per_minute, read_per_minute / 60.0, clock, sleep),
+            REQUEST_KIND_WRITE: TokenBucket(write_per_minute, write_per_minute / 60.0, clock, sleep),
+        }
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """カウンターをリセット"""
+        with self._lock:
+            self.stats = {
+                "requests": 0,
+                "throttled": 0,
+                "throttle_wait_seconds": 0.0,
+                "retries": 0,
+                "rate_limited": 0,
+                "server_errors": 0,
+            }
+
+    def _count(self, key: str, value: float = 1):
+        """カウンターを加算"""
+        with self._lock:
+            self.stats[key] += value
+
+    def execute(self, func, *args, **kwargs):
+        """
+        gspreadのAPI呼び出しをクォータに合わせて実行
+
+        429/5xxエラーの場合はジッター付き指数バックオフで再試行します。
+        ただし、行の追加など再送で重複するメソッドは429の場合のみ再試行します。
+
+        Args:
+            func: 呼び出すgspreadのメソッド
+            *args: メソッドの位置引数
+            **kwargs: メソッドのキーワード引数
+
+        Returns:
+            メソッドの戻り値
+        """
+        method_name = getattr(func, "__name__", "")
+        kind = REQUEST_KIND_WRITE if method_name in WRITE_METHODS else REQUEST_KIND_READ
+        attempt = 0
+
+        while True:
+            waited = self.buckets[kind].acquire()
+            self._count("requests")
+            if waited > 0:
+                self._count("throttled")
+                self._count("throttle_wait_seconds", waited)
+                logger.info("⏳ Sheets APIクォータ調整のため%.2f秒待機しました（%s）", waited, kind)
+
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                code = _error_code(e)
+                if code == 429:
+                    self._count("rate_limited")
+                elif code is not None and 500 <= code < 600:
+                    self._count("server_errors")
+                    if method_name in NON_IDEMPOTENT_METHODS:
+                        raise
+                else:
+                    raise
+
+                if attempt >= self.max_retries:
+                    logger.error("❌ Sheets API再試行回数の上限に達しました: %s (%s)", method_name, code)
+                    raise
+
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+                attempt += 1
+                self._count("retries")
+                logger.warning(
+                    "⚠️ Sheets APIエラー(%s)、%.2f秒後に再試行します（%s/%s）: %s",
+                    code,
+                    delay,
+                    attempt,
+                    self.max_retries,
+                    method_name,
+                )
+                self._sleep(delay)
+
+
+def _error_code(error: Exception) -> Optional[int]:
+    """例外からHTTPステータスコードを取得（gspread.exceptions.APIError.codeなど）"""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+    # gspread 5系のAPIErrorはレスポンスのステータスコードのみを持つ
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+# プロセス内で共有するスケジューラー（クォータはプロセス内の全呼び出しで共有）
+_shared_scheduler: Optional[SheetsRequestScheduler] = None
+
+
+def get_request_scheduler() -> SheetsRequestScheduler:
+    """共有のSheetsRequestSchedulerを取得"""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = SheetsRequestScheduler()
+    return _shared_scheduler